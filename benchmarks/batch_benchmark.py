@@ -0,0 +1,56 @@
+"""
+Compare answering many prefixes with `autocomplete_many` against calling `autocomplete` for each
+of them, as done when precomputing suggestion tables.
+
+The word list scans the whole corpus for each prefix, so its loop is measured on a sample of the
+prefixes and reported per prefix.
+
+Usage:
+    python -m benchmarks.batch_benchmark
+"""
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_list import WordList
+from wordavl.wordavl import WordAVL
+
+
+def per_prefix(function, prefixes: list) -> float:
+    """
+    Measure a function called with a list of prefixes, in microseconds per prefix.
+    """
+    start_time = perf_counter()
+    function(prefixes)
+    return (perf_counter() - start_time) / len(prefixes) * 1e6
+
+
+def main(count: int = 20000, limit: int = 10) -> None:
+    silence_logger()
+    words = TextData(CORPUS_PATH).get_unique_words()
+    prefixes = sample_prefixes(words, count=count)
+
+    print(f"| Name | Loop ({limit} per prefix) | Batch ({limit} per prefix) | Batch (all matches) |")
+    print("|------|------|------|------|")
+    for name, word_class, loop_count in [
+        ("AVL Tree", WordAVL, count),
+        ("Word List", WordList, 100),
+    ]:
+        structure = word_class(corpus=sorted(words))
+        structure.train()
+
+        def loop(prefixes):
+            return [structure.autocomplete(prefix, limit=limit) for prefix in prefixes]
+
+        timings = [
+            per_prefix(loop, prefixes[:loop_count]),
+            per_prefix(lambda prefixes: structure.autocomplete_many(prefixes, limit), prefixes),
+            per_prefix(structure.autocomplete_many, prefixes),
+        ]
+        print(f"| {name} | " + " | ".join(f"{round(timing, 2)} us" for timing in timings) + " |")
+
+
+if __name__ == "__main__":
+    main()
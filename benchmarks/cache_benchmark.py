@@ -0,0 +1,50 @@
+"""
+Measure the autocomplete cache of the AVL tree on a skewed stream of queries, where a few
+short prefixes account for most of the traffic.
+
+Usage:
+    python -m benchmarks.cache_benchmark
+"""
+import random
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.wordavl import WordAVL
+
+
+def skewed_queries(prefixes: list, count: int, seed: int = 0) -> list:
+    """
+    Draw queries from the prefixes with Zipf-like probabilities.
+    """
+    weights = [1 / rank for rank in range(1, len(prefixes) + 1)]
+    return random.Random(seed).choices(prefixes, weights=weights, k=count)
+
+
+def main(count: int = 20000, limit: int = 10) -> None:
+    silence_logger()
+    reader = WordAVL()
+    reader.read_corpus(CORPUS_PATH)
+    queries = skewed_queries(sample_prefixes(list(reader.corpus), count=500), count)
+
+    print("| Cache Size | Total Time | Hits | Derived | Misses |")
+    print("|------|------|------|------|------|")
+    for cache_size in [0, 64, 1024]:
+        word_avl = WordAVL(corpus=reader.corpus, cache_size=cache_size)
+        word_avl.train()
+
+        start_time = perf_counter()
+        for prefix in queries:
+            word_avl.autocomplete(prefix, limit=limit)
+        elapsed = perf_counter() - start_time
+
+        info = word_avl.cache_info()
+        print(
+            f"| {cache_size} | {round(elapsed, 4)} seconds | {info.get('hits', 0)} "
+            f"| {info.get('derived', 0)} | {info.get('misses', count)} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
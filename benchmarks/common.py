@@ -0,0 +1,84 @@
+import random
+import tracemalloc
+from statistics import median
+from time import perf_counter
+
+from loguru import logger
+
+CORPUS_PATH = "assets/br-utf8.txt"
+
+
+def silence_logger() -> None:
+    """
+    Disable the debug logging of the library so it doesn't affect the measurements.
+    """
+    logger.disable("wordavl")
+
+
+def measure(function, repeat: int = 5):
+    """
+    Run a function several times and measure how long each run takes.
+
+    Args:
+        function (Callable): The function to be measured. It is called without arguments.
+        repeat (int, optional): How many times the function is executed. Defaults to 5.
+
+    Returns:
+        list: The elapsed time of each run, in seconds.
+    """
+    timings = list()
+    for _ in range(repeat):
+        start_time = perf_counter()
+        function()
+        timings.append(perf_counter() - start_time)
+    return timings
+
+
+def print_table(title: str, rows: list) -> None:
+    """
+    Print the median of each measurement as a markdown table.
+
+    Args:
+        title (str): The name of the measured column.
+        rows (list): Pairs of (name, timings) to be printed.
+    """
+    print(f"| Name | {title} |")
+    print("|------|------|")
+    for name, timings in rows:
+        print(f"| {name} | {round(median(timings), 6)} seconds |")
+
+
+def sample_prefixes(words: list, count: int = 100, seed: int = 0) -> list:
+    """
+    Choose prefixes from random words of the corpus, with lengths between 1 and 4 characters.
+
+    Args:
+        words (list): The words of the corpus.
+        count (int, optional): The number of prefixes to choose. Defaults to 100.
+        seed (int, optional): The seed of the random generator. Defaults to 0.
+
+    Returns:
+        list: The chosen prefixes.
+    """
+    generator = random.Random(seed)
+    return [word[: generator.randint(1, 4)] for word in generator.sample(words, count)]
+
+
+def measure_memory(build) -> tuple:
+    """
+    Measure the memory allocated while building a structure.
+
+    Args:
+        build (Callable): The function that builds the structure. It is called without arguments
+            and must return the structure, which is kept alive until the end of the measurement.
+
+    Returns:
+        tuple: The bytes still allocated once the structure is built and the peak of allocated
+            bytes during the build.
+    """
+    tracemalloc.start()
+    structure = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return current, peak
@@ -0,0 +1,83 @@
+"""
+Compare the in place updates of the AVL tree with the concurrent mode, where the updates copy
+the nodes they change (and the spellings of normalized words): the time of the insertions and
+removals, and the search latency while a background thread applies them.
+
+Usage:
+    python -m benchmarks.concurrency_benchmark
+"""
+import random
+import threading
+from statistics import median
+from statistics import quantiles
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.wordavl import WordAVL
+
+
+def main(size: int = 20000, limit: int = 10, seed: int = 0) -> None:
+    silence_logger()
+    words = TextData(CORPUS_PATH).get_unique_words()
+    updates = random.Random(seed).sample(words, size)
+    prefixes = sample_prefixes(words, count=1000)
+
+    print(
+        f"| Mode | Insert ({size} words) | Remove | Search p50 (updating) "
+        "| Search p99 (updating) |"
+    )
+    print("|------|------|------|------|------|")
+    modes = [
+        ("In place", False, False),
+        ("Concurrent", True, False),
+        ("In place, normalized", False, True),
+        ("Concurrent, normalized", True, True),
+    ]
+    for name, concurrent, normalize in modes:
+        word_avl = WordAVL(
+            corpus=set(words).difference(updates), normalize=normalize, concurrent=concurrent
+        )
+        word_avl.train()
+
+        start_time = perf_counter()
+        for word in updates:
+            word_avl.add(word)
+        insert = perf_counter() - start_time
+        start_time = perf_counter()
+        for word in updates:
+            word_avl.remove(word)
+        remove = perf_counter() - start_time
+
+        # Search while another thread inserts and removes the words again
+        latencies = list()
+        done = threading.Event()
+
+        def write():
+            for word in updates:
+                word_avl.add(word)
+            for word in updates:
+                word_avl.remove(word)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        while not done.is_set():
+            for prefix in prefixes:
+                start_time = perf_counter()
+                word_avl.autocomplete(prefix, limit=limit)
+                latencies.append(perf_counter() - start_time)
+        writer.join()
+
+        p99 = quantiles(latencies, n=100)[98]
+        print(
+            f"| {name} | {round(insert / size * 10**6, 2)} µs per word "
+            f"| {round(remove / size * 10**6, 2)} µs per word "
+            f"| {round(median(latencies) * 10**6, 1)} µs | {round(p99 * 10**6, 1)} µs |"
+        )
+
+
+if __name__ == "__main__":
+    main()
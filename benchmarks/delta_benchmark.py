@@ -0,0 +1,44 @@
+"""
+Compare updating the vocabulary of a trained AVL tree in place with rebuilding it, for a daily
+delta of a few hundred added and removed words.
+
+Usage:
+    python -m benchmarks.delta_benchmark
+"""
+import random
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import silence_logger
+from wordavl.wordavl import WordAVL
+
+
+def main(size: int = 500, seed: int = 0) -> None:
+    silence_logger()
+    reader = WordAVL()
+    reader.read_corpus(CORPUS_PATH)
+    words = list(reader.corpus)
+    removes = random.Random(seed).sample(words, size)
+    adds = [f"{word}zz" for word in random.Random(seed + 1).sample(words, size)]
+
+    word_avl = WordAVL(corpus=words)
+    word_avl.train()
+    start_time = perf_counter()
+    word_avl.apply_delta(adds=adds, removes=removes)
+    delta = perf_counter() - start_time
+
+    start_time = perf_counter()
+    vocabulary = set(words).difference(removes).union(adds)
+    rebuilt = WordAVL(corpus=sorted(vocabulary))
+    rebuilt.train()
+    rebuild = perf_counter() - start_time
+    assert list(word_avl) == list(rebuilt)
+
+    print("| Update | Time |")
+    print("|------|------|")
+    print(f"| apply_delta ({size} adds, {size} removes) | {round(delta, 5)} seconds |")
+    print(f"| Full rebuild | {round(rebuild, 5)} seconds |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the memory and the prefix search time of the front coded word blocks, with several
+block sizes, against the sorted word index and the AVL tree.
+
+Usage:
+    python -m benchmarks.front_benchmark
+"""
+from statistics import median
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import measure_memory
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+from wordavl.wordavl import WordAVL
+
+
+def build(create, counts: dict):
+    structure = create(corpus=dict(counts))
+    structure.train()
+    # Only the structure itself is measured, not the corpus it was built from
+    structure.corpus = ""
+    return structure
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    counts = TextData(CORPUS_PATH).get_word_counts()
+    prefixes = sample_prefixes(list(counts), count=500)
+
+    variants = [("AVL Tree", WordAVL), ("Word Index", WordIndex)]
+    for block_size in [4, 16, 64]:
+        variants.append(
+            (
+                f"Front Coding ({block_size} words per block)",
+                lambda block_size=block_size, **kwargs: WordFront(block_size=block_size, **kwargs),
+            )
+        )
+
+    print(f"| Name | Memory | Memory (No Weights) | Search (top {limit}) |")
+    print("|------|------|------|------|")
+    for name, create in variants:
+        memory, _ = measure_memory(lambda: build(create, counts))
+        unweighted, _ = measure_memory(lambda: build(create, dict.fromkeys(counts, 1)))
+        structure = build(create, counts)
+        timings = measure(
+            lambda: [structure.autocomplete(prefix, limit=limit) for prefix in prefixes]
+        )
+        print(
+            f"| {name} | {round(memory / 2**20, 2)} MiB | {round(unweighted / 2**20, 2)} MiB "
+            f"| {round(median(timings) / len(prefixes) * 10**6, 1)} µs |"
+        )
+
+
+if __name__ == "__main__":
+    main()
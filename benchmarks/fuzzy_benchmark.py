@@ -0,0 +1,57 @@
+"""
+Measure the typo tolerant search of the radix tree on the dictionary. The queries are prefixes
+of random words, between 3 and 6 characters long, with one character replaced.
+
+Usage:
+    python -m benchmarks.fuzzy_benchmark
+"""
+import random
+from statistics import median
+from statistics import quantiles
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_radix import WordRadix
+
+
+def typo_prefixes(words: list, count: int = 200, seed: int = 0) -> list:
+    """
+    Choose prefixes of random words and replace one of their characters.
+    """
+    generator = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzáãçéêíóõú"
+    prefixes = list()
+    for word in generator.sample([word for word in words if len(word) >= 3], count):
+        prefix = list(word[: generator.randint(3, 6)])
+        prefix[generator.randrange(len(prefix))] = generator.choice(alphabet)
+        prefixes.append("".join(prefix))
+    return prefixes
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    words = TextData(CORPUS_PATH).get_unique_words()
+    word_radix = WordRadix(corpus=words)
+    word_radix.train()
+    prefixes = typo_prefixes(words)
+
+    print(f"| Max Edits | Median Time (top {limit}) | p99 Time (top {limit}) | Median Time (all) |")
+    print("|------|------|------|------|")
+    for max_edits in [0, 1, 2]:
+        limited, complete = list(), list()
+        for prefix in prefixes:
+            limited.extend(
+                measure(lambda: word_radix.autocomplete(prefix, limit, max_edits=max_edits), 1)
+            )
+            complete.extend(measure(lambda: word_radix.autocomplete(prefix, max_edits=max_edits), 1))
+        print(
+            f"| {max_edits} | {round(median(limited) * 1000, 3)} ms "
+            f"| {round(quantiles(limited, n=100)[98] * 1000, 3)} ms "
+            f"| {round(median(complete) * 1000, 3)} ms |"
+        )
+
+
+if __name__ == "__main__":
+    main()
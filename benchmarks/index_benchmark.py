@@ -0,0 +1,51 @@
+"""
+Compare the memory and the prefix search time of the sorted word index and the radix tree
+against the AVL tree.
+
+Usage:
+    python -m benchmarks.index_benchmark
+"""
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import measure_memory
+from benchmarks.common import print_table
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.word_index import WordIndex
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+
+def build(word_class):
+    structure = word_class()
+    structure.read_corpus(CORPUS_PATH)
+    structure.train()
+    # Only the structure itself is measured, not the corpus it was built from
+    structure.corpus = ""
+    return structure
+
+
+def main(limit: int = None) -> None:
+    silence_logger()
+    word_classes = [("AVL Tree", WordAVL), ("Word Index", WordIndex), ("Radix Tree", WordRadix)]
+
+    print("| Name | Memory (Built Structure) | Peak Memory (Build) |")
+    print("|------|------|------|")
+    for name, word_class in word_classes:
+        current, peak = measure_memory(lambda: build(word_class))
+        print(f"| {name} | {round(current / 2**20, 2)} MiB | {round(peak / 2**20, 2)} MiB |")
+    print()
+
+    structures = [(name, build(word_class)) for name, word_class in word_classes]
+    prefixes = sample_prefixes(list(structures[0][1]))
+    rows = list()
+    for name, structure in structures:
+        timings = list()
+        for prefix in prefixes:
+            timings.extend(measure(lambda: structure.autocomplete(prefix, limit=limit), 1))
+        rows.append((name, timings))
+    print_table("Median Time (Search prefix)", rows)
+
+
+if __name__ == "__main__":
+    main()
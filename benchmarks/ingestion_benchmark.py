@@ -0,0 +1,62 @@
+"""
+Compare the time and the peak memory of reading the corpus at once against streaming it.
+
+A larger corpus with repeated words is generated from the dictionary, since real crawls repeat
+their words many times.
+
+Usage:
+    python -m benchmarks.ingestion_benchmark
+"""
+import os
+import random
+import tempfile
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure_memory
+from wordavl.text_data import TextData
+
+
+def write_repeated_corpus(path: str, repeat: int = 5, seed: int = 0) -> None:
+    """
+    Write the words of the dictionary several times, shuffled, as lines of ten words.
+    """
+    words = TextData(CORPUS_PATH).get_word_list() * repeat
+    random.Random(seed).shuffle(words)
+    with open(path, "w") as f:
+        for start in range(0, len(words), 10):
+            f.write(" ".join(words[start : start + 10]) + "\n")
+
+
+def main() -> None:
+    variants = [
+        ("Whole file", dict(stream=False), "exact"),
+        ("Stream (exact dedup)", dict(stream=True), "exact"),
+        ("Stream (adjacent dedup)", dict(stream=True), "adjacent"),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "repeated.txt")
+        write_repeated_corpus(path)
+        corpora = [("Dictionary", CORPUS_PATH), ("Repeated x5", path)]
+
+        print("| Corpus | Mode | Time | Peak Memory |")
+        print("|------|------|------|------|")
+        for corpus_name, corpus_path in corpora:
+            for name, options, dedup in variants:
+
+                def read():
+                    return TextData(corpus_path, **options).get_unique_words(dedup=dedup)
+
+                start_time = perf_counter()
+                read()
+                elapsed = perf_counter() - start_time
+                _, peak = measure_memory(read)
+                print(
+                    f"| {corpus_name} | {name} | {round(elapsed, 3)} seconds "
+                    f"| {round(peak / 2**20, 2)} MiB |"
+                )
+
+
+if __name__ == "__main__":
+    main()
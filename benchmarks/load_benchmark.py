@@ -0,0 +1,82 @@
+"""
+Load test of the autocomplete HTTP server: many keep-alive connections send prefixes drawn with
+Zipf-like probabilities, as typed by users, and the latency of each request is measured.
+
+Usage:
+    python webserver.py &
+    python -m benchmarks.load_benchmark
+"""
+import asyncio
+import json
+from statistics import quantiles
+from time import perf_counter
+from urllib.parse import quote
+
+from benchmarks.cache_benchmark import skewed_queries
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import sample_prefixes
+from wordavl.text_data import TextData
+
+
+async def get(reader, writer, path: str) -> dict:
+    """
+    Send a GET request through a keep-alive connection and read its JSON response.
+    """
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    return json.loads(await reader.readexactly(length))
+
+
+async def client(host: str, port: int, paths: list, latencies: list) -> None:
+    """
+    Send the requests one after the other through a single connection.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    for path in paths:
+        start_time = perf_counter()
+        await get(reader, writer, path)
+        latencies.append(perf_counter() - start_time)
+    writer.close()
+
+
+async def run(host: str, port: int, connections: int, count: int, limit: int) -> None:
+    prefixes = sample_prefixes(TextData(CORPUS_PATH).get_unique_words(), count=500)
+    paths = [
+        f"/complete?prefix={quote(prefix)}&limit={limit}"
+        for prefix in skewed_queries(prefixes, count)
+    ]
+
+    latencies = list()
+    start_time = perf_counter()
+    await asyncio.gather(
+        *[
+            client(host, port, paths[index::connections], latencies)
+            for index in range(connections)
+        ]
+    )
+    elapsed = perf_counter() - start_time
+
+    reader, writer = await asyncio.open_connection(host, port)
+    health = await get(reader, writer, "/health")
+    writer.close()
+
+    percentiles = quantiles(latencies, n=100)
+    print("| Connections | Requests | Requests per Second | p50 | p99 | Coalesced |")
+    print("|------|------|------|------|------|------|")
+    print(
+        f"| {connections} | {count} | {round(count / elapsed)} "
+        f"| {round(percentiles[49] * 1000, 2)} ms | {round(percentiles[98] * 1000, 2)} ms "
+        f"| {health['coalesced']} |"
+    )
+
+
+def main(
+    host: str = "127.0.0.1", port: int = 8000, connections: int = 50, count: int = 20000
+) -> None:
+    asyncio.run(run(host, port, connections, count, limit=10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the cost of the searches of the AVL tree with the per-call debug logging they replaced,
+without metrics and with metrics recorded. The logging is measured both without any sink (the
+messages are formatted, then dropped by loguru) and with a debug sink discarding them, which
+stands for the default stderr sink of the CLI.
+
+Usage:
+    python -m benchmarks.metrics_benchmark
+"""
+from statistics import median
+from time import time
+
+from loguru import logger
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.metrics import Metrics
+from wordavl.text_data import TextData
+from wordavl.wordavl import WordAVL
+
+
+class LoggingWordAVL(WordAVL):
+    """
+    The timing and debug logging done by every search before the metrics, kept only as a
+    reference for the benchmark.
+    """
+
+    def autocomplete(self, prefix, limit=None, ranked=False):
+        logger.debug(f"Start search for words with the given prefix '{prefix}' in pre-loaded corpus")
+        start_time = time()
+        results = super().autocomplete(prefix, limit=limit, ranked=ranked)
+        logger.debug(
+            f"Search for prefix '{prefix}' took {round(time()-start_time, 5)}s and found {len(results)} results"
+        )
+        return results
+
+
+def main(limit: int = 10, repeat: int = 20) -> None:
+    silence_logger()
+    words = TextData(CORPUS_PATH).get_unique_words()
+    prefixes = sample_prefixes(words, count=500)
+
+    variants = [
+        ("Debug logging (no sink)", LoggingWordAVL(corpus=words), False),
+        ("Debug logging (discarded sink)", LoggingWordAVL(corpus=words), True),
+        ("No metrics", WordAVL(corpus=words), False),
+        ("Metrics", WordAVL(corpus=words, metrics=Metrics()), False),
+    ]
+
+    print(f"| Searches (top {limit}) | Median Time per Search |")
+    print("|------|------|")
+    for name, word_avl, logging in variants:
+        word_avl.train()
+
+        def search():
+            for prefix in prefixes:
+                word_avl.autocomplete(prefix, limit=limit)
+
+        logger.remove()
+        if logging:
+            logger.enable("wordavl")
+            logger.add(lambda message: None, level="DEBUG")
+        timings = measure(search, repeat)
+        silence_logger()
+        print(f"| {name} | {round(median(timings) / len(prefixes) * 10**6, 3)} µs |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the AVL tree matching the raw words with the one matching their normalized keys, on
+build time, memory and search time. The queries are prefixes of random accented words, up to
+the character after their first accent, typed without accents and in upper case.
+
+Usage:
+    python -m benchmarks.normalize_benchmark
+"""
+import random
+from statistics import median
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import measure_memory
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.text_data import normalize_key
+from wordavl.wordavl import WordAVL
+
+
+def accentless_prefixes(words: list, count: int = 200, seed: int = 0) -> list:
+    """
+    Choose prefixes of accented words and type them without accents, in upper case.
+    """
+    accented = [word for word in words if not word.isascii()]
+    prefixes = list()
+    for word in random.Random(seed).sample(accented, count):
+        accent = next(index for index, character in enumerate(word) if not character.isascii())
+        prefixes.append(normalize_key(word[: accent + 2]).upper())
+    return prefixes
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    counts = TextData(CORPUS_PATH).get_word_counts()
+    prefixes = accentless_prefixes(list(counts))
+
+    print("| Matching | Build Time | Memory | Median Search Time | Prefixes With Results |")
+    print("|------|------|------|------|------|")
+    for name, normalize in [("Raw words", False), ("Normalized keys", True)]:
+
+        def build():
+            word_avl = WordAVL(corpus=counts, normalize=normalize)
+            word_avl.train()
+            return word_avl
+
+        start_time = perf_counter()
+        word_avl = build()
+        elapsed = perf_counter() - start_time
+        memory, _ = measure_memory(build)
+
+        timings = list()
+        for prefix in prefixes:
+            timings.extend(measure(lambda: word_avl.autocomplete(prefix, limit), 1))
+        answered = sum(1 for prefix in prefixes if word_avl.autocomplete(prefix, limit))
+        print(
+            f"| {name} | {round(elapsed, 3)} seconds | {round(memory / 2**20, 2)} MiB "
+            f"| {round(median(timings), 6)} seconds | {answered} of {len(prefixes)} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure the order statistics of the AVL tree on the dictionary: the pages of the suggestions of
+a broad prefix, found from the subtree sizes or by walking and dropping the skipped suggestions,
+and the count of the words starting with a prefix or sorting before a word, against the scans
+of the word list.
+
+Usage:
+    python -m benchmarks.order_benchmark
+"""
+from statistics import median
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_list import WordList
+from wordavl.wordavl import WordAVL
+
+
+def main(prefix: str = "a", page_size: int = 10) -> None:
+    silence_logger()
+    words = TextData(CORPUS_PATH).get_unique_words()
+    word_avl = WordAVL(corpus=words)
+    word_avl.train()
+    word_list = WordList(corpus=sorted(words))
+    word_list.train()
+    total = word_avl.count_prefix(prefix)
+
+    print(f"| Page of '{prefix}' ({total} words) | Offset | Walk and Slice | Subtree Sizes |")
+    print("|------|------|------|------|")
+    for offset in [0, 1000, 10000, total - page_size]:
+        sliced = measure(
+            lambda: word_avl.autocomplete(prefix, limit=offset + page_size)[offset:], 20
+        )
+        paged = measure(lambda: word_avl.autocomplete(prefix, limit=page_size, offset=offset), 20)
+        print(
+            f"| {page_size} words | {offset} | {round(median(sliced) * 10**6, 1)} µs "
+            f"| {round(median(paged) * 10**6, 1)} µs |"
+        )
+
+    word = words[len(words) // 2]
+    queries = [
+        (
+            f"Count prefix '{prefix}'",
+            lambda: len(word_list.autocomplete(prefix)),
+            lambda: word_avl.count_prefix(prefix),
+        ),
+        (
+            f"Words before '{word}'",
+            lambda: sum(1 for other in word_list.corpus if other < word),
+            lambda: word_avl.rank(word),
+        ),
+    ]
+    print()
+    print("| Query | Word List Scan | AVL Tree |")
+    print("|------|------|------|")
+    for name, scan, tree in queries:
+        print(
+            f"| {name} | {round(median(measure(scan, 5)) * 1000, 3)} ms "
+            f"| {round(median(measure(tree, 20)) * 10**6, 2)} µs |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure how the corpus counting and the AVL tree build scale with the number of worker processes.
+
+The corpus is the dictionary repeated and shuffled, as in the ingestion benchmark. The speedup
+is bounded by the number of cores of the machine, which is printed with the results, and by the
+work left in the main process while counting (its CPU time, without the workers).
+
+Usage:
+    python -m benchmarks.parallel_benchmark
+"""
+import os
+import tempfile
+from time import perf_counter
+from time import process_time
+
+from benchmarks.common import silence_logger
+from benchmarks.ingestion_benchmark import write_repeated_corpus
+from wordavl.text_data import TextData
+from wordavl.wordavl import WordAVL
+
+
+def main(workers_counts: list = (1, 2, 4, 8, 16, 32), repeat: int = 10) -> None:
+    silence_logger()
+    print(f"Cores available: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "repeated.txt")
+        write_repeated_corpus(path, repeat=repeat)
+
+        print("| Workers | Count Words | Main Process CPU | Build AVL Tree | Speedup |")
+        print("|------|------|------|------|------|")
+        baseline = None
+        for workers in workers_counts:
+            start_time, start_cpu = perf_counter(), process_time()
+            TextData(path, workers=workers).get_word_counts()
+            counted, main_cpu = perf_counter() - start_time, process_time() - start_cpu
+
+            start_time = perf_counter()
+            word_avl = WordAVL()
+            word_avl.read_corpus(path, workers=workers)
+            word_avl.train()
+            built = perf_counter() - start_time
+
+            baseline = baseline or built
+            print(
+                f"| {workers} | {round(counted, 3)} seconds | {round(main_cpu, 3)} seconds "
+                f"| {round(built, 3)} seconds "
+                f"| {round(baseline / built, 2)}x |"
+            )
+
+
+if __name__ == "__main__":
+    main()
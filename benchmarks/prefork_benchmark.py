@@ -0,0 +1,81 @@
+"""
+Measure how much of the memory of the pre-forked serving workers is shared with the parent.
+
+Each structure is loaded once in the parent, workers are forked and answer a round of requests,
+and the memory of every worker is read from /proc/<pid>/smaps_rollup (Linux only). The private
+memory is the part copied by the worker, the proportional set size (PSS) divides every shared
+page between the processes using it.
+
+Usage:
+    python -m benchmarks.prefork_benchmark
+"""
+import asyncio
+import os
+import socket
+import tempfile
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from benchmarks.load_benchmark import client
+from wordavl.server import AutocompleteServer
+from wordavl.server import memory_usage
+from wordavl.server import start_workers
+from wordavl.server import stop_workers
+from wordavl.word_index import WordIndex
+from wordavl.wordavl import WordAVL
+
+
+def mib(size: int) -> str:
+    return f"{round(size / 2**20, 1)} MiB"
+
+
+async def send(port: int, paths: list, connections: int) -> None:
+    """
+    Send the requests through several connections, so every worker answers some of them.
+    """
+    await asyncio.gather(
+        *[client("127.0.0.1", port, paths[i::connections], list()) for i in range(connections)]
+    )
+
+
+def main(workers: int = 4, count: int = 4000) -> None:
+    silence_logger()
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "corpus.snapshot")
+        word_index = WordIndex()
+        word_index.read_corpus(CORPUS_PATH)
+        word_index.train()
+        word_index.save(snapshot_path)
+        paths = [
+            f"/complete?prefix={prefix}&limit=10"
+            for prefix in sample_prefixes(word_index.words(), count=count)
+        ]
+
+        print("| Structure | Process | RSS | Shared | Private | PSS |")
+        print("|------|------|------|------|------|------|")
+        for name, word_class in [("Word Index", WordIndex), ("AVL Tree", WordAVL)]:
+            structure = word_class()
+            structure.load(snapshot_path)
+
+            sock = socket.create_server(("127.0.0.1", 0))
+            sock.setblocking(False)
+            pids = start_workers(AutocompleteServer(structure), sock, workers)
+            try:
+                asyncio.run(send(sock.getsockname()[1], paths, connections=4 * workers))
+                rows = [("parent", memory_usage())]
+                rows += [(f"worker {pid}", memory_usage(pid)) for pid in pids]
+            finally:
+                stop_workers(pids)
+                sock.close()
+
+            for process, memory in rows:
+                print(
+                    f"| {name} | {process} | {mib(memory['rss'])} | {mib(memory['shared'])} "
+                    f"| {mib(memory['private'])} | {mib(memory['pss'])} |"
+                )
+            del structure
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the ranked top-k search of each structure against the naive approach of collecting
+every match and sorting it by weight.
+
+The dictionary has a single occurrence of each word, so Zipf-like weights are generated for it.
+
+Usage:
+    python -m benchmarks.ranking_benchmark
+"""
+import random
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import print_table
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_index import WordIndex
+from wordavl.word_list import WordList
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+
+def zipf_counts(words: list, seed: int = 0) -> dict:
+    """
+    Give each word a weight inversely proportional to a random rank.
+    """
+    ranks = list(range(1, len(words) + 1))
+    random.Random(seed).shuffle(ranks)
+    return {word: 10**7 // rank for word, rank in zip(words, ranks)}
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    counts = zipf_counts(TextData(CORPUS_PATH).get_unique_words())
+    prefixes = sample_prefixes(list(counts), count=200)
+
+    rows = list()
+    for name, word_class in [
+        ("AVL Tree", WordAVL),
+        ("Word List", WordList),
+        ("Word Index", WordIndex),
+        ("Radix Tree", WordRadix),
+    ]:
+        structure = word_class(corpus=counts)
+        structure.train()
+
+        def naive(prefix):
+            return sorted(structure.autocomplete(prefix), key=counts.get, reverse=True)[:limit]
+
+        ranked, collected = list(), list()
+        for prefix in prefixes:
+            ranked.extend(measure(lambda: structure.autocomplete(prefix, limit, ranked=True), 1))
+            collected.extend(measure(lambda: naive(prefix), 1))
+        rows.append((f"{name} (top-{limit})", ranked))
+        rows.append((f"{name} (collect and sort)", collected))
+
+    print_table("Median Time (Ranked search)", rows)
+
+
+if __name__ == "__main__":
+    main()
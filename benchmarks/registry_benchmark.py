@@ -0,0 +1,58 @@
+"""
+Measure the indexes of a registry on the dictionary: the first search, which loads the index
+from the corpus or from a snapshot, the memory accounted to the index, and the later searches.
+
+Usage:
+    python -m benchmarks.registry_benchmark
+"""
+import os
+import tempfile
+from statistics import median
+from time import perf_counter
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.registry import IndexRegistry
+from wordavl.text_data import TextData
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+from wordavl.wordavl import WordAVL
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    prefixes = sample_prefixes(TextData(CORPUS_PATH).get_unique_words(), count=500)
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = IndexRegistry()
+        for name, word_class in [("avl", WordAVL), ("index", WordIndex), ("front", WordFront)]:
+            registry.register(name, source=CORPUS_PATH, word_class=word_class)
+            snapshot = os.path.join(directory, f"{name}.snapshot")
+            registry.register(f"{name} (snapshot)", snapshot=snapshot, word_class=word_class)
+            # Create the snapshot loaded by the registry
+            structure = word_class(corpus=TextData(CORPUS_PATH).get_word_counts())
+            structure.train()
+            structure.save(snapshot)
+
+        print(f"| Index | First Search (load) | Accounted Memory | Later Searches (top {limit}) |")
+        print("|------|------|------|------|")
+        for name in registry.names:
+            start_time = perf_counter()
+            registry.autocomplete(prefixes[0], limit=limit, indexes=name)
+            first = perf_counter() - start_time
+            memory = registry.info()["indexes"][name]["memory"]
+            timings = measure(
+                lambda: [
+                    registry.autocomplete(prefix, limit=limit, indexes=name) for prefix in prefixes
+                ]
+            )
+            print(
+                f"| {name} | {round(first, 3)} s | {round(memory / 2**20, 2)} MiB "
+                f"| {round(median(timings) / len(prefixes) * 10**6, 1)} µs |"
+            )
+
+
+if __name__ == "__main__":
+    main()
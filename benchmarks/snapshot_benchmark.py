@@ -0,0 +1,48 @@
+"""
+Compare the time to build each structure from the corpus against loading it from a snapshot.
+
+Usage:
+    python -m benchmarks.snapshot_benchmark
+"""
+import os
+import tempfile
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import print_table
+from benchmarks.common import silence_logger
+from wordavl.word_index import WordIndex
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+
+def build(word_class):
+    structure = word_class()
+    structure.read_corpus(CORPUS_PATH)
+    structure.train()
+    return structure
+
+
+def load(word_class, path: str):
+    structure = word_class()
+    structure.load(path)
+    return structure
+
+
+def main(repeat: int = 5) -> None:
+    silence_logger()
+    word_classes = [("AVL Tree", WordAVL), ("Word Index", WordIndex), ("Radix Tree", WordRadix)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.snapshot")
+        build(WordIndex).save(path)
+
+        rows = list()
+        for name, word_class in word_classes:
+            rows.append((f"{name} (corpus)", measure(lambda: build(word_class), repeat)))
+            rows.append((f"{name} (snapshot)", measure(lambda: load(word_class, path), repeat)))
+        print_table("Median Time (Load Structure)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmark suite comparing every backend on build time, memory and query latency, on the
+dictionary and on larger synthetic corpora derived from it.
+
+The results are written as JSON, so a run can be saved as a baseline and later runs compared
+against it to catch regressions.
+
+Usage:
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+"""
+import json
+import platform
+import random
+from datetime import datetime
+from datetime import timezone
+from statistics import fmean
+from statistics import quantiles
+from time import perf_counter
+
+import typer
+
+from benchmarks.cache_benchmark import skewed_queries
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure_memory
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from benchmarks.ranking_benchmark import zipf_counts
+from wordavl.server import memory_usage
+from wordavl.text_data import TextData
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+from wordavl.word_list import WordList
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+app = typer.Typer()
+
+BACKENDS = {
+    "avl": WordAVL,
+    "list": WordList,
+    "index": WordIndex,
+    "radix": WordRadix,
+    "front": WordFront,
+}
+
+# Common Portuguese endings used to derive new words sharing the prefixes of the dictionary
+SUFFIXES = ["s", "mente", "ção", "zinho", "íssimo", "ada", "ista", "ável", "ando", "eiro"]
+
+# Metrics compared against the baseline, where a higher value is worse
+COMPARED_METRICS = [
+    "build_seconds",
+    "memory_bytes",
+    "peak_memory_bytes",
+    "latency.p50",
+    "latency.p99",
+]
+
+
+def synthetic_words(words: list, scale: int, seed: int = 0) -> list:
+    """
+    Derive a corpus about `scale` times larger than the dictionary by adding endings to its words.
+    """
+    generator = random.Random(seed)
+    derived = set(words)
+    while len(derived) < scale * len(words):
+        derived.add(generator.choice(words) + generator.choice(SUFFIXES))
+    return list(derived)
+
+
+def build(backend: str, counts: dict):
+    """
+    Build a backend from the number of occurrences of each word.
+
+    The words and their counts are copied first, into new strings, so every backend pays for
+    the corpus it is given: the build time and the memory cover the words a structure keeps,
+    whether it keeps them as they are given (the list and the AVL tree) or encoded.
+    """
+    corpus = {word.encode().decode(): count for word, count in counts.items()}
+    structure = BACKENDS[backend](corpus=corpus)
+    structure.train()
+    return structure
+
+
+def run_backend(backend: str, counts: dict, queries: list, limit: int) -> dict:
+    """
+    Measure the build and the queries of a backend.
+
+    Returns:
+        dict: The build time in seconds, the memory still allocated after the build and its
+            peak in bytes (tracemalloc), the growth of the resident memory of the process, and
+            the distribution of the query latencies in seconds.
+    """
+    rss = memory_usage().get("rss", 0)
+    start_time = perf_counter()
+    structure = build(backend, counts)
+    build_seconds = perf_counter() - start_time
+    rss_growth = memory_usage().get("rss", 0) - rss
+
+    latencies = list()
+    for prefix in queries:
+        start_time = perf_counter()
+        structure.autocomplete(prefix, limit=limit)
+        latencies.append(perf_counter() - start_time)
+    del structure
+
+    memory, peak = measure_memory(lambda: build(backend, counts))
+    percentiles = quantiles(latencies, n=100)
+    return {
+        "build_seconds": build_seconds,
+        "memory_bytes": memory,
+        "peak_memory_bytes": peak,
+        "rss_growth_bytes": rss_growth,
+        "latency": {
+            "mean": fmean(latencies),
+            "p50": percentiles[49],
+            "p90": percentiles[89],
+            "p99": percentiles[98],
+        },
+    }
+
+
+@app.command()
+def run(
+    output: str = typer.Option("benchmark.json", help="File the JSON results are written to."),
+    backends: str = typer.Option(",".join(BACKENDS), help="Comma separated backends to measure."),
+    scales: str = typer.Option("1,4", help="Comma separated sizes of the synthetic corpora."),
+    queries: int = typer.Option(1000, help="Number of queries sent to each backend."),
+    limit: int = typer.Option(10, help="Maximum number of suggestions per query."),
+):
+    """
+    Measure every backend on every corpus and write the results as JSON.
+    """
+    silence_logger()
+    dictionary = TextData(CORPUS_PATH).get_unique_words()
+
+    results = list()
+    for scale in [int(scale) for scale in scales.split(",")]:
+        words = dictionary if scale == 1 else synthetic_words(dictionary, scale)
+        counts = zipf_counts(words)
+        # Zipf distributed queries of 1 to 4 characters, as typed by users
+        prefixes = sample_prefixes(words, count=500)
+        corpus_queries = skewed_queries(prefixes, queries)
+        corpus = "dictionary" if scale == 1 else f"synthetic x{scale}"
+
+        for backend in backends.split(","):
+            typer.echo(f"Measuring {backend} on {corpus} ({len(words)} words)", err=True)
+            measured = run_backend(backend, counts, corpus_queries, limit)
+            results.append({"backend": backend, "corpus": corpus, "words": len(words), **measured})
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "queries": queries,
+            "limit": limit,
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    typer.echo("| Backend | Corpus | Build Time | Memory | p50 | p99 |")
+    typer.echo("|------|------|------|------|------|------|")
+    for result in results:
+        typer.echo(
+            f"| {result['backend']} | {result['corpus']} | {round(result['build_seconds'], 3)} s "
+            f"| {round(result['memory_bytes'] / 2**20, 2)} MiB "
+            f"| {round(result['latency']['p50'] * 1000, 3)} ms "
+            f"| {round(result['latency']['p99'] * 1000, 3)} ms |"
+        )
+
+
+def metric(result: dict, name: str) -> float:
+    """
+    Read a metric of a result, following the dots of nested metrics.
+    """
+    for key in name.split("."):
+        result = result[key]
+    return result
+
+
+def find_regressions(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Compare the metrics of two runs.
+
+    Args:
+        baseline (dict): The report of the reference run.
+        current (dict): The report of the run to check.
+        threshold (float): The relative increase over the baseline tolerated for each metric.
+
+    Returns:
+        list: The (backend, corpus, metric, baseline value, current value, regressed) rows of
+            the backends and corpora measured in both runs.
+    """
+    reference = {(result["backend"], result["corpus"]): result for result in baseline["results"]}
+    rows = list()
+    for result in current["results"]:
+        key = (result["backend"], result["corpus"])
+        if key not in reference:
+            continue
+        for name in COMPARED_METRICS:
+            before, after = metric(reference[key], name), metric(result, name)
+            rows.append((*key, name, before, after, after > before * (1 + threshold)))
+    return rows
+
+
+@app.command()
+def compare(
+    baseline: str,
+    current: str,
+    threshold: float = typer.Option(0.2, help="Relative increase flagged as a regression."),
+):
+    """
+    Compare a run against a baseline, exiting with an error if any metric regressed.
+    """
+    with open(baseline) as f:
+        baseline_report = json.load(f)
+    with open(current) as f:
+        current_report = json.load(f)
+
+    rows = find_regressions(baseline_report, current_report, threshold)
+    typer.echo("| Backend | Corpus | Metric | Baseline | Current | Change | |")
+    typer.echo("|------|------|------|------|------|------|------|")
+    for backend, corpus, name, before, after, regressed in rows:
+        change = f"{round((after / before - 1) * 100, 1)}%" if before else "n/a"
+        flag = "REGRESSION" if regressed else ""
+        typer.echo(
+            f"| {backend} | {corpus} | {name} | {before:.6g} | {after:.6g} | {change} | {flag} |"
+        )
+
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        typer.echo(f"{regressions} metrics regressed by more than {threshold:.0%}", err=True)
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
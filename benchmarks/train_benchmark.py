@@ -0,0 +1,42 @@
+"""
+Compare the time to build the AVL tree by inserting the words one by one
+against the bottom-up bulk build.
+
+Usage:
+    python -m benchmarks.train_benchmark
+"""
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import print_table
+from benchmarks.common import silence_logger
+from wordavl.wordavl import WordAVL
+
+
+def build(corpus: list, bulk: bool) -> WordAVL:
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train(bulk=bulk)
+    return word_avl
+
+
+def main(repeat: int = 5) -> None:
+    silence_logger()
+    word_avl = WordAVL()
+    word_avl.read_corpus(CORPUS_PATH)
+    corpus = word_avl.corpus
+    sorted_corpus = sorted(corpus)
+
+    print_table(
+        "Median Time (Build Structure)",
+        [
+            ("AVL Tree (incremental)", measure(lambda: build(corpus, bulk=False), repeat)),
+            ("AVL Tree (bulk)", measure(lambda: build(corpus, bulk=True), repeat)),
+            (
+                "AVL Tree (bulk, sorted input)",
+                measure(lambda: build(sorted_corpus, bulk=True), repeat),
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
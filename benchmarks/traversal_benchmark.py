@@ -0,0 +1,104 @@
+"""
+Compare the iterative insert, lookup and prefix scan of the AVL tree with the recursive
+versions they replaced. The prefix scans are reported as the cost per returned word, since the
+recursive scan paid one generator frame per tree level for each of them.
+
+Usage:
+    python -m benchmarks.traversal_benchmark
+"""
+from statistics import median
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import silence_logger
+from wordavl.structures.avl import AVLNode
+from wordavl.wordavl import WordAVL
+
+
+class RecursiveWordAVL(WordAVL):
+    """
+    The recursive insert, lookup and prefix scan, kept only as a reference for the benchmark.
+    """
+
+    def add(self, value, weight=1):
+        self.root = self._add_recursive(self.root, value, weight)
+
+    def _add_recursive(self, current_node, value, weight):
+        if current_node is None:
+            return AVLNode(value, weight)
+        if value <= current_node.value:
+            current_node.left_child = self._add_recursive(current_node.left_child, value, weight)
+        else:
+            current_node.right_child = self._add_recursive(current_node.right_child, value, weight)
+        current_node.calculate_height_and_imbalance()
+        if abs(current_node.imbalance) == 2:
+            return self._balance(current_node)
+        return current_node
+
+    def _contains(self, current_node, value):
+        if current_node is None:
+            return False
+        if value == current_node.value:
+            return True
+        if value < current_node.value:
+            return self._contains(current_node.left_child, value)
+        return self._contains(current_node.right_child, value)
+
+    def _find_iterative(self, current_node, prefix):
+        if current_node is None:
+            return
+        if current_node.value.startswith(prefix):
+            yield from self._find_iterative(current_node.left_child, prefix)
+            yield current_node
+            yield from self._find_iterative(current_node.right_child, prefix)
+        elif prefix < current_node.value:
+            yield from self._find_iterative(current_node.left_child, prefix)
+        else:
+            yield from self._find_iterative(current_node.right_child, prefix)
+
+
+def build(word_class, words):
+    word_avl = word_class()
+    for word in words:
+        word_avl.add(word)
+    return word_avl
+
+
+def main(repeat: int = 5) -> None:
+    silence_logger()
+    reader = WordAVL()
+    reader.read_corpus(CORPUS_PATH)
+    words = list(reader.corpus)
+    prefixes = ["a", "ca", "de", "pre", "s"]
+
+    print("| Operation | Recursive | Iterative |")
+    print("|------|------|------|")
+    trees = dict()
+    timings = dict()
+    for name, word_class in [("Recursive", RecursiveWordAVL), ("Iterative", WordAVL)]:
+        timings[name] = measure(lambda: build(word_class, words), repeat=1)
+        trees[name] = build(word_class, words)
+    print(f"| Insert (whole corpus) | {round(median(timings['Recursive']), 4)} seconds "
+          f"| {round(median(timings['Iterative']), 4)} seconds |")
+
+    lookups = words[::10]
+    timings = {
+        name: measure(lambda: [tree.contains(word) for word in lookups], repeat=repeat)
+        for name, tree in trees.items()
+    }
+    print(f"| Contains ({len(lookups)} words) | {round(median(timings['Recursive']), 4)} seconds "
+          f"| {round(median(timings['Iterative']), 4)} seconds |")
+
+    for prefix in prefixes:
+        count = len(trees["Iterative"].autocomplete(prefix))
+        timings = {
+            name: measure(lambda: tree.autocomplete(prefix), repeat=repeat)
+            for name, tree in trees.items()
+        }
+        per_result = {name: median(values) / count * 1e9 for name, values in timings.items()}
+        print(f"| Prefix '{prefix}' ({count} words) | {round(per_result['Recursive'])} ns/word "
+              f"| {round(per_result['Iterative'])} ns/word |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the word list scanning its words with the one searching them in a NumPy array, on single
+queries, on a batch of queries and on the histograms of the prefixes of a given length.
+
+Usage:
+    python -m benchmarks.vectorized_benchmark
+"""
+from statistics import median
+
+from benchmarks.common import CORPUS_PATH
+from benchmarks.common import measure
+from benchmarks.common import measure_memory
+from benchmarks.common import sample_prefixes
+from benchmarks.common import silence_logger
+from wordavl.text_data import TextData
+from wordavl.word_list import WordList
+
+
+def main(limit: int = 10) -> None:
+    silence_logger()
+    words = sorted(TextData(CORPUS_PATH).get_unique_words())
+    prefixes = sample_prefixes(words, count=1000)
+
+    scanned = WordList(corpus=words)
+    scanned.train()
+    vectorized = WordList(corpus=words, vectorized=True)
+    if not vectorized.vectorized:
+        print("NumPy is not installed, install it to run this benchmark")
+        return
+    memory, _ = measure_memory(vectorized.train)
+
+    print(f"Vectorized words: {len(vectorized.array)} words, {round(memory / 2**20, 2)} MiB")
+    print()
+    print("| Operation | Scan | Vectorized |")
+    print("|------|------|------|")
+    # Each of the first prefixes is searched on its own, the table shows the time per prefix
+    single = [
+        measure(lambda: [word_list.autocomplete(prefix, limit=limit) for prefix in prefixes[:50]])
+        for word_list in (scanned, vectorized)
+    ]
+    print(
+        f"| Single prefix (top {limit}) | {round(median(single[0]) * 1000 / 50, 3)} ms "
+        f"| {round(median(single[1]) * 1000 / 50, 3)} ms |"
+    )
+    batch = [
+        measure(lambda: word_list.autocomplete_many(prefixes, limit=limit), 5)
+        for word_list in (scanned, vectorized)
+    ]
+    print(
+        f"| Batch of {len(prefixes)} prefixes (top {limit}) | {round(median(batch[0]) * 1000, 3)} ms "
+        f"| {round(median(batch[1]) * 1000, 3)} ms |"
+    )
+    for length in [1, 2, 3]:
+        counts = [
+            measure(lambda: word_list.prefix_counts(length), 5) for word_list in (scanned, vectorized)
+        ]
+        print(
+            f"| Prefix counts of length {length} | {round(median(counts[0]) * 1000, 3)} ms "
+            f"| {round(median(counts[1]) * 1000, 3)} ms |"
+        )
+
+
+if __name__ == "__main__":
+    main()
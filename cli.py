@@ -1,37 +1,154 @@
+import importlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from time import perf_counter
+
+# Wall clock time when the CLI started loading, the startup is measured from it
+START_TIME = perf_counter()
+
 import typer
-from wordavl.wordavl import WordAVL
-from wordavl.word_list import WordList
+
+from wordavl.snapshot import SnapshotError
+from wordavl.snapshot import file_checksum
+from wordavl.snapshot import read_corpus_checksum
 
 app = typer.Typer()
 
 
+CORPUS_PATH = "assets/br-utf8.txt"
+
+# Module and name of each word class, imported only once it is chosen, since the structures
+# load loguru and the corpus readers
+WORD_CLASSES = {
+    "avl": ("wordavl.wordavl", "WordAVL"),
+    "list": ("wordavl.word_list", "WordList"),
+    "index": ("wordavl.word_index", "WordIndex"),
+    "radix": ("wordavl.word_radix", "WordRadix"),
+    "front": ("wordavl.word_front", "WordFront"),
+}
+
+
+# Function to import the word class with the given name
+def import_word_class(word_class: str):
+    if word_class.lower() not in WORD_CLASSES:
+        raise ValueError("Invalid word class. Choose 'avl', 'list', 'index', 'radix' or 'front'.")
+
+    module, name = WORD_CLASSES[word_class.lower()]
+    return getattr(importlib.import_module(module), name)
+
+
 # Function to create the appropriate word class based on the argument
-def create_word_class(word_class: str):
-    if word_class.lower() == "avl":
-        word_avl = WordAVL()
-        word_avl.read_corpus("assets/br-utf8.txt")
-        word_avl.train()
-        return word_avl
-    elif word_class.lower() == "list":
-        word_list = WordList()
-        word_list.read_corpus("assets/br-utf8.txt")
-        return word_list
-    else:
-        raise ValueError("Invalid word class. Choose 'avl' or 'list'.")
+def create_word_class(
+    word_class: str, snapshot: str = None, workers: int = 1, metrics=None, corpus: str = CORPUS_PATH
+):
+    word_instance = import_word_class(word_class)(metrics=metrics)
+    # The snapshot records the checksum of its corpus, so it is never used for another corpus
+    checksum = None
+    if snapshot is not None and os.path.exists(corpus):
+        checksum = file_checksum(corpus)
+
+    # Reuse the snapshot of a previous run when there is one
+    if snapshot is not None and os.path.exists(snapshot):
+        if checksum is not None and read_corpus_checksum(snapshot) != checksum:
+            raise SnapshotError(
+                f"'{snapshot}' wasn't built from '{corpus}', remove it or choose another snapshot"
+            )
+        word_instance.load(snapshot)
+        return word_instance
+
+    word_instance.read_corpus(corpus, workers=workers)
+    word_instance.train()
+    if snapshot is not None:
+        word_instance.save(snapshot, corpus_checksum=checksum or 0)
+    return word_instance
+
+
+# Function to derive the snapshot of a corpus from its path, next to it
+def default_snapshot(corpus: str) -> str:
+    return str(Path(corpus).with_suffix(".snapshot"))
+
+
+# Function to build the word class in a background thread, returning a future of the instance
+# and the timings of its import and build
+def create_word_class_in_background(word_class: str, **kwargs):
+    future = Future()
+    timings = dict()
+
+    def build():
+        try:
+            start_time = perf_counter()
+            import_word_class(word_class)
+            timings["import"] = perf_counter() - start_time
+            start_time = perf_counter()
+            word_instance = create_word_class(word_class, **kwargs)
+            timings["build"] = perf_counter() - start_time
+            future.set_result(word_instance)
+        except BaseException as error:
+            future.set_exception(error)
+
+    # A daemon thread doesn't keep the CLI running when it exits before the first search.
+    # Snapshots are written to a temporary file first, so an interrupted build can't corrupt them.
+    threading.Thread(target=build, daemon=True).start()
+    return future, timings
 
 
 # Command to search for words with a given prefix
 @app.command()
-def search(word_class: str):
-    word_instance = create_word_class(word_class)
+def search(
+    word_class: str,
+    limit: int = typer.Option(None, help="Maximum number of words shown per prefix."),
+    snapshot: str = typer.Option(
+        None, help="Snapshot file loaded instead of the corpus, created if it doesn't exist."
+    ),
+    ranked: bool = typer.Option(False, help="Show the most frequent words first."),
+    workers: int = typer.Option(1, help="Number of processes used to read the corpus."),
+    metrics: str = typer.Option(
+        None, help="Record the build and the searches, shown on exit as 'json' or 'prometheus'."
+    ),
+    timings: bool = typer.Option(False, help="Show how long the startup, import and build took."),
+    corpus: str = typer.Option(CORPUS_PATH, help="Corpus read when there is no snapshot to load."),
+):
+    if word_class.lower() not in WORD_CLASSES:
+        raise typer.BadParameter("Choose 'avl', 'list', 'index', 'radix' or 'front'.")
+    if metrics not in (None, "json", "prometheus"):
+        raise typer.BadParameter("Choose 'json' or 'prometheus'.", param_hint="--metrics")
+    recorder = None
+    if metrics:
+        from wordavl.metrics import Metrics
+
+        recorder = Metrics()
+
+    startup = perf_counter() - START_TIME
+    # The structure is built while the prompt is shown, the first search waits for it
+    future, build_timings = create_word_class_in_background(
+        word_class, snapshot=snapshot, workers=workers, metrics=recorder, corpus=corpus
+    )
     typer.echo("Welcome to Word Prefix Matcher CLI!")
     typer.echo("Enter a prefix to search for words or type 'exit' to quit.")
     while True:
         prefix = typer.prompt("Enter Prefix:")
         if prefix.lower() == "exit":
+            if metrics == "json":
+                typer.echo(json.dumps(recorder.info(), indent=2))
+            elif metrics == "prometheus":
+                typer.echo(recorder.to_prometheus(), nl=False)
             break
         elif prefix:
-            words = word_instance.autocomplete(prefix)
+            try:
+                word_instance = future.result()
+            except SnapshotError as error:
+                raise typer.BadParameter(str(error), param_hint="--snapshot")
+            if timings and build_timings:
+                typer.echo(
+                    f"Started in {round(startup, 3)}s, imported '{word_class}' in "
+                    f"{round(build_timings.pop('import'), 3)}s and built it in "
+                    f"{round(build_timings.pop('build'), 3)}s",
+                    err=True,
+                )
+            words = word_instance.autocomplete(prefix, limit=limit, ranked=ranked)
             if words:
                 typer.echo("Words found:")
                 typer.echo(words)
@@ -41,5 +158,43 @@ def search(word_class: str):
             typer.echo("Please provide a prefix.")
 
 
+# Command to print the words starting with a prefix and exit
+@app.command()
+def complete(
+    prefix: str,
+    word_class: str = typer.Option("index", help="Structure answering the lookup."),
+    limit: int = typer.Option(10, help="Maximum number of words shown."),
+    snapshot: str = typer.Option(
+        None,
+        help="Snapshot file loaded instead of the corpus, created if missing. Defaults to the "
+        "path of the corpus with a .snapshot extension.",
+    ),
+    ranked: bool = typer.Option(False, help="Show the most frequent words first."),
+    timings: bool = typer.Option(False, help="Show how long the startup, import and build took."),
+    corpus: str = typer.Option(CORPUS_PATH, help="Corpus read when there is no snapshot to load."),
+):
+    startup = perf_counter() - START_TIME
+    start_time = perf_counter()
+    import_word_class(word_class)
+    imported = perf_counter() - start_time
+    start_time = perf_counter()
+    if snapshot is None:
+        snapshot = default_snapshot(corpus)
+    try:
+        word_instance = create_word_class(word_class, snapshot=snapshot, corpus=corpus)
+    except SnapshotError as error:
+        raise typer.BadParameter(str(error), param_hint="--snapshot")
+    built = perf_counter() - start_time
+
+    for word in word_instance.autocomplete(prefix, limit=limit, ranked=ranked):
+        typer.echo(word)
+    if timings:
+        typer.echo(
+            f"Started in {round(startup, 3)}s, imported '{word_class}' in {round(imported, 3)}s "
+            f"and built it in {round(built, 3)}s",
+            err=True,
+        )
+
+
 if __name__ == "__main__":
     app()
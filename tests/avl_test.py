@@ -0,0 +1,250 @@
+import random
+
+import pytest
+
+from wordavl.structures.avl import AVLNode
+from wordavl.structures.avl import AVLTree
+
+
+def assert_balanced(node):
+    # Check heights, imbalance factors and ordering of the whole subtree
+    if node is None:
+        return 0
+    left_height = assert_balanced(node.left_child)
+    right_height = assert_balanced(node.right_child)
+    assert node.height == 1 + max(left_height, right_height)
+    assert node.imbalance == left_height - right_height
+    assert abs(node.imbalance) <= 1
+    children = [child for child in (node.left_child, node.right_child) if child is not None]
+    assert node.max_weight == max([node.weight] + [child.max_weight for child in children])
+    assert node.size == 1 + sum(child.size for child in children)
+    if node.left_child is not None:
+        assert node.left_child.value < node.value
+    if node.right_child is not None:
+        assert node.right_child.value > node.value
+    return node.height
+
+
+@pytest.fixture
+def values():
+    random.seed(0)
+    return random.sample(range(10000), 1000)
+
+
+def test_add_keeps_tree_balanced(values):
+    tree = AVLTree()
+    for value in values:
+        tree.add(value)
+    assert_balanced(tree.root)
+    assert list(tree) == sorted(values)
+
+
+def test_bulk_load_builds_balanced_tree(values):
+    tree = AVLTree()
+    tree.bulk_load(values)
+    assert_balanced(tree.root)
+    assert list(tree) == sorted(values)
+    assert tree.get_height() == len(values).bit_length()
+
+
+def test_bulk_load_removes_duplicates():
+    tree = AVLTree()
+    tree.bulk_load([3, 1, 2, 3, 1])
+    assert list(tree) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 7, 8, 100])
+def test_bulk_load_sorted_values(size):
+    tree = AVLTree()
+    tree.bulk_load(list(range(size)))
+    assert_balanced(tree.root)
+    assert list(tree) == list(range(size))
+    assert tree.get_height() == size.bit_length()
+
+
+def test_contains_after_bulk_load(values):
+    tree = AVLTree()
+    tree.bulk_load(values)
+    assert all(tree.contains(value) for value in values)
+    assert not tree.contains(-1)
+
+
+def test_add_keeps_max_weight(values):
+    tree = AVLTree()
+    for value in values:
+        tree.add(value, weight=value % 97)
+    assert_balanced(tree.root)
+    assert tree.root.max_weight == 96
+
+
+def test_bulk_load_with_weights():
+    tree = AVLTree()
+    tree.bulk_load([3, 1, 2, 3], [5, 1, 7, 2])
+    assert_balanced(tree.root)
+    assert [(node.value, node.weight) for node in tree._iter_nodes()] == [(1, 1), (2, 7), (3, 7)]
+    assert tree.root.max_weight == 7
+
+
+def test_data_moves_with_its_value():
+    tree = AVLTree(persistent=True)
+    tree.bulk_load([3, 1, 2, 3], [5, 1, 7, 2], ["c", "a", "b", "C"])
+    assert [node.data for node in tree._iter_nodes()] == ["a", "b", "C"]
+    for value in range(4, 20):
+        tree.add(value, data=str(value))
+    tree.add(2, 7, "B")
+    # The node of a removed value with two children takes the data of its successor
+    removed = tree.root.value
+    tree.remove(removed)
+    expected = {1: "a", 2: "B", 3: "C", **{value: str(value) for value in range(4, 20)}}
+    del expected[removed]
+    assert {node.value: node.data for node in tree._iter_nodes()} == expected
+
+
+def test_add_weights_updates_max_weight(values):
+    tree = AVLTree()
+    for value in values:
+        tree.add(value, weight=value)
+    assert_balanced(tree.root)
+    assert tree.root.max_weight == max(values)
+
+
+def test_add_existing_value_replaces_weight():
+    tree = AVLTree()
+    for value in [5, 3, 8, 3, 5]:
+        tree.add(value)
+    assert list(tree) == [3, 5, 8]
+    tree.add(3, weight=7)
+    assert_balanced(tree.root)
+    assert tree.root.max_weight == 7
+    tree.add(3, weight=2)
+    assert_balanced(tree.root)
+    assert tree.root.max_weight == 2
+
+
+def test_remove(values):
+    tree = AVLTree()
+    tree.bulk_load(values)
+    for value in values[::2]:
+        assert tree.remove(value)
+        assert_balanced(tree.root)
+    assert not tree.remove(values[0])
+    assert list(tree) == sorted(values[1::2])
+    for value in values[1::2]:
+        assert tree.remove(value)
+    assert tree.root is None
+    assert not tree.remove(values[0])
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_random_mutations_keep_tree_balanced(seed, persistent):
+    generator = random.Random(seed)
+    tree = AVLTree(persistent=persistent)
+    expected = dict()
+    for _ in range(2000):
+        value = generator.randrange(300)
+        if generator.random() < 0.4:
+            assert tree.remove(value) == (value in expected)
+            expected.pop(value, None)
+        else:
+            weight = generator.randrange(1, 100)
+            tree.add(value, weight)
+            expected[value] = weight
+    assert_balanced(tree.root)
+    assert list(tree) == sorted(expected)
+    assert [node.weight for node in tree._iter_nodes()] == [expected[v] for v in sorted(expected)]
+    assert len(tree) == len(expected)
+
+
+def test_persistent_writes_keep_previous_versions():
+    generator = random.Random(0)
+    tree = AVLTree(persistent=True)
+    tree.bulk_load(range(0, 300, 2))
+    versions = list()
+    for _ in range(500):
+        versions.append((tree.root, [(node.value, node.weight) for node in tree._iter_nodes()]))
+        value = generator.randrange(300)
+        if generator.random() < 0.4:
+            tree.remove(value)
+        else:
+            tree.add(value, generator.randrange(1, 100))
+
+    # Every previous root still holds the values and weights it had when it was published
+    for root, items in versions:
+        tree.root = root
+        assert_balanced(root)
+        assert [(node.value, node.weight) for node in tree._iter_nodes()] == items
+
+
+def test_persistent_writes_are_hidden_until_published(monkeypatch):
+    generator = random.Random(0)
+    stable = list(range(0, 400, 2))
+    tree = AVLTree(persistent=True)
+    tree.bulk_load(stable)
+    calculate = AVLNode.calculate_height_and_imbalance
+
+    def interrupted(node):
+        # A reader running in the middle of the write walks the published root
+        values = list(tree)
+        assert values == sorted(set(values))
+        assert set(values) >= set(stable)
+        calculate(node)
+
+    monkeypatch.setattr(AVLNode, "calculate_height_and_imbalance", interrupted)
+    added = list(range(1, 400, 2))
+    generator.shuffle(added)
+    for value in added:
+        tree.add(value)
+    for value in added:
+        tree.remove(value)
+    assert list(tree) == stable
+
+
+def test_nodes_have_no_instance_dictionary():
+    node = AVLNode("casa", 2)
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.spelling = "Casa"
+
+
+def test_rank_and_select(values):
+    tree = AVLTree()
+    for value in values:
+        tree.add(value)
+    ordered = sorted(values)
+    assert [tree.select(index) for index in range(len(ordered))] == ordered
+    assert [tree.rank(value) for value in ordered] == list(range(len(ordered)))
+    assert tree.rank(-1) == 0 and tree.rank(10000) == len(ordered)
+    assert tree.select(-1) == ordered[-1]
+    with pytest.raises(IndexError):
+        tree.select(len(ordered))
+
+
+def test_successor(values):
+    tree = AVLTree()
+    tree.bulk_load(values)
+    ordered = sorted(values)
+    assert [tree.successor(value) for value in ordered] == ordered[1:] + [None]
+    assert tree.successor(-1) == ordered[0]
+
+
+def test_range(values):
+    tree = AVLTree()
+    tree.bulk_load(values)
+    ordered = sorted(values)
+    assert list(tree.range()) == ordered
+    assert list(tree.range(2500, 5000)) == [v for v in ordered if 2500 <= v < 5000]
+    assert list(tree.range(high=100)) == [v for v in ordered if v < 100]
+    assert list(tree.range(9000, start=3)) == [v for v in ordered if v >= 9000][3:]
+    assert list(tree.range(5000, 5000)) == []
+    assert list(tree.range(start=len(ordered))) == []
+
+
+def test_count_prefix():
+    words = ["abacate", "abacaxi", "bola", "carro", "casa", "casaco", "casamento", "zebra"]
+    tree = AVLTree()
+    for word in words[::-1]:
+        tree.add(word)
+    for prefix in ["", "a", "ab", "ca", "cas", "casa", "casam", "d", "zz"]:
+        assert tree.count_prefix(prefix) == sum(word.startswith(prefix) for word in words)
+
@@ -0,0 +1,44 @@
+from wordavl.cache import LRUCache
+
+
+def test_get_and_put():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_peek_does_not_change_counters():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    assert cache.peek("a") == 1
+    assert cache.peek("b") is None
+    assert cache.hits == 0 and cache.misses == 0
+
+
+def test_clear_keeps_counters():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 1
+
+
+def test_zero_size_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
@@ -0,0 +1,36 @@
+from wordavl.metrics import Histogram
+from wordavl.metrics import Metrics
+
+
+def test_histogram_buckets():
+    histogram = Histogram(buckets=(1, 10))
+    for value in [0, 1, 5, 50]:
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.info() == {"count": 4, "sum": 56, "buckets": {"1": 2, "10": 3, "+Inf": 4}}
+
+
+def test_record():
+    metrics = Metrics()
+    metrics.record("query", 0.002, results=3, visited=7)
+    metrics.record("query", 0.004, results=0)
+    info = metrics.info()
+    assert info["histograms"]["query_seconds"]["count"] == 2
+    assert info["histograms"]["query_results"]["sum"] == 3
+    assert info["histograms"]["query_visited_nodes"]["count"] == 1
+
+
+def test_to_prometheus():
+    metrics = Metrics()
+    metrics.increment("lookups", 2)
+    metrics.observe("query_seconds", 0.003, buckets=(0.001, 0.01))
+    assert metrics.to_prometheus().splitlines() == [
+        "# TYPE wordavl_lookups_total counter",
+        "wordavl_lookups_total 2",
+        "# TYPE wordavl_query_seconds histogram",
+        'wordavl_query_seconds_bucket{le="0.001"} 0',
+        'wordavl_query_seconds_bucket{le="0.01"} 1',
+        'wordavl_query_seconds_bucket{le="+Inf"} 1',
+        "wordavl_query_seconds_sum 0.003",
+        "wordavl_query_seconds_count 1",
+    ]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from wordavl.structures.radix import RadixTree
+
+
+def assert_counts(node):
+    # Check the subtree counts and that no non-value node has a single child
+    count = int(node.is_value)
+    if node.children is not None:
+        for character, child in node.children.items():
+            assert child.label[0] == character
+            count += assert_counts(child)
+    assert node.count == count
+    return count
+
+
+@pytest.fixture
+def words():
+    random.seed(0)
+    alphabet = "abcçã"
+    return ["".join(random.choices(alphabet, k=random.randint(1, 6))) for _ in range(500)]
+
+
+def test_add_and_iterate(words):
+    tree = RadixTree()
+    for word in words:
+        tree.add(word)
+    assert list(tree) == sorted(set(words))
+    assert len(tree) == len(set(words))
+    assert_counts(tree.root)
+
+
+def test_add_is_idempotent():
+    tree = RadixTree()
+    assert tree.add("casa")
+    assert not tree.add("casa")
+    assert len(tree) == 1
+
+
+def test_split_edges():
+    tree = RadixTree()
+    for word in ["casamento", "casa", "caso", "carro"]:
+        tree.add(word)
+    assert list(tree) == ["carro", "casa", "casamento", "caso"]
+    assert tree.root.children["c"].label == "ca"
+    assert_counts(tree.root)
+
+
+def test_contains(words):
+    tree = RadixTree()
+    for word in words:
+        tree.add(word)
+    assert all(tree.contains(word) for word in words)
+    assert not tree.contains("abcabcabc")
+    assert not tree.contains("z")
+
+
+def test_count_prefix(words):
+    tree = RadixTree()
+    for word in words:
+        tree.add(word)
+    for prefix in ["a", "ab", "ç", "ãc", "cab", "z"]:
+        expected = len([word for word in set(words) if word.startswith(prefix)])
+        assert tree.count_prefix(prefix) == expected
+
+
+def test_shared_labels():
+    tree = RadixTree()
+    for word in ["amente", "bmente", "ax", "bx"]:
+        tree.add(word)
+    first = tree.root.children["a"].children["m"]
+    second = tree.root.children["b"].children["m"]
+    assert first.label == "mente"
+    assert first.label is second.label
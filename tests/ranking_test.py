@@ -0,0 +1,97 @@
+from itertools import product
+
+import pytest
+
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+from wordavl.word_list import WordList
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+WORD_CLASSES = [WordAVL, WordList, WordIndex, WordRadix, WordFront]
+
+
+@pytest.fixture
+def counts():
+    return {
+        "casa": 50,
+        "casaco": 3,
+        "casamento": 20,
+        "carro": 40,
+        "cama": 7,
+        "bola": 100,
+        "caso": 30,
+        "cavalo": 1,
+    }
+
+
+def create(word_class, counts):
+    structure = word_class(corpus=counts)
+    structure.train()
+    return structure
+
+
+@pytest.mark.parametrize("word_class", WORD_CLASSES)
+def test_ranked_autocomplete(word_class, counts):
+    structure = create(word_class, counts)
+    expected = ["casa", "carro", "caso", "casamento", "cama", "casaco", "cavalo"]
+    assert structure.autocomplete("ca", ranked=True) == expected
+    assert structure.autocomplete("ca", limit=3, ranked=True) == expected[:3]
+    assert structure.autocomplete("cas", limit=2, ranked=True) == ["casa", "caso"]
+    assert structure.autocomplete("x", limit=2, ranked=True) == []
+
+
+@pytest.mark.parametrize("word_class", WORD_CLASSES)
+def test_unranked_autocomplete_keeps_lexicographic_order(word_class, counts):
+    structure = create(word_class, counts)
+    assert structure.autocomplete("cas") == ["casa", "casaco", "casamento", "caso"]
+
+
+@pytest.mark.parametrize("word_class", WORD_CLASSES)
+def test_ranked_autocomplete_matches_naive_sort(word_class):
+    words = ["".join(letters) for letters in product("abc", "abc", "abcd")]
+    counts = {word: (position * 37) % 53 + 1 for position, word in enumerate(words)}
+    structure = create(word_class, counts)
+    for prefix in ["a", "ab", "bca", "c"]:
+        matches = [word for word in counts if word.startswith(prefix)]
+        results = structure.autocomplete(prefix, limit=5, ranked=True)
+        assert len(results) == min(5, len(matches))
+        expected_weights = sorted((counts[word] for word in matches), reverse=True)[:5]
+        assert [counts[word] for word in results] == expected_weights
+
+
+@pytest.mark.parametrize("word_class", WORD_CLASSES)
+def test_snapshot_keeps_weights(tmp_path, word_class, counts):
+    path = str(tmp_path / "corpus.snapshot")
+    create(word_class, counts).save(path)
+    loaded = word_class()
+    loaded.load(path)
+    assert loaded.autocomplete("cas", limit=2, ranked=True) == ["casa", "caso"]
+
+
+def test_read_corpus_keeps_counts(tmp_path):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text("casa carro casa\ncasamento casa carro\n")
+    word_avl = WordAVL()
+    word_avl.read_corpus(str(file_path))
+    word_avl.train()
+    assert word_avl.autocomplete("ca", ranked=True) == ["casa", "carro", "casamento"]
+
+
+def test_word_index_without_weights():
+    word_index = WordIndex(corpus={"casa": 1, "carro": 1})
+    word_index.train()
+    assert word_index.max_weights is None
+    assert word_index.autocomplete("ca", ranked=True) == ["carro", "casa"]
+
+
+@pytest.mark.parametrize("word_class", WORD_CLASSES)
+def test_ranked_ties_are_in_lexicographic_order(word_class):
+    words = ["".join(letters) for letters in product("abc", "abc", "abcd")]
+    counts = {word: position % 3 + 1 for position, word in enumerate(reversed(words))}
+    structure = create(word_class, counts)
+    for prefix in ["a", "ab", "bca", "c"]:
+        matches = sorted(word for word in counts if word.startswith(prefix))
+        expected = sorted(matches, key=counts.get, reverse=True)
+        assert structure.autocomplete(prefix, ranked=True) == expected
+        assert structure.autocomplete(prefix, limit=5, ranked=True) == expected[:5]
@@ -0,0 +1,185 @@
+import os
+import threading
+
+import pytest
+
+from wordavl.metrics import Metrics
+from wordavl.registry import IndexRegistry
+from wordavl.registry import deep_size
+from wordavl.word_index import WordIndex
+from wordavl.word_list import WordList
+
+
+class SlowIndex(WordIndex):
+    # Train only once the test releases it, to search other indexes during the load
+    started = None
+    release = None
+
+    def train(self):
+        self.started.set()
+        assert self.release.wait(5)
+        super().train()
+
+
+@pytest.fixture
+def corpora(tmp_path):
+    paths = dict()
+    texts = {
+        "pt": "casa casa casa casamento carro bola",
+        "es": "casa casado carro carro perro",
+        "en": "car cart case house",
+    }
+    for name, text in texts.items():
+        path = tmp_path / f"{name}.txt"
+        path.write_text(text)
+        paths[name] = str(path)
+    return paths
+
+
+@pytest.fixture
+def registry(corpora):
+    registry = IndexRegistry()
+    for name, path in corpora.items():
+        registry.register(name, source=path)
+    return registry
+
+
+def test_indexes_load_on_first_use(registry):
+    assert registry.names == ["pt", "es", "en"]
+    assert registry.default == "pt"
+    assert registry.info()["indexes"]["es"] == {"loaded": False, "memory": None}
+
+    assert registry.autocomplete("cas", indexes="es") == ["casa", "casado"]
+    assert registry.autocomplete("cas") == ["casa", "casamento"]
+    assert registry.loads == 2
+    assert registry.get("es") is registry.get("es")
+    assert registry.loads == 2
+
+    info = registry.info()
+    assert info["indexes"]["es"]["loaded"] and info["indexes"]["es"]["memory"] > 0
+    assert not info["indexes"]["en"]["loaded"]
+    assert info["memory"] == registry.memory > 0
+
+
+def test_merged_autocomplete(registry):
+    assert registry.autocomplete("ca", indexes=["pt", "es"]) == [
+        "carro",
+        "casa",
+        "casado",
+        "casamento",
+    ]
+    assert registry.autocomplete("ca", limit=2, indexes=["es", "pt", "en"]) == ["car", "carro"]
+    # Ranked suggestions are taken in turns from each index
+    assert registry.autocomplete("ca", ranked=True, indexes=["es", "pt"]) == [
+        "carro",
+        "casa",
+        "casado",
+        "casamento",
+    ]
+    assert registry.autocomplete("", indexes=["es", "pt"]) == ""
+
+
+def test_unknown_index(registry):
+    with pytest.raises(KeyError):
+        registry.autocomplete("ca", indexes="fr")
+    with pytest.raises(ValueError):
+        registry.register("fr")
+
+
+def test_memory_budget_evicts_least_recently_used(registry):
+    registry.get("pt")
+    one_index = registry.memory
+    registry.memory_budget = int(2.5 * one_index)
+    registry.metrics = Metrics()
+
+    registry.get("es")
+    registry.get("pt")
+    registry.get("en")
+    # es was the least recently used when en was loaded
+    assert [name for name, info in registry.info()["indexes"].items() if info["loaded"]] == [
+        "pt",
+        "en",
+    ]
+    assert registry.evictions == 1
+    assert registry.metrics.counters["index_evictions"] == 1
+    assert registry.memory <= registry.memory_budget
+
+    # An evicted index is loaded again on its next search
+    assert registry.autocomplete("per", indexes="es") == ["perro"]
+    assert registry.loads == 4
+
+
+def test_index_over_budget_stays_loaded(registry):
+    registry.memory_budget = 1
+    assert registry.autocomplete("bo") == ["bola"]
+    assert registry.autocomplete("car", indexes="en") == ["car", "cart"]
+    assert registry.info()["indexes"]["en"]["loaded"]
+    assert not registry.info()["indexes"]["pt"]["loaded"]
+
+
+def test_snapshot_index(tmp_path, corpora):
+    snapshot = str(tmp_path / "pt.snapshot")
+    registry = IndexRegistry()
+    registry.register("pt", source=corpora["pt"], snapshot=snapshot, word_class=WordIndex)
+    assert registry.autocomplete("cas", ranked=True) == ["casa", "casamento"]
+
+    # The snapshot created by the first load is loaded without the corpus
+    reloaded = IndexRegistry()
+    reloaded.register("pt", snapshot=snapshot, word_class=WordIndex)
+    assert reloaded.autocomplete("cas", ranked=True) == ["casa", "casamento"]
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_word_list_index_keeps_its_corpus(corpora, vectorized):
+    registry = IndexRegistry()
+    registry.register("pt", source=corpora["pt"], word_class=WordList, vectorized=vectorized)
+    assert registry.autocomplete("cas") == ["casa", "casamento"]
+    assert registry.autocomplete("ca", ranked=True, limit=2) == ["casa", "carro"]
+
+
+def test_deep_size_counts_objects_once():
+    word = "casamento" * 100
+    copy = "".join(list(word))
+    assert deep_size([word, copy]) == deep_size([word, word]) + deep_size(copy)
+
+
+def test_missing_snapshot_without_corpus(tmp_path, corpora):
+    snapshot = str(tmp_path / "typo.snapshot")
+    registry = IndexRegistry()
+    with pytest.raises(FileNotFoundError):
+        registry.register("pt", snapshot=snapshot)
+    assert "pt" not in registry
+
+    # A snapshot removed after the registration isn't replaced by an empty index
+    registry.register("pt", source=corpora["pt"], snapshot=snapshot, word_class=WordIndex)
+    registry.get("pt")
+    registry.register("snapshot", snapshot=snapshot, word_class=WordIndex)
+    os.remove(snapshot)
+    with pytest.raises(FileNotFoundError):
+        registry.get("snapshot")
+    assert not os.path.exists(snapshot)
+    assert not registry.is_loaded("snapshot")
+
+
+def test_other_indexes_are_searched_during_a_load(registry, corpora):
+    SlowIndex.started, SlowIndex.release = threading.Event(), threading.Event()
+    registry.register("slow", source=corpora["pt"], word_class=SlowIndex)
+    loaded = list()
+    loaders = [
+        threading.Thread(target=lambda: loaded.append(registry.get("slow"))) for _ in range(2)
+    ]
+    for loader in loaders:
+        loader.start()
+    try:
+        assert SlowIndex.started.wait(5)
+        # The registry isn't locked while the slow index is trained
+        assert registry.autocomplete("cas", indexes="es") == ["casa", "casado"]
+        assert not registry.info()["indexes"]["slow"]["loaded"]
+    finally:
+        SlowIndex.release.set()
+        for loader in loaders:
+            loader.join()
+
+    # Both threads got the index of a single load
+    assert loaded[0] is loaded[1] is registry.get("slow")
+    assert registry.loads == 2
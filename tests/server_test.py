@@ -0,0 +1,258 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from wordavl.metrics import Metrics
+from wordavl.registry import IndexRegistry
+from wordavl.server import AutocompleteServer
+from wordavl.server import HTTPError
+from wordavl.server import memory_usage
+from wordavl.server import start_workers
+from wordavl.server import stop_workers
+from wordavl.word_index import WordIndex
+
+
+class CountingIndex(WordIndex):
+    # Count the lookups reaching the index
+    calls = 0
+
+    def autocomplete(self, prefix, limit=None, ranked=False):
+        self.calls += 1
+        return super().autocomplete(prefix, limit=limit, ranked=ranked)
+
+
+@pytest.fixture
+def server():
+    word_index = CountingIndex(corpus={"casa": 1, "casamento": 3, "carro": 2, "bola": 1})
+    word_index.train()
+    return AutocompleteServer(word_index, default_limit=3, max_limit=5)
+
+
+async def request(port, paths, close=True):
+    # Send the requests through a single keep-alive connection and parse the responses
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = list()
+    for index, path in enumerate(paths):
+        connection = "close" if close and index == len(paths) - 1 else "keep-alive"
+        head = f"GET {path} HTTP/1.1\r\nHost: test\r\nConnection: {connection}\r\n\r\n"
+        writer.write(head.encode())
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ")[1])
+        length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+        responses.append((status, json.loads(await reader.readexactly(length))))
+    writer.close()
+    return responses
+
+
+def run(server, client):
+    async def main():
+        started = await server.start(port=0)
+        port = started.sockets[0].getsockname()[1]
+        async with started:
+            return await client(port)
+
+    return asyncio.run(main())
+
+
+def test_complete(server):
+    paths = ["/complete?prefix=cas", "/complete?prefix=ca&limit=1", "/complete?prefix=ca&ranked=1"]
+    responses = run(server, lambda port: request(port, paths))
+    assert responses == [
+        (200, {"prefix": "cas", "words": ["casa", "casamento"]}),
+        (200, {"prefix": "ca", "words": ["carro"]}),
+        (200, {"prefix": "ca", "words": ["casamento", "carro", "casa"]}),
+    ]
+
+
+def test_health_and_errors(server):
+    paths = ["/health", "/other", "/complete", "/complete?prefix=a&limit=x"]
+    paths.append("/complete?prefix=a&limit=6")
+    responses = run(server, lambda port: request(port, paths))
+    status, health = responses[0]
+    assert status == 200
+    assert health["status"] == "ok" and health["lookups"] == 0 and health["coalesced"] == 0
+    assert [status for status, _ in responses[1:]] == [404, 400, 400, 400]
+
+
+def test_registry_indexes(tmp_path, server):
+    registry = IndexRegistry()
+    for name, text in [("pt", "casa casamento bola"), ("es", "casa casado perro")]:
+        path = tmp_path / f"{name}.txt"
+        path.write_text(text)
+        registry.register(name, source=str(path))
+    paths = [
+        "/complete?prefix=cas",
+        "/complete?prefix=cas&index=es",
+        "/complete?prefix=cas&index=pt,es",
+        "/complete?prefix=cas&index=fr",
+        "/health",
+    ]
+    responses = run(AutocompleteServer(registry), lambda port: request(port, paths))
+    assert responses[:4] == [
+        (200, {"prefix": "cas", "words": ["casa", "casamento"]}),
+        (200, {"prefix": "cas", "words": ["casa", "casado"]}),
+        (200, {"prefix": "cas", "words": ["casa", "casado", "casamento"]}),
+        (404, {"error": "index 'fr' not found"}),
+    ]
+    assert responses[4][1]["indexes"]["loads"] == 2
+
+    # A server with a single structure has no named indexes
+    responses = run(server, lambda port: request(port, ["/complete?prefix=cas&index=pt"]))
+    assert responses[0][0] == 400
+
+
+def test_cold_index_is_loaded_in_a_thread(tmp_path):
+    registry = IndexRegistry()
+    started, release = threading.Event(), threading.Event()
+
+    class SlowIndex(WordIndex):
+        def train(self):
+            started.set()
+            assert release.wait(5)
+            super().train()
+
+    for name, text, word_class in [
+        ("pt", "casa casamento bola", WordIndex),
+        ("slow", "casa casado perro", SlowIndex),
+    ]:
+        path = tmp_path / f"{name}.txt"
+        path.write_text(text)
+        registry.register(name, source=str(path), word_class=word_class)
+    registry.get("pt")
+
+    async def client(port):
+        slow = asyncio.create_task(request(port, ["/complete?prefix=cas&index=slow"]))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        # The loop answers the other requests while the index is loaded
+        responses = await request(port, ["/health", "/complete?prefix=cas&index=pt"])
+        release.set()
+        return responses + await slow
+
+    responses = run(AutocompleteServer(registry), client)
+    assert responses[0][1]["indexes"]["indexes"]["slow"]["loaded"] is False
+    assert responses[1:] == [
+        (200, {"prefix": "cas", "words": ["casa", "casamento"]}),
+        (200, {"prefix": "cas", "words": ["casa", "casado"]}),
+    ]
+
+
+def test_lookup_errors_are_answered():
+    class FailingIndex(WordIndex):
+        def autocomplete(self, prefix, limit=None, ranked=False):
+            raise RuntimeError("broken index")
+
+    metrics = Metrics()
+    server = AutocompleteServer(FailingIndex(), metrics=metrics)
+
+    async def client(port):
+        # Identical requests share the failed lookup, and the connection stays open
+        failed = await asyncio.gather(
+            request(port, ["/complete?prefix=cas"]), request(port, ["/complete?prefix=cas"])
+        )
+        return failed + [await request(port, ["/complete?prefix=ca", "/health"])]
+
+    responses = run(server, client)
+    assert responses[0] == responses[1] == [(500, {"error": "internal server error"})]
+    assert [status for status, _ in responses[2]] == [500, 200]
+    assert metrics.counters["responses_500"] == 3
+    assert server.coalesced == 1
+
+
+def test_metrics():
+    metrics = Metrics()
+    word_index = WordIndex(corpus={"casa": 1, "carro": 2}, metrics=metrics)
+    word_index.train()
+    server = AutocompleteServer(word_index, metrics=metrics)
+    responses = run(server, lambda port: request(port, ["/complete?prefix=ca", "/other"]))
+    assert [status for status, _ in responses] == [200, 404]
+
+    text = asyncio.run(server.handle("/metrics"))
+    assert "wordavl_lookups_total 1" in text
+    assert "wordavl_responses_200_total 1" in text
+    assert "wordavl_responses_404_total 1" in text
+    assert "wordavl_query_seconds_count 1" in text
+    assert "wordavl_request_seconds_count 2" in text
+
+
+def test_metrics_disabled(server):
+    with pytest.raises(HTTPError):
+        asyncio.run(server.handle("/metrics"))
+
+
+def test_identical_requests_are_coalesced(server):
+    async def client():
+        return await asyncio.gather(
+            *[server.complete("ca", 3) for _ in range(5)], server.complete("bo", 3)
+        )
+
+    results = asyncio.run(client())
+    assert results == [["carro", "casa", "casamento"]] * 5 + [["bola"]]
+    assert server.lookups == server.words.calls == 2
+    assert server.coalesced == 4
+
+
+def test_concurrent_connections(server):
+    async def client(port):
+        return await asyncio.gather(*[request(port, ["/complete?prefix=ca"] * 3) for _ in range(5)])
+
+    for responses in run(server, client):
+        assert responses == [(200, {"prefix": "ca", "words": ["carro", "casa", "casamento"]})] * 3
+    assert server.lookups + server.coalesced == 15
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_prefork_workers_share_socket(server):
+    sock = socket.create_server(("127.0.0.1", 0))
+    sock.setblocking(False)
+    port = sock.getsockname()[1]
+    pids = start_workers(server, sock, workers=2)
+    try:
+
+        async def client(port):
+            return await asyncio.gather(
+                *[request(port, ["/complete?prefix=cas", "/health"]) for _ in range(4)]
+            )
+
+        for complete, health in asyncio.run(client(port)):
+            assert complete == (200, {"prefix": "cas", "words": ["casa", "casamento"]})
+            assert health[1]["pid"] in pids
+    finally:
+        stop_workers(pids)
+        sock.close()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="requires Linux")
+def test_memory_usage():
+    memory = memory_usage()
+    assert memory["rss"] == memory["shared"] + memory["private"] > 0
+    assert memory_usage(pid=-1) == {}
+
+
+def test_request_bodies_are_skipped(server):
+    async def client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # The body looks like a request, and must not be answered as one
+        body = b"GET /health HTTP/1.1\r\n\r\n"
+        writer.write(
+            b"POST /complete?prefix=cas HTTP/1.1\r\nHost: test\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+            + b"GET /complete?prefix=cas HTTP/1.1\r\nHost: test\r\n"
+            + b"Transfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n0\r\n\r\n"
+        )
+        await writer.drain()
+        responses = await reader.read()
+        writer.close()
+        return responses
+
+    responses = run(server, client)
+    assert responses.count(b"HTTP/1.1 ") == 2
+    assert responses.startswith(b"HTTP/1.1 405 ")
+    assert b"HTTP/1.1 200 " in responses
+    assert responses.endswith(b'{"prefix": "cas", "words": ["casa", "casamento"]}')
+    assert b"Connection: close" in responses
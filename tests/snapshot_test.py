@@ -0,0 +1,110 @@
+import pytest
+
+from wordavl.snapshot import HEADER
+from wordavl.snapshot import SnapshotError
+from wordavl.snapshot import file_checksum
+from wordavl.snapshot import read_corpus_checksum
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+from wordavl.word_list import WordList
+from wordavl.word_radix import WordRadix
+from wordavl.wordavl import WordAVL
+
+
+@pytest.fixture
+def corpus():
+    return ["casa", "casamento", "carro", "bola", "casaco", "ação", "açúcar", "zebra"]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, corpus):
+    path = tmp_path / "corpus.snapshot"
+    word_index = WordIndex(corpus=corpus)
+    word_index.train()
+    word_index.save(str(path))
+    return path
+
+
+def test_load_word_index(snapshot_path, corpus):
+    word_index = WordIndex()
+    word_index.load(str(snapshot_path))
+    assert word_index.words() == sorted(corpus)
+    assert word_index.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_index.contains("açúcar")
+    assert not word_index.contains("cas")
+
+
+def test_save_loaded_word_index(tmp_path, snapshot_path, corpus):
+    word_index = WordIndex()
+    word_index.load(str(snapshot_path))
+    copy_path = tmp_path / "copy.snapshot"
+    word_index.save(str(copy_path))
+    assert copy_path.read_bytes() == snapshot_path.read_bytes()
+
+
+@pytest.mark.parametrize("word_class", [WordAVL, WordList, WordRadix, WordFront])
+def test_save_and_load(tmp_path, corpus, word_class):
+    path = str(tmp_path / "corpus.snapshot")
+    structure = word_class(corpus=corpus)
+    structure.train()
+    structure.save(path)
+
+    loaded = word_class()
+    loaded.load(path)
+    assert loaded.autocomplete("ca") == ["carro", "casa", "casaco", "casamento"]
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snapshot")
+    WordIndex().save(path)
+    word_index = WordIndex()
+    word_index.load(path)
+    assert len(word_index) == 0
+    assert word_index.autocomplete("a") == []
+
+
+@pytest.mark.parametrize("word_class", [WordAVL, WordList, WordIndex, WordRadix, WordFront])
+def test_snapshot_records_corpus_checksum(tmp_path, snapshot_path, word_class):
+    corpus_path = tmp_path / "corpus.txt"
+    corpus_path.write_text("casa carro casa\n")
+    structure = word_class()
+    structure.read_corpus(str(corpus_path))
+    structure.train()
+    path = str(tmp_path / "checked.snapshot")
+    structure.save(path, corpus_checksum=file_checksum(str(corpus_path)))
+    assert read_corpus_checksum(path) == file_checksum(str(corpus_path))
+    assert read_corpus_checksum(str(snapshot_path)) == 0
+    corpus_path.write_text("casa carro bola\n")
+    assert read_corpus_checksum(path) != file_checksum(str(corpus_path))
+
+
+def test_reject_corrupt_snapshot(snapshot_path):
+    content = bytearray(snapshot_path.read_bytes())
+    content[-2] ^= 0xFF
+    snapshot_path.write_bytes(bytes(content))
+    with pytest.raises(SnapshotError, match="checksum"):
+        WordIndex().load(str(snapshot_path))
+
+
+def test_reject_truncated_snapshot(snapshot_path):
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:-1])
+    with pytest.raises(SnapshotError, match="truncated"):
+        WordIndex().load(str(snapshot_path))
+
+
+def test_reject_other_version(snapshot_path):
+    content = bytearray(snapshot_path.read_bytes())
+    content[8] += 1
+    snapshot_path.write_bytes(bytes(content))
+    with pytest.raises(SnapshotError, match="version"):
+        WordIndex().load(str(snapshot_path))
+
+
+def test_reject_other_files(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_bytes(b"casa\n" * HEADER.size)
+    with pytest.raises(SnapshotError, match="not a snapshot"):
+        WordIndex().load(str(path))
+    path.write_bytes(b"casa\n")
+    with pytest.raises(SnapshotError, match="too small"):
+        WordIndex().load(str(path))
@@ -4,6 +4,9 @@ from unittest.mock import patch
 import pytest
 
 from wordavl.text_data import TextData
+from wordavl.text_data import normalize_key
+from wordavl.text_data import _sample_split_words
+from wordavl.text_data import _split_byte_ranges
 
 
 @pytest.fixture
@@ -121,3 +124,101 @@ def test_get_unique_words_with_multiline_text(text_data_instance):
     text_data_instance.raw_data = "This is a\nmultiline\nsentence."
     expected_unique_words = ["This", "is", "a", "multiline", "sentence"]
     assert set(text_data_instance.get_unique_words()) == set(expected_unique_words)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64])
+def test_iter_words_with_words_across_chunks(tmp_path, chunk_size):
+    # Test that words crossing the chunk boundaries are never split
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("Hello, world! Ação e\nreação, 123 números.")
+    text_data = TextData(str(file_path), stream=True, chunk_size=chunk_size)
+    assert text_data.raw_data is None
+    expected_words = ["Hello", "world", "Ação", "e", "reação", "123", "números"]
+    assert list(text_data.iter_words()) == expected_words
+
+
+def test_iter_words_from_streamed_link():
+    # Test that a web link is read through the streamed response
+    mocked_response = MagicMock()
+    mocked_response.__enter__.return_value = mocked_response
+    mocked_response.encoding = None
+    mocked_response.iter_content.return_value = iter(["Mocked res", "ponse text"])
+    with patch("requests.get") as mocked_get:
+        mocked_get.return_value = mocked_response
+        text_data = TextData("https://example.com", stream=True)
+        assert text_data.get_word_list() == ["Mocked", "response", "text"]
+    mocked_get.assert_called_once_with("https://example.com", stream=True)
+    assert mocked_response.encoding == "utf-8"
+
+
+def test_iter_unique_words_dedup_modes(text_data_instance):
+    text_data_instance.raw_data = "a a b a c c"
+    assert list(text_data_instance.iter_unique_words()) == ["a", "b", "c"]
+    assert list(text_data_instance.iter_unique_words(dedup="adjacent")) == ["a", "b", "a", "c"]
+    assert list(text_data_instance.iter_unique_words(dedup="none")) == list("aabacc")
+    with pytest.raises(ValueError):
+        list(text_data_instance.iter_unique_words(dedup="other"))
+
+
+def test_get_unique_words_from_stream(tmp_path):
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("casa\ncarro\ncasa\nbola\n")
+    text_data = TextData(str(file_path), stream=True, chunk_size=4)
+    assert text_data.get_unique_words() == ["casa", "carro", "bola"]
+
+
+def test_get_word_counts(text_data_instance):
+    text_data_instance.raw_data = "casa bola casa, casa! bola carro"
+    assert text_data_instance.get_word_counts() == {"casa": 3, "bola": 2, "carro": 1}
+
+
+def test_get_word_counts_from_stream(tmp_path):
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("casa bola casa\ncasa carro")
+    text_data = TextData(str(file_path), stream=True, chunk_size=3)
+    assert text_data.get_word_counts() == {"casa": 3, "bola": 1, "carro": 1}
+
+
+def test_split_byte_ranges_keeps_words(tmp_path):
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("ação coração\nmaçã pão\n\nlimão " * 7, encoding="utf-8")
+    content = file_path.read_bytes()
+    for parts in [1, 2, 3, 10, 500]:
+        ranges = _split_byte_ranges(str(file_path), parts)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(content)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        words = [w for start, end in ranges for w in content[start:end].decode().split()]
+        assert words == content.decode().split()
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_get_word_counts_with_workers(tmp_path, workers):
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("casa bola casa\ncasa, carro! ação\nbola ação\n" * 5, encoding="utf-8")
+    expected = TextData(str(file_path)).get_word_counts()
+    text_data = TextData(str(file_path), workers=workers)
+    assert text_data.raw_data is None
+    counts = text_data.get_word_counts()
+    assert counts == expected
+    assert list(counts) == sorted(expected)
+    assert text_data.get_unique_words() == sorted(expected)
+
+
+def test_get_word_counts_with_workers_splits_the_vocabulary(tmp_path):
+    file_path = tmp_path / "test.txt"
+    words = [f"palavra{number % 997:03d}" for number in range(20000)]
+    file_path.write_text(" ".join(words), encoding="utf-8")
+    split_words = _sample_split_words(str(file_path), 4)
+    assert len(split_words) == 3 and split_words == sorted(split_words)
+
+    counts = TextData(str(file_path), workers=4).get_word_counts()
+    assert counts == TextData(str(file_path)).get_word_counts()
+    assert list(counts) == sorted(counts)
+
+
+def test_normalize_key():
+    assert normalize_key("Ação") == "acao"
+    assert normalize_key("AARÃO") == "aarao"
+    assert normalize_key("à") == "a"
+    assert normalize_key("Straße") == "strasse"
+    assert normalize_key("casa") == "casa"
@@ -0,0 +1,73 @@
+import pytest
+
+from wordavl.word_front import WordFront
+from wordavl.word_index import WordIndex
+
+
+@pytest.fixture
+def corpus():
+    return ["casa", "casamento", "carro", "bola", "casaco", "ação", "açúcar", "zebra", "casa"]
+
+
+@pytest.fixture
+def word_front(corpus):
+    word_front = WordFront(corpus=corpus, block_size=3)
+    word_front.train()
+    return word_front
+
+
+def test_train_sorts_and_compresses(word_front, corpus):
+    assert list(word_front) == sorted(set(corpus))
+    assert word_front.words() == sorted(set(corpus))
+    assert len(word_front) == 8
+    assert len(word_front.offsets) == 4
+    assert len(word_front.buffer) < sum(len(word.encode()) + 1 for word in set(corpus))
+    assert word_front.corpus == ""
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 8, 100])
+def test_autocomplete_matches_word_index(corpus, block_size):
+    word_front = WordFront(corpus=corpus, block_size=block_size)
+    word_front.train()
+    word_index = WordIndex(corpus=corpus)
+    word_index.train()
+    for prefix in ["a", "aç", "b", "ca", "cas", "casa", "casamentos", "d", "z", "zz"]:
+        for limit in [None, 0, 1, 2]:
+            expected = word_index.autocomplete(prefix, limit=limit)
+            assert word_front.autocomplete(prefix, limit=limit) == expected
+
+
+def test_autocomplete(word_front):
+    assert word_front.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_front.autocomplete("ca", limit=2) == ["carro", "casa"]
+    assert word_front.autocomplete("xyz") == []
+    assert word_front.autocomplete("") == ""
+
+
+def test_contains(word_front):
+    assert word_front.contains("casa")
+    assert word_front.contains("açúcar")
+    assert not word_front.contains("cas")
+    assert not word_front.contains("zebras")
+
+
+def test_shared_length_equal_to_separator():
+    # The shared length 10 is stored as the byte of the new line separator
+    corpus = ["abcdefghij", "abcdefghijk", "abcdefghijkl", "abcdefghijx"]
+    word_front = WordFront(corpus=corpus, block_size=4)
+    word_front.train()
+    assert list(word_front) == corpus
+    assert word_front.autocomplete("abcdefghijk") == ["abcdefghijk", "abcdefghijkl"]
+
+
+def test_invalid_block_size():
+    with pytest.raises(ValueError):
+        WordFront(block_size=0)
+
+
+def test_empty_word_front():
+    word_front = WordFront()
+    word_front.train()
+    assert len(word_front) == 0
+    assert word_front.autocomplete("a") == []
+    assert not word_front.contains("a")
@@ -0,0 +1,54 @@
+import pytest
+
+from wordavl.word_index import WordIndex
+
+
+@pytest.fixture
+def word_index():
+    corpus = ["casa", "casamento", "carro", "bola", "casaco", "ação", "açúcar", "zebra", "casa"]
+    word_index = WordIndex(corpus=corpus)
+    word_index.train()
+    return word_index
+
+
+def test_train_sorts_and_deduplicates(word_index):
+    assert list(word_index) == [
+        "ação",
+        "açúcar",
+        "bola",
+        "carro",
+        "casa",
+        "casaco",
+        "casamento",
+        "zebra",
+    ]
+    assert len(word_index) == 8
+    assert word_index.corpus == ""
+
+
+def test_autocomplete(word_index):
+    assert word_index.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_index.autocomplete("aç") == ["ação", "açúcar"]
+    assert word_index.autocomplete("casamentos") == []
+    assert word_index.autocomplete("xyz") == []
+    assert word_index.autocomplete("") == ""
+
+
+def test_autocomplete_with_limit(word_index):
+    assert word_index.autocomplete("ca", limit=2) == ["carro", "casa"]
+    assert word_index.autocomplete("ca", limit=0) == []
+
+
+def test_contains(word_index):
+    assert word_index.contains("casa")
+    assert word_index.contains("açúcar")
+    assert not word_index.contains("cas")
+    assert not word_index.contains("zebras")
+
+
+def test_empty_index():
+    word_index = WordIndex()
+    word_index.train()
+    assert len(word_index) == 0
+    assert word_index.autocomplete("a") == []
+    assert not word_index.contains("a")
@@ -0,0 +1,80 @@
+import pytest
+
+from wordavl.word_list import WordList
+
+
+@pytest.fixture
+def word_list(tmp_path):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text("casa\ncasamento\ncarro\nbola\ncasaco\nabacate\n")
+    word_list = WordList()
+    word_list.read_corpus(str(file_path))
+    return word_list
+
+
+def test_read_corpus_sorts_words(word_list):
+    assert word_list.corpus == ["abacate", "bola", "carro", "casa", "casaco", "casamento"]
+
+
+def test_autocomplete(word_list):
+    assert word_list.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_list.autocomplete("xyz") == []
+
+
+def test_autocomplete_with_limit(word_list):
+    assert word_list.autocomplete("ca", limit=2) == ["carro", "casa"]
+    assert word_list.autocomplete("ca", limit=0) == []
+
+
+def test_autocomplete_many(word_list):
+    prefixes = ["cas", "ca", "xyz", "b", "ca"]
+    results = word_list.autocomplete_many(prefixes)
+    assert list(results) == ["b", "ca", "cas", "xyz"]
+    for prefix in prefixes:
+        assert results[prefix] == word_list.autocomplete(prefix)
+    assert word_list.autocomplete_many(["ca"], limit=1) == {"ca": ["carro"]}
+
+
+@pytest.fixture
+def vectorized_words():
+    pytest.importorskip("numpy")
+    words = {"casa": 3, "casamento": 5, "carro": 2, "bola": 1, "casaco": 3, "ação": 4, "açaí": 1}
+    scanned = WordList(corpus=sorted(words))
+    scanned.weights = words
+    vectorized = WordList(corpus=words, vectorized=True)
+    vectorized.train()
+    return scanned, vectorized
+
+
+def test_vectorized_autocomplete(vectorized_words):
+    scanned, vectorized = vectorized_words
+    prefixes = ["c", "cas", "casa", "ca", "aç", "açã", "b", "z", "casamentos"]
+    for prefix in prefixes:
+        for ranked in [False, True]:
+            for limit in [None, 1, 2]:
+                expected = scanned.autocomplete(prefix, limit=limit, ranked=ranked)
+                assert vectorized.autocomplete(prefix, limit=limit, ranked=ranked) == expected
+    assert vectorized.autocomplete_many(prefixes, limit=2) == scanned.autocomplete_many(
+        prefixes, limit=2
+    )
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 4, 20])
+def test_prefix_counts(vectorized_words, length):
+    scanned, vectorized = vectorized_words
+    assert vectorized.prefix_counts(length) == scanned.prefix_counts(length)
+    assert list(vectorized.prefix_counts(length)) == sorted(vectorized.prefix_counts(length))
+
+
+def test_prefix_counts_scanned(word_list):
+    assert word_list.prefix_counts(2) == {"ab": 1, "bo": 1, "ca": 4}
+    # Every word starts with the empty prefix
+    assert word_list.prefix_counts(0) == {"": 6}
+
+
+def test_vectorized_without_numpy(monkeypatch):
+    monkeypatch.setattr("wordavl.word_list.find_spec", lambda name: None)
+    word_list = WordList(corpus=["casa", "bola"], vectorized=True)
+    word_list.train()
+    assert not word_list.vectorized and word_list.array is None
+    assert word_list.autocomplete("ca") == ["casa"]
@@ -0,0 +1,55 @@
+import pytest
+
+from wordavl.word_radix import WordRadix
+
+
+@pytest.fixture
+def word_radix():
+    corpus = ["casa", "casamento", "carro", "bola", "casaco", "ação", "açúcar", "zebra"]
+    word_radix = WordRadix(corpus=corpus)
+    word_radix.train()
+    return word_radix
+
+
+def test_autocomplete(word_radix):
+    assert word_radix.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_radix.autocomplete("casam") == ["casamento"]
+    assert word_radix.autocomplete("aç") == ["ação", "açúcar"]
+    assert word_radix.autocomplete("casamentos") == []
+    assert word_radix.autocomplete("") == ""
+
+
+def test_autocomplete_with_limit(word_radix):
+    assert word_radix.autocomplete("ca", limit=2) == ["carro", "casa"]
+    assert word_radix.autocomplete("ca", limit=0) == []
+
+
+def test_count_prefix(word_radix):
+    assert word_radix.count_prefix("ca") == 4
+    assert word_radix.count_prefix("casam") == 1
+    assert word_radix.count_prefix("x") == 0
+
+
+def test_autocomplete_with_typos(word_radix):
+    assert word_radix.autocomplete("cas", max_edits=1) == [
+        "casa",
+        "casaco",
+        "casamento",
+        "carro",
+    ]
+    assert word_radix.autocomplete("vasam", max_edits=1) == ["casamento"]
+    assert word_radix.autocomplete("csa", max_edits=1) == ["carro", "casa", "casaco", "casamento"]
+    assert word_radix.autocomplete("acao", max_edits=1) == []
+    assert word_radix.autocomplete("acão", max_edits=1) == ["ação"]
+    assert word_radix.autocomplete("cas", limit=2, max_edits=1) == ["casa", "casaco"]
+
+
+def test_autocomplete_with_typos_ranked():
+    word_radix = WordRadix(corpus={"casa": 1, "casaco": 5, "carro": 9, "cama": 3})
+    word_radix.train()
+    assert word_radix.autocomplete("cas", ranked=True, max_edits=1) == [
+        "casaco",
+        "casa",
+        "carro",
+        "cama",
+    ]
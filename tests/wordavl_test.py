@@ -0,0 +1,330 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from wordavl.metrics import Metrics
+from wordavl.structures.avl import AVLNode
+from wordavl.wordavl import WordAVL
+
+
+@pytest.fixture
+def corpus():
+    return ["casa", "casamento", "carro", "bola", "casaco", "abacate", "abacaxi", "zebra"]
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_train(corpus, bulk):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train(bulk=bulk)
+    assert list(word_avl) == sorted(corpus)
+
+
+def test_train_bulk_keeps_added_words(corpus):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.add("dado")
+    word_avl.train()
+    assert list(word_avl) == sorted(corpus + ["dado"])
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_autocomplete(corpus, bulk):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train(bulk=bulk)
+    assert word_avl.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    assert word_avl.autocomplete("xyz") == []
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_autocomplete_with_limit(corpus, bulk):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train(bulk=bulk)
+    assert word_avl.autocomplete("ca", limit=2) == ["carro", "casa"]
+    assert word_avl.autocomplete("ca", limit=10) == ["carro", "casa", "casaco", "casamento"]
+    assert word_avl.autocomplete("ca", limit=0) == []
+
+
+def test_autocomplete_with_empty_prefix(corpus):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train()
+    assert word_avl.autocomplete("") == ""
+
+
+def test_read_corpus(tmp_path):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text("casa\ncarro\ncasa\nbola\n")
+    word_avl = WordAVL()
+    word_avl.read_corpus(str(file_path))
+    word_avl.train()
+    assert list(word_avl) == ["bola", "carro", "casa"]
+
+
+@pytest.mark.parametrize("dedup", ["exact", "adjacent", "none"])
+def test_read_corpus_streamed(tmp_path, dedup):
+    file_path = tmp_path / "corpus.txt"
+    file_path.write_text("bola\ncarro\ncasa\ncasa\n")
+    word_avl = WordAVL()
+    word_avl.read_corpus(str(file_path), stream=True, dedup=dedup)
+    word_avl.train()
+    assert list(word_avl) == ["bola", "carro", "casa"]
+
+
+@pytest.fixture
+def cached_word_avl(corpus):
+    word_avl = WordAVL(corpus=corpus, cache_size=8)
+    word_avl.train()
+    return word_avl
+
+
+def test_autocomplete_cache_hits(cached_word_avl):
+    first = cached_word_avl.autocomplete("cas")
+    first.append("changed")
+    assert cached_word_avl.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    info = cached_word_avl.cache_info()
+    assert info["hits"] == 1
+    assert info["misses"] == 1
+
+
+def test_autocomplete_cache_derives_longer_prefix(cached_word_avl):
+    cached_word_avl.autocomplete("ca")
+    assert cached_word_avl.autocomplete("casa") == ["casa", "casaco", "casamento"]
+    assert cached_word_avl.autocomplete("casa", limit=2) == ["casa", "casaco"]
+    assert cached_word_avl.autocomplete("cax") == []
+    assert cached_word_avl.cache_info()["derived"] == 3
+
+
+def test_autocomplete_cache_derives_ranked_prefix():
+    word_avl = WordAVL(corpus={"casa": 1, "casaco": 5, "carro": 9, "casamento": 3}, cache_size=8)
+    word_avl.train()
+    word_avl.autocomplete("ca", ranked=True)
+    assert word_avl.autocomplete("cas", ranked=True) == ["casaco", "casamento", "casa"]
+    assert word_avl.cache_info()["derived"] == 1
+
+
+def test_autocomplete_cache_invalidated_by_add(cached_word_avl):
+    assert cached_word_avl.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    cached_word_avl.add("casinha")
+    assert cached_word_avl.autocomplete("cas") == ["casa", "casaco", "casamento", "casinha"]
+    assert cached_word_avl.cache_info()["hits"] == 0
+
+
+def test_autocomplete_cache_invalidated_by_train(cached_word_avl):
+    assert cached_word_avl.autocomplete("d") == []
+    cached_word_avl.corpus = ["dado"]
+    cached_word_avl.train()
+    assert cached_word_avl.autocomplete("d") == ["dado"]
+
+
+def test_cache_info_without_cache(corpus):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train()
+    word_avl.autocomplete("ca")
+    assert word_avl.cache_info() == {}
+
+
+@pytest.mark.parametrize("ranked", [True, False])
+def test_autocomplete_metrics(corpus, ranked):
+    metrics = Metrics()
+    word_avl = WordAVL(corpus=corpus, metrics=metrics)
+    word_avl.train()
+    assert word_avl.autocomplete("ca", limit=2, ranked=ranked) == word_avl._autocomplete(
+        "ca", limit=2, ranked=ranked
+    )
+    word_avl.autocomplete("x")
+    histograms = metrics.info()["histograms"]
+    assert histograms["build_seconds"]["count"] == 1
+    assert histograms["query_seconds"]["count"] == 2
+    assert histograms["query_results"]["sum"] == 2
+    # At least the two results were visited, and never more than the whole tree
+    assert 2 <= histograms["query_visited_nodes"]["sum"] <= 2 * len(corpus)
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_autocomplete_matches_linear_scan(bulk):
+    words = [f"{a}{b}{c}" for a in "abc" for b in "abc" for c in "abc"]
+    word_avl = WordAVL(corpus=words[::-1])
+    word_avl.train(bulk=bulk)
+    for prefix in ["a", "ab", "abc", "b", "cc", "d", "0"]:
+        expected = [word for word in words if word.startswith(prefix)]
+        assert word_avl.autocomplete(prefix) == expected
+        assert word_avl.autocomplete(prefix, limit=2) == expected[:2]
+
+
+def test_autocomplete_many(corpus):
+    word_avl = WordAVL(corpus=corpus)
+    word_avl.train()
+    prefixes = ["cas", "ca", "xyz", "abacat", "cas", "", "z"]
+    results = word_avl.autocomplete_many(iter(prefixes))
+    assert list(results) == sorted(set(prefixes))
+    for prefix in prefixes:
+        assert results[prefix] == word_avl.autocomplete(prefix)
+    assert word_avl.autocomplete_many(["ca", "casa"], limit=2) == {
+        "ca": ["carro", "casa"],
+        "casa": ["casa", "casaco"],
+    }
+
+
+def test_apply_delta(corpus):
+    word_avl = WordAVL(corpus={word: 2 for word in corpus}, cache_size=8)
+    word_avl.train()
+    assert word_avl.autocomplete("cas") == ["casa", "casaco", "casamento"]
+    word_avl.apply_delta(adds=["casinha", "casa"], removes=["casaco", "inexistente"])
+    assert word_avl.autocomplete("cas") == ["casa", "casamento", "casinha"]
+    assert word_avl.autocomplete("cas", ranked=True) == ["casa", "casamento", "casinha"]
+    word_avl.apply_delta(adds={"casinha": 9}, removes=["casa"])
+    assert word_avl.autocomplete("cas", ranked=True) == ["casinha", "casamento"]
+    assert list(word_avl) == sorted(set(corpus) - {"casa", "casaco"} | {"casinha"})
+
+
+@pytest.mark.parametrize("cache_size", [0, 8])
+@pytest.mark.parametrize("ranked", [True, False])
+def test_autocomplete_pages(cache_size, ranked):
+    words = {f"{a}{b}{c}": ord(c) % 5 for a in "abc" for b in "abc" for c in "abc"}
+    word_avl = WordAVL(corpus=words, cache_size=cache_size)
+    word_avl.train()
+    for prefix in ["a", "ab", "c", "d"]:
+        # The complete results are cached first, so the pages can be derived from them
+        expected = word_avl.autocomplete(prefix[0], ranked=ranked)
+        expected = [word for word in expected if word.startswith(prefix)]
+        pages = [word_avl.autocomplete(prefix, 2, ranked, offset) for offset in range(0, 12, 2)]
+        assert sum(pages, []) == expected
+        assert word_avl.autocomplete(prefix, ranked=ranked, offset=1) == expected[1:]
+
+
+@pytest.fixture
+def normalized_word_avl():
+    corpus = {"Ação": 2, "ação": 5, "acaso": 1, "Aarão": 1, "à": 3, "casa": 4, "CASA": 1}
+    word_avl = WordAVL(corpus=corpus, normalize=True)
+    word_avl.train()
+    return word_avl
+
+
+def test_autocomplete_normalized(normalized_word_avl):
+    assert normalized_word_avl.autocomplete("acao") == ["ação", "Ação"]
+    assert normalized_word_avl.autocomplete("ACA") == ["ação", "Ação", "acaso"]
+    assert normalized_word_avl.autocomplete("aarao") == ["Aarão"]
+    assert normalized_word_avl.autocomplete("a", limit=2) == ["à", "Aarão"]
+    assert normalized_word_avl.autocomplete("cas", ranked=True) == ["casa", "CASA"]
+    assert normalized_word_avl.autocomplete("a", ranked=True, limit=2) == ["ação", "à"]
+    assert normalized_word_avl.autocomplete("a", limit=2, offset=1) == ["Aarão", "ação"]
+    assert normalized_word_avl.autocomplete_many(["acao", "Cas"]) == {
+        "Cas": ["casa", "CASA"],
+        "acao": ["ação", "Ação"],
+    }
+
+
+def test_ranked_normalized_spellings_are_merged_by_weight(normalized_word_avl):
+    # The spellings of different keys interleave by their own weight, equal weights in
+    # lexicographic order
+    expected = ["ação", "à", "Ação", "Aarão", "acaso"]
+    assert normalized_word_avl.autocomplete("A", ranked=True) == expected
+    assert normalized_word_avl.autocomplete("a", ranked=True, limit=3, offset=1) == expected[1:4]
+    word_avl = WordAVL(corpus={"Aba": 5, "aba": 1, "abb": 4}, normalize=True)
+    word_avl.train()
+    assert word_avl.autocomplete("ab", ranked=True, limit=2) == ["Aba", "abb"]
+    assert word_avl.autocomplete("ab", ranked=True) == ["Aba", "abb", "aba"]
+
+
+def test_normalized_updates(normalized_word_avl):
+    assert normalized_word_avl.contains("Ação")
+    assert not normalized_word_avl.contains("acao")
+    normalized_word_avl.apply_delta(adds=["acao", "ação"], removes=["Ação", "acaso", "casa"])
+    assert normalized_word_avl.autocomplete("aca") == ["ação", "acao"]
+    assert normalized_word_avl.autocomplete("casa") == ["CASA"]
+    normalized_word_avl.remove("CASA")
+    assert normalized_word_avl.autocomplete("casa") == []
+    assert list(normalized_word_avl) == ["à", "Aarão", "ação", "acao"]
+
+
+def test_normalized_snapshot(normalized_word_avl, tmp_path):
+    path = str(tmp_path / "normalized.snapshot")
+    normalized_word_avl.save(path)
+    word_avl = WordAVL(normalize=True)
+    word_avl.load(path)
+    assert list(word_avl) == list(normalized_word_avl)
+    assert word_avl.autocomplete("acao") == ["ação", "Ação"]
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_concurrent_reads_during_updates(cache_size, normalize):
+    # Normalized words are stored under a lowercase key and found by their original spelling
+    stem = "Casa" if normalize else "casa"
+    stable = [f"{stem}{number:04d}" for number in range(0, 2000, 2)]
+    added = [f"{stem}{number:04d}" for number in range(1, 2000, 2)]
+    word_avl = WordAVL(
+        corpus=stable, cache_size=cache_size, normalize=normalize, concurrent=True
+    )
+    word_avl.train()
+    errors = list()
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            for prefix in ["casa", "casa0", "casa1", "casa15"]:
+                results = word_avl.autocomplete(prefix)
+                # Every search sees one version of the tree: sorted, without duplicates,
+                # holding every word that is never removed and only words that were added
+                matches = {word for word in stable if word.lower().startswith(prefix)}
+                if (
+                    results != sorted(set(results))
+                    or not set(results) >= matches
+                    or not set(results) <= set(stable + added)
+                ):
+                    errors.append(prefix)
+                page = word_avl.autocomplete("casa", limit=5, offset=100)
+                if len(page) != 5 or page != sorted(page):
+                    errors.append("page")
+                best = word_avl.autocomplete("casa1", limit=5, ranked=True)
+                if len(best) != 5 or not set(best) <= set(stable + added):
+                    errors.append("ranked")
+
+    # Switch threads as often as possible, so the readers run in the middle of the rotations
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    try:
+        for reader in readers:
+            reader.start()
+        for round in range(3):
+            random.Random(round).shuffle(added)
+            for word in added:
+                word_avl.add(word)
+            for word in added:
+                word_avl.remove(word)
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert not errors
+    assert list(word_avl) == stable
+
+
+def test_concurrent_normalized_updates_are_hidden_until_published(monkeypatch):
+    stable = [f"Ação{number:03d}" for number in range(0, 200, 2)]
+    added = [f"Ação{number:03d}" for number in range(1, 200, 2)]
+    random.Random(0).shuffle(added)
+    word_avl = WordAVL(corpus=stable, normalize=True, concurrent=True)
+    word_avl.train()
+    spellings = set(stable + added + [word.upper() for word in added])
+    calculate = AVLNode.calculate_height_and_imbalance
+
+    def interrupted(node):
+        # A search running in the middle of the update finds original spellings only
+        results = word_avl.autocomplete("acao")
+        assert set(stable) <= set(results) <= spellings
+        assert word_avl.contains(stable[-1])
+        calculate(node)
+
+    monkeypatch.setattr(AVLNode, "calculate_height_and_imbalance", interrupted)
+    for word in added:
+        word_avl.add(word)
+        # The spelling of a new word is published with the key, replacing the key itself
+        word_avl.add(word.upper())
+    for word in added:
+        word_avl.remove(word.upper())
+        word_avl.remove(word)
+    assert list(word_avl) == stable
@@ -1,40 +1,81 @@
-import streamlit as st
-from wordavl.wordavl import WordAVL
+import asyncio
+from typing import List
 
-# Global variable to store the AVL tree
-avltree = None
+import typer
+from cli import create_word_class
+from cli import import_word_class
+from wordavl.metrics import Metrics
+from wordavl.registry import IndexRegistry
+from wordavl.server import AutocompleteServer
+from wordavl.server import serve_prefork
+from wordavl.snapshot import SnapshotError
 
+app = typer.Typer()
 
-# Function to create AVL tree and initialize it with corpus
-def create_avl_tree():
-    global avltree
-    avltree = WordAVL()
-    avltree.read_corpus("assets/br-utf8.txt")
-    avltree.train()
 
+SNAPSHOT_PATH = "assets/br-utf8.snapshot"
 
-# Check if AVL tree has been initialized, if not, create it
-if avltree is None:
-    create_avl_tree()
 
+# Command to serve the autocomplete suggestions over HTTP
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Address to listen on."),
+    port: int = typer.Option(8000, help="Port to listen on."),
+    word_class: str = typer.Option("index", help="Structure answering the lookups."),
+    snapshot: str = typer.Option(
+        SNAPSHOT_PATH, help="Snapshot file loaded instead of the corpus, created if missing."
+    ),
+    workers: int = typer.Option(
+        1, help="Number of processes forked after loading the index, sharing its memory."
+    ),
+    metrics: bool = typer.Option(False, help="Record the requests and serve them on /metrics."),
+    index: List[str] = typer.Option(
+        None,
+        help="Named index as NAME=PATH, loaded on its first search from a '.snapshot' file or "
+        "a corpus. Repeat it to serve several indexes, the first one being the default.",
+    ),
+    memory_budget: float = typer.Option(
+        None, help="MiB the named indexes may take before the least recently used are evicted."
+    ),
+):
+    recorder = Metrics() if metrics else None
+    if index:
+        words = IndexRegistry(
+            memory_budget=None if memory_budget is None else int(memory_budget * 2**20),
+            metrics=recorder,
+        )
+        structure = import_word_class(word_class)
+        for spec in index:
+            name, separator, path = spec.partition("=")
+            if not separator or not name or not path:
+                raise typer.BadParameter("Use NAME=PATH.", param_hint="--index")
+            source, snapshot_path = (None, path) if path.endswith(".snapshot") else (path, None)
+            try:
+                words.register(
+                    name,
+                    source=source,
+                    snapshot=snapshot_path,
+                    word_class=structure,
+                    metrics=recorder,
+                )
+            except FileNotFoundError as error:
+                raise typer.BadParameter(str(error), param_hint="--index")
+    else:
+        # The index is built (or loaded) once, before the server starts accepting connections
+        try:
+            words = create_word_class(word_class, snapshot=snapshot, metrics=recorder)
+        except SnapshotError as error:
+            raise typer.BadParameter(str(error), param_hint="--snapshot")
+    server = AutocompleteServer(words, metrics=recorder)
+    if workers > 1:
+        serve_prefork(server, workers, host=host, port=port)
+        return
 
-# Streamlit UI
-def main():
-    st.title("Word Prefix Matcher")
-
-    # Input for prefix
-    prefix = st.text_input("Enter Prefix:", "")
-
-    # Button to trigger the word retrieval
-    if st.button("Get Words"):
-        if prefix:
-            words = avltree.autocomplete(prefix)
-            st.write("Words found:")
-            for word in words:
-                st.write(word)
-        else:
-            st.warning("Please enter a prefix.")
+    try:
+        asyncio.run(server.serve_forever(host=host, port=port))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
-    main()
+    app()
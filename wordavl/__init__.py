@@ -1 +1,8 @@
-from wordavl.wordavl import WordAVL
+def __getattr__(name):
+    # WordAVL is imported on first use, so importing a light submodule such as wordavl.metrics
+    # doesn't load the whole package and its dependencies
+    if name == "WordAVL":
+        from wordavl.wordavl import WordAVL
+
+        return WordAVL
+    raise AttributeError(f"module 'wordavl' has no attribute '{name}'")
@@ -0,0 +1,27 @@
+from bisect import bisect_left
+
+
+def sweep_prefixes(words, prefixes, limit: int = None):
+    """
+    Find the words starting with each prefix in a single sweep over the sorted words.
+
+    The prefixes are visited in sorted order, so the position of the first match of each prefix
+    is never before the one of the previous prefix and each search only looks at the words after
+    it. Prefixes sharing a stem are answered from the same region of the words.
+
+    Args:
+        words (Sequence): The words, in lexicographic order and without duplicates.
+        prefixes (Iterable): The prefixes to search for. Repeated prefixes are answered once.
+        limit (int, optional): The maximum number of words returned per prefix. Defaults to None.
+
+    Yields:
+        tuple: Each prefix, in lexicographic order, and the list of the words starting with it.
+    """
+    start = 0
+    for prefix in sorted(set(prefixes)):
+        start = bisect_left(words, prefix, start)
+        stop = len(words) if limit is None else min(len(words), start + limit)
+        end = start
+        while end < stop and words[end].startswith(prefix):
+            end += 1
+        yield prefix, words[start:end]
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entry when it is full.
+
+    It can be shared by threads: an entry may be evicted by another thread at any time, which
+    only makes a lookup miss.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept in the cache.
+        hits (int): The number of lookups that found their key.
+        misses (int): The number of lookups that didn't find their key.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initialize an empty LRUCache.
+
+        Args:
+            maxsize (int): The maximum number of entries kept in the cache.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Look up a key and mark it as the most recently used.
+
+        Args:
+            key: The key to look up.
+            default (optional): The value returned when the key is missing. Defaults to None.
+
+        Returns:
+            The value stored for the key, or the default value.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread since it was found
+            pass
+        self.hits += 1
+        return value
+
+    def peek(self, key, default=None):
+        """
+        Look up a key without changing the counters nor the eviction order.
+        """
+        return self._entries.get(key, default)
+
+    def put(self, key, value) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key of the value.
+            value: The value to be stored.
+        """
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = value
+        try:
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        except KeyError:
+            # Another thread evicted the entry or emptied the cache in between
+            pass
+
+    def clear(self) -> None:
+        """
+        Remove every entry. The counters are kept.
+        """
+        self._entries.clear()
+
+    def info(self) -> dict:
+        """
+        Return the statistics of the cache.
+
+        Returns:
+            dict: The number of hits, misses, stored entries and the maximum number of entries.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self), "maxsize": self.maxsize}
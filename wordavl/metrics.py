@@ -0,0 +1,184 @@
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Upper bounds of the buckets counting results or visited nodes
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 100000)
+
+
+class Histogram:
+    """
+    Counts the observed values falling in each bucket.
+
+    Attributes:
+        buckets (tuple): The sorted upper bounds of the buckets. Values above the last bound
+            fall in an extra bucket without upper bound.
+        counts (list): The number of values falling in each bucket, not cumulative.
+        count (int): The number of observed values.
+        sum (float): The sum of the observed values.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS) -> None:
+        """
+        Initialize an empty Histogram.
+
+        Args:
+            buckets (tuple, optional): The sorted upper bounds of the buckets. Defaults to
+                `LATENCY_BUCKETS`.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value) -> None:
+        """
+        Count a value in the first bucket whose upper bound isn't below it.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> list:
+        """
+        Return the number of values below or equal to each upper bound, the last one being the
+        number of values.
+        """
+        total = 0
+        counts = list()
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+    def info(self) -> dict:
+        """
+        Return the content of the histogram.
+
+        Returns:
+            dict: The number and the sum of the values, and the cumulative count of each bucket
+                by its upper bound ("+Inf" for the last bucket).
+        """
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(bounds, self.cumulative_counts())),
+        }
+
+
+class Metrics:
+    """
+    Counters and histograms describing the operations of the word structures.
+
+    A structure records its operations only when it is given a Metrics object, so structures
+    without one don't pay for the measurements. One object can be shared by several structures
+    and by the server.
+
+    Attributes:
+        namespace (str): The prefix of the metric names in the Prometheus format.
+        counters (dict): The value of each counter by its name.
+        histograms (dict): The Histogram of each measured value by its name.
+    """
+
+    def __init__(self, namespace: str = "wordavl") -> None:
+        """
+        Initialize empty Metrics.
+
+        Args:
+            namespace (str, optional): The prefix of the metric names in the Prometheus format.
+                Defaults to "wordavl".
+        """
+        self.namespace = namespace
+        self.counters = dict()
+        self.histograms = dict()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """
+        Add an amount to a counter, created at zero.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value, buckets=LATENCY_BUCKETS) -> None:
+        """
+        Count a value in a histogram, created with the given buckets.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(buckets)
+        histogram.observe(value)
+
+    def record(self, operation: str, seconds: float, results: int = None, visited: int = None):
+        """
+        Record one run of an operation.
+
+        Args:
+            operation (str): The name of the operation, such as "query" or "build".
+            seconds (float): The duration of the operation, in the "<operation>_seconds" histogram.
+            results (int, optional): The number of results, in the "<operation>_results"
+                histogram. Defaults to None (not recorded).
+            visited (int, optional): The number of nodes visited, in the
+                "<operation>_visited_nodes" histogram. Defaults to None (not recorded).
+        """
+        self.observe(f"{operation}_seconds", seconds)
+        if results is not None:
+            self.observe(f"{operation}_results", results, COUNT_BUCKETS)
+        if visited is not None:
+            self.observe(f"{operation}_visited_nodes", visited, COUNT_BUCKETS)
+
+    def info(self) -> dict:
+        """
+        Return the counters and the histograms.
+
+        Returns:
+            dict: The "counters" and the "histograms" by name, see `Histogram.info`.
+        """
+        return {
+            "counters": dict(self.counters),
+            "histograms": {name: histogram.info() for name, histogram in self.histograms.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Return the counters and the histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: One "# TYPE" line per metric followed by its samples, ending with a newline.
+        """
+        lines = list()
+        for name, value in sorted(self.counters.items()):
+            metric = f"{self.namespace}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            bounds = [repr(float(bound)) for bound in histogram.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram.cumulative_counts()):
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum {histogram.sum}")
+            lines.append(f"{metric}_count {histogram.count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,338 @@
+import gc
+import heapq
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from itertools import islice
+from itertools import zip_longest
+from time import perf_counter
+
+from loguru import logger
+
+from wordavl.metrics import Metrics
+
+# Objects shared by the whole process, never counted in the size of an index
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+def deep_size(obj) -> int:
+    """
+    Estimate the memory of an object and of every object it references, each counted once.
+
+    Classes, modules and functions are shared by the whole process and aren't counted. The
+    buffer of a memory-mapped file isn't counted either, only the mapping object.
+
+    Args:
+        obj: The object to measure, such as a trained word structure.
+
+    Returns:
+        int: The estimated number of bytes.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, SHARED_TYPES):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        stack.extend(gc.get_referents(current))
+    return size
+
+
+class IndexRegistry:
+    """
+    Many named word structures served from one process, such as one per language or per customer.
+
+    An index is only registered with the way it is built: read and trained from a corpus, or
+    loaded from a snapshot (created from the corpus on its first load). It is loaded on its first
+    search, and when the loaded indexes take more than the memory budget, the least recently
+    used ones are evicted, to be loaded again on their next search. An index is loaded while
+    holding its own lock only, so the other indexes are searched meanwhile, and the threads
+    searching the same index wait for a single load.
+
+    The memory of an index is measured once it is loaded, by adding up the sizes of the objects
+    it references (see `deep_size`). It takes a few milliseconds for the flat structures and
+    about as long as loading from a snapshot for the AVL tree. The pages of a memory-mapped
+    snapshot (e.g. of a `WordIndex`) are shared through the page cache and aren't counted.
+
+    Attributes:
+        memory_budget (int or None): The bytes the loaded indexes may take, or None for no limit.
+            The last used index is never evicted, even when it is alone over the budget.
+        metrics (Metrics or None): Where the loads ("index_load" histograms) and the evictions
+            ("index_evictions" counter) are recorded.
+        default (str or None): The name of the index searched when none is given, the first
+            registered one.
+        loads (int): The number of indexes loaded, including the ones loaded again after an
+            eviction.
+        evictions (int): The number of indexes evicted.
+    """
+
+    def __init__(self, memory_budget: int = None, metrics: Metrics = None) -> None:
+        """
+        Initialize an empty IndexRegistry.
+
+        Args:
+            memory_budget (int, optional): The bytes the loaded indexes may take. Defaults to
+                None (no limit).
+            metrics (Metrics, optional): Where the loads and the evictions are recorded.
+                Defaults to None (not recorded).
+        """
+        self.memory_budget = memory_budget
+        self.metrics = metrics
+        self.default = None
+        self.loads = 0
+        self.evictions = 0
+        self._specs = dict()
+        # Loaded structures and their memory, from the least to the most recently used
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        # The lock of each index held while it is loaded
+        self._load_locks = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def names(self) -> list:
+        """The names of the registered indexes, in registration order."""
+        return list(self._specs)
+
+    @property
+    def memory(self) -> int:
+        """The bytes taken by the loaded indexes."""
+        return sum(memory for _, memory in self._loaded.values())
+
+    def register(
+        self, name: str, source: str = None, snapshot: str = None, word_class=None, **options
+    ) -> None:
+        """
+        Register an index without loading it. Registering a name again replaces its index.
+
+        Args:
+            name (str): The name of the index.
+            source (str, optional): The corpus (file path or URL) read and trained when there is
+                no snapshot to load. Defaults to None.
+            snapshot (str, optional): The snapshot file loaded instead of the corpus, created from
+                the corpus if it doesn't exist. Without a corpus, it must exist. Defaults to None.
+            word_class (type, optional): The structure of the index, such as `WordIndex`.
+                Defaults to None (`WordAVL`).
+            **options: The keyword arguments of the structure, such as `cache_size`.
+
+        Raises:
+            ValueError: If neither a corpus nor a snapshot is given.
+            FileNotFoundError: If only a snapshot is given and it doesn't exist.
+        """
+        if source is None and snapshot is None:
+            raise ValueError(f"Index '{name}' needs a corpus or a snapshot")
+        if source is None and not os.path.exists(snapshot):
+            raise FileNotFoundError(f"Index '{name}' has no corpus and no snapshot at '{snapshot}'")
+        if word_class is None:
+            from wordavl.wordavl import WordAVL
+
+            word_class = WordAVL
+
+        with self._lock:
+            self._specs[name] = (source, snapshot, word_class, options)
+            self._loaded.pop(name, None)
+            if self.default is None:
+                self.default = name
+
+    def unregister(self, name: str) -> None:
+        """
+        Forget an index, unloading it.
+
+        Raises:
+            KeyError: If no index has the name.
+        """
+        with self._lock:
+            del self._specs[name]
+            self._loaded.pop(name, None)
+            self._load_locks.pop(name, None)
+            if self.default == name:
+                self.default = next(iter(self._specs), None)
+
+    def get(self, name: str = None):
+        """
+        Return a loaded index, loading it first if needed, and mark it as the most recently used.
+
+        Args:
+            name (str, optional): The name of the index. Defaults to None (the default index).
+
+        Raises:
+            KeyError: If no index has the name.
+
+        Returns:
+            The trained structure of the index.
+        """
+        if name is None:
+            name = self.default
+        structure = self._get_loaded(name)
+        if structure is not None:
+            return structure
+
+        with self._load_locks.setdefault(name, threading.Lock()):
+            # Another thread may have loaded the index while this one was waiting
+            structure = self._get_loaded(name)
+            if structure is not None:
+                return structure
+
+            spec = self._specs[name]
+            structure, memory = self._load(name, spec)
+            with self._lock:
+                self.loads += 1
+                # The index may have been registered again while it was loaded
+                if self._specs.get(name) is spec:
+                    self._loaded[name] = (structure, memory)
+                    self._evict()
+            return structure
+
+    def is_loaded(self, name: str = None) -> bool:
+        """
+        Check if an index is loaded, so searching it doesn't load it first.
+
+        Args:
+            name (str, optional): The name of the index. Defaults to None (the default index).
+        """
+        return (self.default if name is None else name) in self._loaded
+
+    def _get_loaded(self, name: str):
+        """
+        Return a loaded index and mark it as the most recently used, or None if it isn't loaded.
+
+        Raises:
+            KeyError: If no index has the name.
+        """
+        with self._lock:
+            if name not in self._specs:
+                raise KeyError(f"Index '{name}' is not registered")
+            loaded = self._loaded.get(name)
+            if loaded is None:
+                return None
+            self._loaded.move_to_end(name)
+            return loaded[0]
+
+    def autocomplete(
+        self, prefix: str, limit: int = None, ranked: bool = False, indexes=None
+    ) -> list:
+        """
+        Provide autocomplete suggestions from one index or merged from several ones.
+
+        Args:
+            prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions to return. Defaults to None.
+            ranked (bool, optional): Whether to return the suggestions with the highest weights
+                first instead of in lexicographic order. Defaults to False.
+            indexes (str or Sequence, optional): The name of the index searched, or the names of
+                the indexes whose suggestions are merged. Defaults to None (the default index).
+
+        Raises:
+            KeyError: If an index isn't registered.
+
+        Returns:
+            list: The autocomplete suggestions, without duplicates. Merged suggestions are in
+                lexicographic order, or ranked in turns: the best suggestion of each index in the
+                given order, then the second ones, and so on, since the weights of different
+                corpora can't be compared. Returns an empty string if no prefix is provided.
+        """
+        if not prefix:
+            return ""
+
+        if indexes is None or isinstance(indexes, str):
+            return self.get(indexes).autocomplete(prefix, limit=limit, ranked=ranked)
+
+        results = [
+            self.get(name).autocomplete(prefix, limit=limit, ranked=ranked) for name in indexes
+        ]
+        if ranked:
+            merged = (word for words in zip_longest(*results) for word in words if word is not None)
+        else:
+            merged = heapq.merge(*results)
+        return list(islice(dict.fromkeys(merged), limit))
+
+    def info(self) -> dict:
+        """
+        Return the state of the indexes.
+
+        Returns:
+            dict: The memory budget, the bytes taken by the loaded indexes, the number of loads
+                and evictions, and whether each index is loaded with its memory in bytes.
+        """
+        indexes = {name: {"loaded": False, "memory": None} for name in self._specs}
+        for name, (_, memory) in self._loaded.items():
+            indexes[name] = {"loaded": True, "memory": memory}
+        return {
+            "memory_budget": self.memory_budget,
+            "memory": self.memory,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "indexes": indexes,
+        }
+
+    def _load(self, name: str, spec: tuple) -> tuple:
+        """
+        Build or load an index, measuring the memory it takes.
+
+        Args:
+            name (str): The name of the index.
+            spec (tuple): The corpus, the snapshot, the structure and the options of the index.
+
+        Raises:
+            FileNotFoundError: If the index has no corpus and its snapshot doesn't exist.
+
+        Returns:
+            tuple: The trained structure and its estimated memory in bytes.
+        """
+        from wordavl.word_radix import WordRadix
+        from wordavl.wordavl import WordAVL
+
+        source, snapshot, word_class, options = spec
+        start_time = perf_counter()
+
+        structure = word_class(**options)
+        if snapshot is not None and os.path.exists(snapshot):
+            structure.load(snapshot)
+        elif source is None:
+            # An empty index would be saved and loaded as if it were the missing snapshot
+            raise FileNotFoundError(f"Index '{name}' has no corpus and no snapshot at '{snapshot}'")
+        else:
+            structure.read_corpus(source)
+            structure.train()
+            # The trees don't need the corpus once they are trained, unlike a `WordList`, which
+            # searches it
+            if isinstance(structure, (WordAVL, WordRadix)):
+                structure.corpus = ""
+            if snapshot is not None:
+                structure.save(snapshot)
+        memory = deep_size(structure)
+
+        elapsed = perf_counter() - start_time
+        if self.metrics is not None:
+            self.metrics.record("index_load", elapsed)
+        logger.debug(f"Index '{name}' loaded with {memory} bytes and took: {round(elapsed, 5)}s")
+        return structure, memory
+
+    def _evict(self) -> None:
+        """
+        Unload the least recently used indexes until the loaded ones fit in the memory budget.
+        """
+        if self.memory_budget is None:
+            return
+        while len(self._loaded) > 1 and self.memory > self.memory_budget:
+            name, (_, memory) = self._loaded.popitem(last=False)
+            self.evictions += 1
+            if self.metrics is not None:
+                self.metrics.increment("index_evictions")
+            logger.debug(f"Index '{name}' evicted, releasing {memory} bytes")
@@ -0,0 +1,446 @@
+import asyncio
+import gc
+import json
+import os
+import signal
+import socket
+from time import perf_counter
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from wordavl.metrics import Metrics
+from wordavl.registry import IndexRegistry
+
+# Maximum size of the request line plus the headers of a request
+MAX_HEADER_SIZE = 1 << 14
+# Maximum size of a request body skipped to keep the connection, larger ones close it
+MAX_BODY_SIZE = 1 << 16
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+# Fields of /proc/<pid>/smaps_rollup added together for each reported memory figure
+MEMORY_FIELDS = {
+    "rss": ["Rss"],
+    "pss": ["Pss"],
+    "shared": ["Shared_Clean", "Shared_Dirty"],
+    "private": ["Private_Clean", "Private_Dirty"],
+}
+
+
+def memory_usage(pid="self") -> dict:
+    """
+    Read the memory of a process, split between the pages it shares and its private pages.
+
+    Args:
+        pid (int or str, optional): The process id. Defaults to "self" (the current process).
+
+    Returns:
+        dict: The resident, proportional, shared and private memory in bytes. Empty when the
+            system doesn't expose `/proc/<pid>/smaps_rollup` (it is specific to Linux).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return dict()
+
+    sizes = dict()
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        sizes[name] = int(value.split()[0]) * 1024
+    return {key: sum(sizes.get(name, 0) for name in names) for key, names in MEMORY_FIELDS.items()}
+
+
+class HTTPError(Exception):
+    """Raised while handling a request to answer it with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class AutocompleteServer:
+    """
+    A small asyncio HTTP server answering autocomplete requests from a trained word structure.
+
+    Endpoints:
+        GET /complete?prefix=..&limit=..&ranked=..&index=..: The suggestions for the prefix, as
+            JSON. When the structure is an `IndexRegistry`, `index` names the index searched, or
+            several comma separated indexes whose suggestions are merged.
+        GET /health: The status of the server, and of the indexes of a registry, as JSON.
+        GET /metrics: The metrics of the server and of its structure, in the Prometheus text
+            format, when the server records metrics. With several workers, each worker answers
+            with its own metrics.
+
+    Identical lookups requested while one is pending are coalesced: the requests read in the same
+    iteration of the event loop share a single call to `autocomplete`. The indexes of a registry
+    that aren't loaded yet are loaded in a thread of the default executor, so the loop keeps
+    answering the other requests meanwhile.
+
+    Attributes:
+        words: The trained structure answering the lookups (e.g. a `WordIndex`, a `WordAVL` or
+            an `IndexRegistry`).
+        default_limit (int): The number of suggestions returned when no limit is requested.
+        max_limit (int): The largest accepted limit.
+        lookups (int): The number of calls made to `autocomplete`.
+        coalesced (int): The number of requests answered by the lookup of another request.
+        metrics (Metrics or None): Where the requests are recorded.
+    """
+
+    def __init__(
+        self, words, default_limit: int = 10, max_limit: int = 100, metrics: Metrics = None
+    ) -> None:
+        """
+        Initialize an AutocompleteServer object.
+
+        Args:
+            words: The trained structure answering the lookups.
+            default_limit (int, optional): The number of suggestions returned when no limit is
+                requested. Defaults to 10.
+            max_limit (int, optional): The largest accepted limit. Defaults to 100.
+            metrics (Metrics, optional): Where the requests are recorded, usually shared with
+                the structure. Defaults to None (not recorded, and /metrics isn't served).
+        """
+        self.words = words
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.metrics = metrics
+        self.lookups = 0
+        self.coalesced = 0
+        self._pending = dict()
+
+    async def complete(
+        self, prefix: str, limit: int, ranked: bool = False, indexes=None
+    ) -> list:
+        """
+        Look up the suggestions of a prefix, sharing the lookup with identical pending requests.
+
+        Args:
+            prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int): The maximum number of suggestions to return.
+            ranked (bool, optional): Whether the most frequent words come first. Defaults to False.
+            indexes (str or tuple, optional): The name of the index of the registry searched,
+                or the names of the indexes merged. Defaults to None (the default index).
+
+        Returns:
+            list: The autocomplete suggestions.
+        """
+        key = (prefix, limit, ranked, indexes)
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await future
+
+        # The lookup runs in the next iteration of the loop, after every request already read
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        if isinstance(self.words, IndexRegistry):
+            names = [indexes] if indexes is None or isinstance(indexes, str) else indexes
+            cold = [name for name in names if not self.words.is_loaded(name)]
+            if cold:
+                loop.create_task(self._load_and_lookup(key, future, cold))
+                return await future
+        loop.call_soon(self._lookup, key, future)
+        return await future
+
+    async def _load_and_lookup(self, key: tuple, future: asyncio.Future, names: list) -> None:
+        """
+        Load indexes of the registry in a thread, then answer a pending lookup searching them.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            for name in names:
+                await loop.run_in_executor(None, self.words.get, name)
+        except Exception as error:
+            del self._pending[key]
+            future.set_exception(error)
+            return
+        self._lookup(key, future)
+
+    def _lookup(self, key: tuple, future: asyncio.Future) -> None:
+        """
+        Answer a pending lookup.
+        """
+        del self._pending[key]
+        prefix, limit, ranked, indexes = key
+        self.lookups += 1
+        try:
+            if indexes is None:
+                words = self.words.autocomplete(prefix, limit=limit, ranked=ranked)
+            else:
+                words = self.words.autocomplete(prefix, limit=limit, ranked=ranked, indexes=indexes)
+            future.set_result(words)
+        except Exception as error:
+            future.set_exception(error)
+
+    async def handle(self, path: str):
+        """
+        Answer a GET request.
+
+        Args:
+            path (str): The target of the request, with its query string.
+
+        Raises:
+            HTTPError: If the path doesn't exist or the parameters are invalid.
+
+        Returns:
+            dict or str: The body of the response, sent as JSON or as plain text.
+        """
+        url = urlsplit(path)
+        if url.path == "/metrics" and self.metrics is not None:
+            self.metrics.counters["lookups"] = self.lookups
+            self.metrics.counters["coalesced"] = self.coalesced
+            return self.metrics.to_prometheus()
+        if url.path == "/health":
+            health = {
+                "status": "ok",
+                "pid": os.getpid(),
+                "lookups": self.lookups,
+                "coalesced": self.coalesced,
+                "memory": memory_usage(),
+            }
+            if isinstance(self.words, IndexRegistry):
+                health["indexes"] = self.words.info()
+            return health
+        if url.path != "/complete":
+            raise HTTPError(404, f"'{url.path}' not found")
+
+        query = parse_qs(url.query)
+        prefix = query.get("prefix", [""])[0]
+        if not prefix:
+            raise HTTPError(400, "the prefix is required")
+        try:
+            limit = int(query.get("limit", [self.default_limit])[0])
+        except ValueError:
+            raise HTTPError(400, "the limit must be an integer")
+        if not 0 < limit <= self.max_limit:
+            raise HTTPError(400, f"the limit must be between 1 and {self.max_limit}")
+        ranked = query.get("ranked", ["false"])[0].lower() in ("1", "true", "yes")
+
+        indexes = None
+        if "index" in query:
+            if not isinstance(self.words, IndexRegistry):
+                raise HTTPError(400, "the server has a single index")
+            indexes = tuple(query["index"][0].split(","))
+            unknown = [name for name in indexes if name not in self.words]
+            if unknown:
+                raise HTTPError(404, f"index '{unknown[0]}' not found")
+            # A single name is searched alone instead of being merged
+            if len(indexes) == 1:
+                indexes = indexes[0]
+
+        words = await self.complete(prefix, limit, ranked, indexes)
+        return {"prefix": prefix, "words": list(words)}
+
+    async def serve_connection(self, reader, writer) -> None:
+        """
+        Answer the requests of a connection until the client closes it or asks to close it.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    self._write(writer, 431, {"error": "headers too large"}, keep_alive=False)
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, version = (request_line.split(" ") + ["", ""])[:3]
+                headers = dict()
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+                connection = headers.get("connection", "")
+                keep_alive = connection == "keep-alive" or (
+                    version == "HTTP/1.1" and connection != "close"
+                )
+                # Bodies are not used, but they are read so they aren't parsed as the next
+                # request. A body of unknown or excessive size can't be skipped, so the
+                # connection is closed after the response instead.
+                length = headers.get("content-length", "0")
+                if "transfer-encoding" in headers or not length.isdigit():
+                    keep_alive = False
+                elif int(length) > MAX_BODY_SIZE:
+                    keep_alive = False
+                elif int(length):
+                    try:
+                        await reader.readexactly(int(length))
+                    except asyncio.IncompleteReadError:
+                        break
+
+                start_time = perf_counter()
+                try:
+                    if method != "GET":
+                        raise HTTPError(405, f"method '{method}' not allowed")
+                    status, body = 200, await self.handle(path)
+                except HTTPError as error:
+                    status, body = error.status, {"error": error.message}
+                except Exception:
+                    # A failed lookup (e.g. an index that can't be loaded) answers this request
+                    # and the ones coalesced with it, and the connection is kept
+                    logger.exception(f"Request '{path}' failed")
+                    status, body = 500, {"error": "internal server error"}
+                if self.metrics is not None:
+                    self.metrics.record("request", perf_counter() - start_time)
+                    self.metrics.increment(f"responses_{status}")
+
+                self._write(writer, status, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write(writer, status: int, body, keep_alive: bool) -> None:
+        """
+        Write a JSON response, or a plain text one if the body is a string.
+        """
+        if isinstance(body, str):
+            content, content_type = body.encode(), "text/plain; version=0.0.4"
+        else:
+            content = json.dumps(body, ensure_ascii=False).encode()
+            content_type = "application/json"
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            ).encode()
+            + content
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000, sock=None):
+        """
+        Start listening for connections.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, or 0 for any free port. Defaults to 8000.
+            sock (socket, optional): An already bound socket used instead of the host and port.
+                Defaults to None.
+
+        Returns:
+            asyncio.Server: The started server.
+        """
+        if sock is not None:
+            return await asyncio.start_server(
+                self.serve_connection, sock=sock, limit=MAX_HEADER_SIZE
+            )
+        return await asyncio.start_server(
+            self.serve_connection, host, port, limit=MAX_HEADER_SIZE
+        )
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000, sock=None) -> None:
+        """
+        Start listening for connections and answer them until the task is cancelled.
+        """
+        server = await self.start(host=host, port=port, sock=sock)
+        address = server.sockets[0].getsockname()
+        logger.info(f"Serving autocomplete on http://{address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
+
+
+def start_workers(server: AutocompleteServer, sock, workers: int) -> list:
+    """
+    Fork processes serving the connections accepted on a shared socket.
+
+    The structure of the server is built before the fork, so the workers share its memory
+    copy-on-write. Flat structures such as a `WordIndex` loaded from a snapshot hold the words
+    in a few buffers whose pages are never written. The objects of the other structures are
+    moved out of the garbage collector with `gc.freeze`, so collections in the workers don't
+    write to them, but reading them still updates their reference counts and copies their pages.
+
+    Args:
+        server (AutocompleteServer): The server answering the requests in every worker.
+        sock (socket): The listening socket shared by the workers.
+        workers (int): The number of processes to fork.
+
+    Returns:
+        list: The process ids of the workers.
+    """
+    gc.collect()
+    gc.freeze()
+
+    pids = list()
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Child process: serve until terminated, never returning to the caller
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                asyncio.run(server.serve_forever(sock=sock))
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    gc.unfreeze()
+    return pids
+
+
+def stop_workers(pids: list) -> None:
+    """
+    Terminate the worker processes and wait for them to exit.
+    """
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
+
+def serve_prefork(
+    server: AutocompleteServer, workers: int, host: str = "127.0.0.1", port: int = 8000
+) -> None:
+    """
+    Serve the requests with several forked processes sharing the structure of the server, until
+    the parent process is interrupted or terminated.
+
+    Args:
+        server (AutocompleteServer): The server answering the requests in every worker.
+        workers (int): The number of processes to fork.
+        host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): The port to listen on. Defaults to 8000.
+    """
+    sock = socket.create_server((host, port), backlog=1024)
+    sock.setblocking(False)
+    pids = start_workers(server, sock, workers)
+    logger.info(f"Serving autocomplete on http://{host}:{port} with {workers} workers: {pids}")
+
+    def terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        for pid in pids:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_workers(pids)
+        sock.close()
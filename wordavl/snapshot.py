@@ -0,0 +1,181 @@
+"""
+Binary snapshots of a trained word index.
+
+A snapshot stores the sorted words with the same layout used by `WordIndex`, so it can be
+memory-mapped and queried without copying or parsing anything. Processes that map the same
+snapshot share its pages through the operating system page cache.
+
+File layout (little-endian):
+    header:  magic (8 bytes), version (uint16), flags (uint16), word count (uint64),
+             data length (uint64), CRC32 of everything after the header (uint32), CRC32 of
+             the corpus the words were read from (uint32, 0 when it isn't known)
+    offsets: word count + 1 uint64 values, the position of each word from the start of the file
+    weights: only when the WEIGHTED flag is set, 2 * word count uint64 values holding the
+             maximum weight tree of `WordIndex`
+    data:    the UTF-8 encoded words separated by new lines
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+MAGIC = b"WORDAVL\x00"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQQII")
+
+# Flag set when the snapshot stores the weights of the words
+WEIGHTED = 1
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is not valid, was written by another version or is corrupt."""
+
+
+def _little_endian(values) -> array:
+    """
+    Copy a sequence of integers into an array of uint64 in little-endian byte order.
+    """
+    values = array("Q", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def file_checksum(path: str) -> int:
+    """
+    Compute the CRC32 of a file, such as the corpus a snapshot is built from.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        int: The checksum of the content of the file.
+    """
+    checksum = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum
+
+
+def save_snapshot(path: str, buffer, offsets, max_weights=None, corpus_checksum: int = 0) -> None:
+    """
+    Write the words of an index to a snapshot file.
+
+    The file is written next to the destination and then moved over it, so processes that are
+    reading the previous snapshot are never exposed to a partially written file.
+
+    Args:
+        path (str): The path of the snapshot file.
+        buffer (bytes or mmap): The buffer holding the words separated by new lines.
+        offsets (Sequence): The position of each word in the buffer, followed by the position
+            one past the end of the buffer.
+        max_weights (Sequence, optional): The maximum weight tree of the words, or None if the
+            words have no weights. Defaults to None.
+        corpus_checksum (int, optional): The checksum of the corpus the words were read from
+            (see `file_checksum`). Defaults to 0 (unknown).
+    """
+    count = len(offsets) - 1
+    flags = 0 if max_weights is None else WEIGHTED
+    data_start = HEADER.size + 8 * len(offsets)
+    weights = array("Q")
+    if max_weights is not None:
+        weights = _little_endian(max_weights)
+        data_start += 8 * len(weights)
+
+    # The offsets may point into a larger buffer (e.g. a loaded snapshot), so they are rebased
+    first = offsets[0]
+    data = buffer[first : offsets[-1] - 1] if count else b""
+    shifted = _little_endian(offset - first + data_start for offset in offsets)
+
+    checksum = zlib.crc32(data, zlib.crc32(weights, zlib.crc32(shifted)))
+    header = HEADER.pack(MAGIC, VERSION, flags, count, len(data), checksum, corpus_checksum)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(header)
+        f.write(shifted)
+        f.write(weights)
+        f.write(data)
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path: str, verify: bool = True) -> tuple:
+    """
+    Memory-map a snapshot file.
+
+    Args:
+        path (str): The path of the snapshot file.
+        verify (bool, optional): Whether to check the checksum of the whole file. Defaults to True.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot, has another version, is truncated or
+            does not match its checksum.
+
+    Returns:
+        tuple: The mapped file, used as the buffer of the words, the offsets of each word
+            from the start of the file, and the maximum weight tree of the words (or None).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER.size:
+            raise SnapshotError(f"'{path}' is too small to be a snapshot")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, count, data_length, checksum, _ = HEADER.unpack_from(mapped)
+    _check_header(path, magic, version)
+
+    weights_start = HEADER.size + 8 * (count + 1)
+    data_start = weights_start + (16 * count if flags & WEIGHTED else 0)
+    if len(mapped) != data_start + data_length:
+        raise SnapshotError(f"'{path}' is truncated")
+
+    content = memoryview(mapped)[HEADER.size :]
+    if verify and zlib.crc32(content) != checksum:
+        raise SnapshotError(f"'{path}' does not match its checksum")
+
+    offsets = content[: weights_start - HEADER.size].cast("Q")
+    max_weights = None
+    if flags & WEIGHTED:
+        max_weights = content[weights_start - HEADER.size : data_start - HEADER.size].cast("Q")
+
+    if sys.byteorder != "little":
+        offsets = _little_endian(offsets)
+        max_weights = None if max_weights is None else _little_endian(max_weights)
+
+    return mapped, offsets, max_weights
+
+
+def read_corpus_checksum(path: str) -> int:
+    """
+    Read the checksum of the corpus a snapshot was built from, without mapping the snapshot.
+
+    Args:
+        path (str): The path of the snapshot file.
+
+    Raises:
+        SnapshotError: If the file is not a snapshot or has another version.
+
+    Returns:
+        int: The checksum given when the snapshot was saved, 0 if the corpus isn't known.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise SnapshotError(f"'{path}' is too small to be a snapshot")
+    magic, version, *_, corpus_checksum = HEADER.unpack(header)
+    _check_header(path, magic, version)
+    return corpus_checksum
+
+
+def _check_header(path: str, magic: bytes, version: int) -> None:
+    """
+    Check that a header belongs to a snapshot of the current version.
+    """
+    if magic != MAGIC:
+        raise SnapshotError(f"'{path}' is not a snapshot")
+    if version != VERSION:
+        raise SnapshotError(
+            f"'{path}' was written with snapshot version {version}, expected {VERSION}"
+        )
@@ -1,3 +1,5 @@
+from itertools import pairwise
+
 from wordavl.structures.bst import BST
 from wordavl.structures.bst import Node
 
@@ -12,47 +14,91 @@ class AVLNode(Node):
                       initializes to 1 when the node is created.
         imbalance (int): The imbalance factor of this node, calculated
                          as the difference between the heights of the left
-                         and right subtrees. Initializes to 0.
+                         and right subtrees. It is derived from the heights of
+                         the children instead of being stored.
+        weight (int): The weight of the value stored in this node, such as
+                      its frequency. Initializes to 1.
+        max_weight (int): The largest weight in the subtree rooted at this node.
+        size (int): The number of nodes in the subtree rooted at this node,
+                    which gives the position of any value in O(log n).
+        data: Extra data attached to the value and moved along with it, such as
+              the original spellings of a normalized word. Initializes to None.
 
     Inherits from:
         Node: Inherits attributes and methods from the Node class.
     """
 
-    def __init__(self, value):
+    __slots__ = ("height", "weight", "max_weight", "size", "data")
+
+    def __init__(self, value, weight=1, data=None):
         """
         Initializes an AVLNode with a given value.
 
         Args:
             value: The value to be stored in this node.
+            weight (int, optional): The weight of the value. Defaults to 1.
+            data (optional): The data attached to the value. Defaults to None.
         """
         super().__init__(value)
         self.height = 1
-        self.imbalance = 0
+        self.weight = weight
+        self.max_weight = weight
+        self.size = 1
+        self.data = data
+
+    def copy(self):
+        """
+        Returns a new node with the same value, weight, data, children and subtree fields.
+        """
+        node = AVLNode.__new__(AVLNode)
+        node.value = self.value
+        node.left_child, node.right_child = self.left_child, self.right_child
+        node.height, node.weight = self.height, self.weight
+        node.max_weight, node.size = self.max_weight, self.size
+        node.data = self.data
+        return node
+
+    @property
+    def imbalance(self):
+        """
+        The difference between the heights of the left and right subtrees.
+        """
+        left_height = 0 if self.left_child is None else self.left_child.height
+        right_height = 0 if self.right_child is None else self.right_child.height
+        return left_height - right_height
 
     def calculate_height_and_imbalance(self):
         """
-        Calculates the height and imbalance factor of this node based
-        on the heights of its left and right children.
+        Calculates the height of this node based on the heights of its left
+        and right children, which also updates its imbalance factor. The
+        largest weight and the size of the subtree are refreshed at the same time.
 
         This method assumes that the heights of the children nodes (if they exist)
         are up-to-date.
         """
+        max_weight = self.weight
+        size = 1
+
         # Calculate the height of the left child subtree
         left_height = 0
         if self.left_child is not None:
             left_height = self.left_child.height
+            max_weight = max(max_weight, self.left_child.max_weight)
+            size += self.left_child.size
 
         # Calculate the height of the right child subtree
         right_height = 0
         if self.right_child is not None:
             right_height = self.right_child.height
+            max_weight = max(max_weight, self.right_child.max_weight)
+            size += self.right_child.size
+
+        self.max_weight = max_weight
+        self.size = size
 
         # Update the height of this node
         self.height = 1 + max(left_height, right_height)
 
-        # Calculate and update the imbalance factor for this node
-        self.imbalance = left_height - right_height
-
 
 class AVLTree(BST):
     """
@@ -60,75 +106,396 @@ class AVLTree(BST):
     Inherits all attributes and methods from the BST class and overrides some to maintain the AVL balance property.
 
     Attributes:
+        persistent (bool): Whether the insertions and removals copy the nodes they change
+                           instead of changing them in place. The new root is then published
+                           with a single assignment once the new version of the tree is
+                           complete, so a reader that takes the root once walks a consistent
+                           version of the tree, even while another thread writes to it.
         Inherits all attributes from the BST class.
     """
 
-    def __init__(self):
+    def __init__(self, persistent=False):
         """
         Initializes an empty AVL Tree.
+
+        Args:
+            persistent (bool, optional): Whether the writes copy the nodes they change instead
+                of changing them in place. Defaults to False.
         """
         super().__init__()
+        self.persistent = persistent
+
+    def __len__(self):
+        return 0 if self.root is None else self.root.size
 
-    def add(self, value):
+    def add(self, value, weight=1, data=None):
         """
         Overrides the add method in the BST class to handle AVL Tree balancing.
+
+        The insert position is found iteratively, keeping the visited nodes in an explicit stack.
+        The stack is then unwound to update the heights and rebalance the tree bottom-up.
+        Adding a value that is already in the tree doesn't duplicate it, its weight and data are
+        replaced. When the tree is persistent, the nodes of the path are copied before being
+        changed.
+
+        Args:
+            value: The value to be added to the tree.
+            weight (int, optional): The weight of the value, such as its frequency. Defaults to 1.
+            data (optional): The data attached to the value. Defaults to None.
         """
-        self.root = self._add_recursive(
-            self.root, value
-        )  # Note that self.root is updated here
+        if self.root is None:
+            self.root = AVLNode(value, weight, data)
+            return
+
+        # Walk down to the insert position, remembering the path
+        path = []
+        current_node = self.root
+        while current_node is not None:
+            path.append(current_node)
+            if value == current_node.value:
+                # The value is already stored, only its weight and data may change
+                if current_node.weight != weight or current_node.data != data:
+                    path = self._writable_path(path)
+                    path[-1].weight, path[-1].data = weight, data
+                    self.root = self._rebalance_path(path, path[0])
+                return
+            if value < current_node.value:
+                current_node = current_node.left_child
+            else:
+                current_node = current_node.right_child
+
+        path = self._writable_path(path)
+        parent = path[-1]
+        if value < parent.value:
+            parent.left_child = AVLNode(value, weight, data)
+        else:
+            parent.right_child = AVLNode(value, weight, data)
+
+        self.root = self._rebalance_path(path, path[0])
 
-    def _add_recursive(self, current_node, value):
+    def remove(self, value):
         """
-        Overrides the BST method to recursively find the correct position and insert a value into the AVL tree.
-        This method also ensures the tree remains balanced by updating node heights and performing rotations as needed.
+        Removes a value from the AVL Tree, rebalancing the tree bottom-up.
+
+        A node with two children takes the value, weight and data of its successor (the smallest
+        value of its right subtree), and the successor node is removed instead.
 
         Args:
-            current_node (AVLNode or Node or None): The node from which to start the search for the insert position.
-            value (Any): The value to be added to the AVL tree.
+            value: The value to be removed from the tree.
 
         Returns:
-            AVLNode: The node that either gets inserted or the node that was already present at that position.
-
-        Notes:
-            1. The method first checks if the `current_node` is an instance of the base class `Node`.
-              If it is, the method casts it to `AVLNode` to ensure AVL properties are maintained. This is especially
-              useful if the first node added to the tree is of type `Node`; this ensures subsequent nodes will be of
-              type `AVLNode`.
-            2. The method also balances the tree by calling the `_balance` method if the imbalance factor
-              of a node reaches 2 or -2 after an insert operation.
+            bool: True if the value was in the tree and was removed, otherwise False.
         """
+        # Walk down to the node holding the value, remembering the path
+        path = []
+        current_node = self.root
+        while current_node is not None and current_node.value != value:
+            path.append(current_node)
+            if value < current_node.value:
+                current_node = current_node.left_child
+            else:
+                current_node = current_node.right_child
 
-        # If the current node is None, return a new AVLNode containing the value
         if current_node is None:
-            return AVLNode(value)
-
-        # Check if current_node is of the base class Node and cast it to AVLNode if necessary
-        # This is necessary to not change the add() in the BST class.
-        # When the first node is added, the type of the root is Node, so we need to cast it
-        if isinstance(current_node, Node) and not isinstance(current_node, AVLNode):
-            current_node = AVLNode(current_node.value)
-            current_node.left_child = self.root.left_child
-            current_node.right_child = self.root.right_child
-            self.root = current_node
-
-        # Determine whether the value should be inserted to the left or right subtree
-        if value <= current_node.value:
-            current_node.left_child = self._add_recursive(
-                current_node.left_child, value
-            )
+            return False
+
+        replaced = None
+        if current_node.left_child is not None and current_node.right_child is not None:
+            # Continue the path down to the successor, which has no left child
+            replaced = len(path)
+            path.append(current_node)
+            successor = current_node.right_child
+            while successor.left_child is not None:
+                path.append(successor)
+                successor = successor.left_child
+            current_node = successor
+
+        path = self._writable_path(path)
+        if replaced is not None:
+            path[replaced].value, path[replaced].weight = current_node.value, current_node.weight
+            path[replaced].data = current_node.data
+
+        # The removed node has at most one child, which takes its place
+        child = current_node.left_child
+        if child is None:
+            child = current_node.right_child
+        if not path:
+            self.root = child
+            return True
+        if path[-1].left_child is current_node:
+            path[-1].left_child = child
         else:
-            current_node.right_child = self._add_recursive(
-                current_node.right_child, value
-            )
+            path[-1].right_child = child
+
+        root = self._rebalance_path(path, path[0])
+        # The walk may stop below the node that took the weight of the successor
+        if replaced is not None:
+            root = self._rebalance_path(path[: replaced + 1], root)
+        self.root = root
+        return True
+
+    def _writable_path(self, path):
+        """
+        Returns the nodes of a path that can be changed. When the tree is persistent, these are
+        copies of the nodes linked to each other, the deepest one still pointing to the
+        original children. Otherwise, the path itself is returned.
+
+        Args:
+            path (list): The nodes from the root down to the deepest node to be changed.
+
+        Returns:
+            list: The nodes to be changed, in the same order.
+        """
+        if not self.persistent:
+            return path
+
+        copies = [node.copy() for node in path]
+        for index, (parent, child) in enumerate(pairwise(path)):
+            if parent.left_child is child:
+                copies[index].left_child = copies[index + 1]
+            else:
+                copies[index].right_child = copies[index + 1]
+        return copies
+
+    def _rebalance_path(self, path, root):
+        """
+        Updates the heights and imbalance factors of the nodes of a path, from the deepest node
+        up to the root, performing rotations where needed.
+
+        Args:
+            path (list): The nodes from the root down to the parent of the changed subtree, or
+                down to the node whose weight changed.
+            root (AVLNode): The root of the tree, kept when the walk stops before reaching it.
+
+        Returns:
+            AVLNode: The root of the rebalanced tree, which is assigned by the caller.
+
+        Notes:
+            The rotations stop as soon as a node keeps its height and maximum weight, since no
+            node above it can become unbalanced anymore. Only the sizes of the nodes above it
+            are still refreshed.
+        """
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            height, max_weight = node.height, node.max_weight
+
+            # Update the height and imbalance factor for the current node
+            node.calculate_height_and_imbalance()
+
+            # Check if tree balancing is needed and balance if necessary
+            subtree = node
+            if abs(node.imbalance) == 2:
+                subtree = self._balance(node)
+            elif node.height == height and node.max_weight == max_weight:
+                for ancestor in reversed(path[:index]):
+                    ancestor.size = 1 + _size(ancestor.left_child) + _size(ancestor.right_child)
+                return root
+
+            # Attach the (possibly rotated) subtree to its parent
+            if index == 0:
+                return subtree
+            elif path[index - 1].left_child is node:
+                path[index - 1].left_child = subtree
+            else:
+                path[index - 1].right_child = subtree
+
+    def bulk_load(self, values, weights=None, data=None):
+        """
+        Replaces the content of the AVL Tree with the given values, building a perfectly
+        balanced tree bottom-up instead of inserting the values one by one.
+
+        The values are sorted and deduplicated first, unless they are already strictly
+        increasing, in which case they are used as they are. Since every subtree is built
+        from the middle element of its range, no rotation is ever needed.
+
+        Args:
+            values (Sequence): The values to be stored in the AVL tree.
+            weights (Sequence, optional): The weight of each value. The weights of repeated
+                values are added together. Defaults to None (every weight is 1).
+            data (Sequence, optional): The data attached to each value. Repeated values keep
+                the data of their last occurrence. Defaults to None (no data).
+        """
+        if not all(previous < current for previous, current in pairwise(values)):
+            attached = None if data is None else dict(zip(values, data))
+            if weights is None:
+                values = sorted(set(values))
+            else:
+                merged = dict()
+                for value, weight in zip(values, weights):
+                    merged[value] = merged.get(value, 0) + weight
+                values = sorted(merged)
+                weights = [merged[value] for value in values]
+            if attached is not None:
+                data = [attached[value] for value in values]
+
+        self.root = self._build_balanced(values, weights, data, 0, len(values)) if values else None
 
-        # Update the height and imbalance factor for the current node
-        current_node.calculate_height_and_imbalance()
+    def _build_balanced(self, values, weights, data, start, end):
+        """
+        Recursively builds a perfectly balanced subtree from a non-empty sorted slice of values.
+
+        Args:
+            values (Sequence): The strictly increasing values to be stored.
+            weights (Sequence or None): The weight of each value, or None if every weight is 1.
+            data (Sequence or None): The data attached to each value, or None if there is none.
+            start (int): The index of the first value of the slice (inclusive).
+            end (int): The index of the last value of the slice (exclusive).
+
+        Returns:
+            AVLNode: The root of the built subtree.
+        """
+        middle = (start + end) // 2
+        node = AVLNode(
+            values[middle],
+            1 if weights is None else weights[middle],
+            None if data is None else data[middle],
+        )
+
+        if start < middle:
+            node.left_child = self._build_balanced(values, weights, data, start, middle)
+            if node.left_child.max_weight > node.max_weight:
+                node.max_weight = node.left_child.max_weight
+        if middle + 1 < end:
+            node.right_child = self._build_balanced(values, weights, data, middle + 1, end)
+            if node.right_child.max_weight > node.max_weight:
+                node.max_weight = node.right_child.max_weight
+
+        # A subtree built from the middle element of n values always has height n.bit_length(),
+        # so there is no need to look at the children
+        node.height = (end - start).bit_length()
+        node.size = end - start
+
+        return node
+
+    def rank(self, value):
+        """
+        Counts the values of the tree smaller than the given value, in O(log n).
 
-        # Check if tree balancing is needed and balance if necessary
-        if abs(current_node.imbalance) == 2:
-            return self._balance(current_node)
+        Args:
+            value: The value to compare with. It doesn't need to be in the tree.
+
+        Returns:
+            int: The number of smaller values, which is the position of the value in the sorted
+                values if it is in the tree.
+        """
+        return _rank(self.root, value)
 
-        return current_node
+    def select(self, index):
+        """
+        Finds the value at a position of the sorted values, in O(log n).
+
+        Args:
+            index (int): The position of the value, from 0. Negative positions count from the end.
+
+        Raises:
+            IndexError: If the position is out of range.
+
+        Returns:
+            The value at the given position.
+        """
+        current_node = self.root
+        if index < 0:
+            index += _size(current_node)
+        if not 0 <= index < _size(current_node):
+            raise IndexError("AVL tree index out of range")
+
+        while True:
+            left_size = _size(current_node.left_child)
+            if index < left_size:
+                current_node = current_node.left_child
+            elif index == left_size:
+                return current_node.value
+            else:
+                index -= left_size + 1
+                current_node = current_node.right_child
+
+    def successor(self, value):
+        """
+        Finds the smallest value of the tree greater than the given value.
+
+        Args:
+            value: The value to compare with. It doesn't need to be in the tree.
+
+        Returns:
+            The next value, or None if no value is greater.
+        """
+        successor = None
+        current_node = self.root
+        while current_node is not None:
+            if value < current_node.value:
+                successor = current_node.value
+                current_node = current_node.left_child
+            else:
+                current_node = current_node.right_child
+        return successor
+
+    def count_prefix(self, prefix):
+        """
+        Counts the string values starting with the given prefix, in O(log n).
+
+        Args:
+            prefix (str): The prefix to search for.
+
+        Returns:
+            int: The number of values starting with the prefix.
+        """
+        # The values starting with the prefix are contiguous and follow the smaller ones
+        root = current_node = self.root
+        end = 0
+        while current_node is not None:
+            if current_node.value < prefix or current_node.value.startswith(prefix):
+                end += 1 + _size(current_node.left_child)
+                current_node = current_node.right_child
+            else:
+                current_node = current_node.left_child
+        return end - _rank(root, prefix)
+
+    def range(self, low=None, high=None, start=0):
+        """
+        Lazily iterates over the values from a lower bound (inclusive) to an upper bound
+        (exclusive) in ascending order.
+
+        Only the nodes on the way to the first value are visited before it is produced, so taking
+        the first k values costs O(log n + k).
+
+        Args:
+            low (optional): The smallest value produced. Defaults to None (no lower bound).
+            high (optional): The values produced are smaller than this one. Defaults to None
+                (no upper bound).
+            start (int, optional): The number of values within the bounds to skip, found in
+                O(log n) instead of walking them. Defaults to 0.
+
+        Yields:
+            The values within the bounds, from the smallest to the largest.
+        """
+        current_node = self.root
+        index = start if low is None else _rank(current_node, low) + start
+
+        # Walk down to the value at the position, keeping the nodes whose value comes after it
+        stack = []
+        while current_node is not None:
+            left_size = _size(current_node.left_child)
+            if index < left_size:
+                stack.append(current_node)
+                current_node = current_node.left_child
+            elif index == left_size:
+                stack.append(current_node)
+                break
+            else:
+                index -= left_size + 1
+                current_node = current_node.right_child
+
+        while stack:
+            current_node = stack.pop()
+            if high is not None and not current_node.value < high:
+                return
+            yield current_node.value
+
+            # Continue with the leftmost path of the right subtree
+            current_node = current_node.right_child
+            while current_node is not None:
+                stack.append(current_node)
+                current_node = current_node.left_child
 
     def get_height(self):
         """
@@ -224,25 +591,56 @@ class AVLTree(BST):
 
         Note:
             This method assumes that the height and imbalance factor of each node are up-to-date.
+            When the tree is persistent, the node must be a copy, and the other rotated nodes
+            are copied before the rotations.
         """
 
         # Case 1: Left subtree is higher than right subtree
         if node.imbalance == 2:
             pivot = node.left_child
-            # Single right rotation
-            if pivot.imbalance == 1:
+            if self.persistent:
+                pivot = node.left_child = pivot.copy()
+            # Single right rotation (a balanced pivot only happens after a removal)
+            if pivot.imbalance >= 0:
                 return self._rotate_right(node)
             # Double rotation: Left-Right
             else:
+                if self.persistent:
+                    pivot.right_child = pivot.right_child.copy()
                 node.left_child = self._rotate_left(pivot)
                 return self._rotate_right(node)
         # Case 2: Right subtree is higher than left subtree
         else:
             pivot = node.right_child
+            if self.persistent:
+                pivot = node.right_child = pivot.copy()
             # Single left rotation
-            if pivot.imbalance == -1:
+            if pivot.imbalance <= 0:
                 return self._rotate_left(node)
             # Double rotation: Right-Left
             else:
+                if self.persistent:
+                    pivot.left_child = pivot.left_child.copy()
                 node.right_child = self._rotate_right(pivot)
                 return self._rotate_left(node)
+
+
+def _size(node):
+    """
+    Returns the size of a subtree, which is 0 for an empty one.
+    """
+    return 0 if node is None else node.size
+
+
+def _rank(node, value):
+    """
+    Counts the values of the subtree rooted at a node that are smaller than the given value.
+    """
+    rank = 0
+    while node is not None:
+        if node.value < value:
+            rank += 1 + _size(node.left_child)
+            node = node.right_child
+        else:
+            node = node.left_child
+    return rank
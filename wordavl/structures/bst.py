@@ -2,9 +2,12 @@ class Node:
     """
     A class representing a node in a Binary Search Tree (BST).
 
-    Each node contains a value and references to its left and right children.
+    Each node contains a value and references to its left and right children. The attributes
+    are declared in `__slots__`, so the nodes don't carry an instance dictionary.
     """
 
+    __slots__ = ("value", "left_child", "right_child")
+
     def __init__(self, value):
         """
         Initializes a Node with a given value.
@@ -71,7 +74,7 @@ class BST:
 
     def _contains(self, current_node, value):
         """
-        Recursively checks if the BST contains the specified value starting from a given node.
+        Iteratively checks if the BST contains the specified value starting from a given node.
 
         Args:
             current_node (Node): The node to start the search from.
@@ -80,13 +83,27 @@ class BST:
         Returns:
             bool: True if the value exists in the subtree rooted at current_node, otherwise False.
         """
-        if current_node is None:
-            return False
-        if current_node.value == value:
-            return True
-        if value < current_node.value:
-            return self._contains(current_node.left_child, value)
-        return self._contains(current_node.right_child, value)
+        return self._find_node(current_node, value) is not None
+
+    def _find_node(self, current_node, value):
+        """
+        Iteratively finds the node holding the specified value starting from a given node.
+
+        Args:
+            current_node (Node): The node to start the search from.
+            value: The value to search for in the BST.
+
+        Returns:
+            Node or None: The node holding the value, or None if it isn't in the subtree.
+        """
+        while current_node is not None:
+            if current_node.value == value:
+                return current_node
+            if value < current_node.value:
+                current_node = current_node.left_child
+            else:
+                current_node = current_node.right_child
+        return None
 
     def contains(self, value):
         """
@@ -99,3 +116,31 @@ class BST:
             bool: True if the BST contains the value, otherwise False.
         """
         return self._contains(self.root, value)
+
+    def __iter__(self):
+        """
+        Iterates over the values of the BST in ascending (in-order) order.
+
+        Yields:
+            The values stored in the tree, from the smallest to the largest.
+        """
+        for node in self._iter_nodes():
+            yield node.value
+
+    def _iter_nodes(self):
+        """
+        Iterates over the nodes of the BST in ascending (in-order) order of their values.
+
+        Yields:
+            Node: The nodes of the tree, from the smallest value to the largest.
+        """
+        stack = []
+        current_node = self.root
+        while stack or current_node is not None:
+            # Walk down to the leftmost node of the current subtree
+            while current_node is not None:
+                stack.append(current_node)
+                current_node = current_node.left_child
+            current_node = stack.pop()
+            yield current_node
+            current_node = current_node.right_child
@@ -0,0 +1,396 @@
+import heapq
+
+
+class RadixNode:
+    """
+    Represents a node in a radix tree (compressed trie).
+
+    Each node is reached from its parent through an edge labeled with one or more characters,
+    and no two children of a node have labels starting with the same character.
+
+    Attributes:
+        label (str): The characters of the edge from the parent to this node.
+        children (dict or None): The child nodes indexed by the first character of their label,
+                                 or None if the node is a leaf.
+        count (int): The number of values stored in the subtree rooted at this node.
+        is_value (bool): Whether the path from the root to this node is a stored value.
+        weight (int): The weight of the stored value, such as its frequency, or 0 if the node
+                      is not a value.
+        max_weight (int): The largest weight in the subtree rooted at this node.
+    """
+
+    __slots__ = ("label", "children", "count", "is_value", "weight", "max_weight")
+
+    def __init__(self, label=""):
+        """
+        Initializes a RadixNode with a given edge label.
+
+        Args:
+            label (str): The characters of the edge from the parent to this node.
+        """
+        self.label = label
+        self.children = None
+        self.count = 0
+        self.is_value = False
+        self.weight = 0
+        self.max_weight = 0
+
+    def get_child(self, character):
+        """
+        Returns the child whose label starts with the given character, or None.
+        """
+        if self.children is None:
+            return None
+        return self.children.get(character)
+
+    def set_child(self, child):
+        """
+        Adds or replaces the child indexed by the first character of its label.
+        """
+        if self.children is None:
+            self.children = dict()
+        self.children[child.label[0]] = child
+
+
+class RadixTree:
+    """
+    Represents a radix tree, a trie where the chains of nodes with a single child are merged
+    into one edge labeled with several characters.
+
+    Every node keeps how many values are stored below it, so the number of values starting with
+    a prefix is known as soon as the prefix is found. Identical edge labels are shared between
+    nodes to keep the memory usage low.
+
+    Attributes:
+        root (RadixNode): The root node of the tree, labeled with the empty string.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty radix tree.
+        """
+        self.clear()
+
+    def __len__(self):
+        return self.root.count
+
+    def __iter__(self):
+        """
+        Iterates over the values of the tree in lexicographic order.
+        """
+        return self._iter_subtree(self.root, "")
+
+    def clear(self):
+        """
+        Removes all the values from the radix tree.
+        """
+        self.root = RadixNode()
+        self._labels = dict()
+
+    def add(self, value, weight=1):
+        """
+        Inserts a new value into the radix tree. Adding a value that is already stored does nothing.
+
+        Args:
+            value (str): The value to be added to the tree.
+            weight (int, optional): The weight of the value, such as its frequency. Defaults to 1.
+
+        Returns:
+            bool: True if the value was added, False if it was already stored.
+        """
+        node = self.root
+        path = [node]
+        rest = value
+
+        while rest:
+            child = node.get_child(rest[0])
+
+            # No edge shares the first character: the rest of the value becomes a new leaf
+            if child is None:
+                child = RadixNode(self._intern(rest))
+                node.set_child(child)
+                path.append(child)
+                node = child
+                break
+
+            label = child.label
+            if rest.startswith(label):
+                common = len(label)
+            else:
+                common = self._common_prefix_length(label, rest)
+
+            # The value diverges in the middle of the edge: split it at the divergence point
+            if common < len(label):
+                middle = RadixNode(self._intern(label[:common]))
+                middle.count = child.count
+                middle.max_weight = child.max_weight
+                child.label = self._intern(label[common:])
+                middle.set_child(child)
+                node.set_child(middle)
+                child = middle
+
+            path.append(child)
+            node = child
+            rest = rest[common:]
+
+        if node.is_value:
+            return False
+
+        node.is_value = True
+        node.weight = weight
+        for path_node in path:
+            path_node.count += 1
+            if weight > path_node.max_weight:
+                path_node.max_weight = weight
+        return True
+
+    def contains(self, value):
+        """
+        Checks if the radix tree contains the specified value.
+
+        Args:
+            value (str): The value to search for in the tree.
+
+        Returns:
+            bool: True if the tree contains the value, otherwise False.
+        """
+        node, path = self._find_prefix(value)
+        return node is not None and node.is_value and path == value
+
+    def count_prefix(self, prefix):
+        """
+        Counts the values starting with the given prefix, in O(len(prefix)).
+
+        Args:
+            prefix (str): The prefix to search for.
+
+        Returns:
+            int: The number of values in the tree starting with the prefix.
+        """
+        node, _ = self._find_prefix(prefix)
+        return 0 if node is None else node.count
+
+    def _find_prefix(self, prefix):
+        """
+        Finds the highest node whose path starts with the given prefix.
+
+        Args:
+            prefix (str): The prefix to search for.
+
+        Returns:
+            tuple: The node and its full path from the root, or (None, "") if no value starts
+                with the prefix. The path may be longer than the prefix when the prefix ends
+                in the middle of an edge.
+        """
+        node = self.root
+        path = ""
+        rest = prefix
+
+        while rest:
+            child = node.get_child(rest[0])
+            if child is None:
+                return None, ""
+
+            label = child.label
+            if rest.startswith(label):
+                rest = rest[len(label) :]
+            elif label.startswith(rest):
+                rest = ""
+            else:
+                return None, ""
+
+            path += label
+            node = child
+
+        return node, path
+
+    def _iter_subtree(self, node, path):
+        """
+        Iterates over the values stored in a subtree in lexicographic order.
+
+        Args:
+            node (RadixNode): The root of the subtree.
+            path (str): The full path from the root of the tree to the node.
+
+        Yields:
+            str: The values stored in the subtree.
+        """
+        for _, path in self._iter_value_nodes(node, path):
+            yield path
+
+    def _find_fuzzy_prefixes(self, prefix, max_edits):
+        """
+        Finds the subtrees whose values start with a path within a number of edits of a prefix.
+
+        The tree is walked depth-first while keeping the row of the Levenshtein distance matrix
+        between the prefix and the path walked so far, computed one character at a time. The
+        smallest entry of the row never decreases as the path grows, so the walk stops below a
+        node as soon as that entry can't beat the distance already found for its subtree.
+
+        Args:
+            prefix (str): The prefix to search for.
+            max_edits (int): The maximum number of inserted, deleted or replaced characters.
+
+        Returns:
+            list: The (edits, node, path) entries of the matching subtrees. A subtree nested in
+                another one is only reported when its path is closer to the prefix.
+        """
+        matches = []
+        row = list(range(len(prefix) + 1))
+        bound = max_edits + 1
+        if row[-1] < bound:
+            bound = row[-1]
+            matches.append((bound, self.root, ""))
+
+        stack = [(self.root, "", row, bound)]
+        while stack:
+            node, path, row, bound = stack.pop()
+            if node.children is None:
+                continue
+
+            for child in node.children.values():
+                child_row, best = row, bound
+                for character in child.label:
+                    previous_row = child_row
+                    # Cost of the insertion, deletion and replacement of the characters, written
+                    # without calls to min since this loop dominates the search time
+                    distance = smallest = previous_row[0] + 1
+                    child_row = [distance]
+                    for position, expected in enumerate(prefix, 1):
+                        distance += 1
+                        deletion = previous_row[position] + 1
+                        if deletion < distance:
+                            distance = deletion
+                        replacement = previous_row[position - 1] + (expected != character)
+                        if replacement < distance:
+                            distance = replacement
+                        if distance < smallest:
+                            smallest = distance
+                        child_row.append(distance)
+
+                    if distance < best:
+                        best = distance
+                    # Longer paths can't get closer to the prefix than the best one of the edge
+                    if smallest >= best:
+                        break
+
+                child_path = path + child.label
+                if best < bound:
+                    matches.append((best, child, child_path))
+                if smallest < best:
+                    stack.append((child, child_path, child_row, best))
+
+        return matches
+
+    def _iter_fuzzy(self, prefix, max_edits, ranked=False):
+        """
+        Iterates over the values starting with a path within a number of edits of a prefix.
+
+        Args:
+            prefix (str): The prefix to search for.
+            max_edits (int): The maximum number of inserted, deleted or replaced characters.
+            ranked (bool, optional): Whether the values with the same number of edits are
+                produced from the highest to the lowest weight instead of in lexicographic order.
+                Defaults to False.
+
+        Yields:
+            str: The values, from the fewest to the most edits.
+        """
+        matches = self._find_fuzzy_prefixes(prefix, max_edits)
+        if ranked:
+            walk, key = self._iter_ranked_nodes, lambda item: (-item[0].weight, item[1])
+        else:
+            walk, key = self._iter_value_nodes, lambda item: item[1]
+
+        seen = set()
+        for edits in sorted({edits for edits, _, _ in matches}):
+            walks = [walk(node, path) for distance, node, path in matches if distance == edits]
+            merged = heapq.merge(*walks, key=key)
+            for _, path in merged:
+                # Values closer to the prefix were already produced
+                if path not in seen:
+                    seen.add(path)
+                    yield path
+
+    def _iter_ranked(self, node, path):
+        """
+        Iterates over the values stored in a subtree from the highest to the lowest weight.
+
+        The subtrees are expanded from the one with the highest maximum weight, so only the paths
+        leading to the produced values are visited.
+
+        Args:
+            node (RadixNode): The root of the subtree.
+            path (str): The full path from the root of the tree to the node.
+
+        Yields:
+            str: The values stored in the subtree.
+        """
+        for _, path in self._iter_ranked_nodes(node, path):
+            yield path
+
+    def _iter_ranked_nodes(self, node, path):
+        """
+        Iterates over the nodes holding a value in a subtree, from the highest to the lowest weight.
+
+        Args:
+            node (RadixNode): The root of the subtree.
+            path (str): The full path from the root of the tree to the node.
+
+        Yields:
+            tuple: The nodes and their full path from the root of the tree.
+        """
+        # Entries are (negated weight, path, is subtree, node). The values of a subtree don't
+        # sort before its path, so ties of weight come out in lexicographic order, and single
+        # values are ordered before the subtrees of the same path.
+        heap = [(-node.max_weight, path, True, node)]
+        while heap:
+            _, path, is_subtree, node = heapq.heappop(heap)
+            if not is_subtree:
+                yield node, path
+                continue
+
+            if node.is_value:
+                heapq.heappush(heap, (-node.weight, path, False, node))
+            if node.children is not None:
+                for child in node.children.values():
+                    heapq.heappush(heap, (-child.max_weight, path + child.label, True, child))
+
+    def _iter_value_nodes(self, node, path):
+        """
+        Iterates over the nodes holding a value in a subtree, in lexicographic order.
+
+        Args:
+            node (RadixNode): The root of the subtree.
+            path (str): The full path from the root of the tree to the node.
+
+        Yields:
+            tuple: The nodes and their full path from the root of the tree.
+        """
+        stack = [(node, path)]
+        while stack:
+            node, path = stack.pop()
+            if node.is_value:
+                yield node, path
+            if node.children is not None:
+                # Children are pushed in reverse order so the smallest one is visited first
+                for character in sorted(node.children, reverse=True):
+                    child = node.children[character]
+                    stack.append((child, path + child.label))
+
+    def _intern(self, label):
+        """
+        Returns the shared copy of an edge label, so equal labels are stored only once.
+        """
+        return self._labels.setdefault(label, label)
+
+    @staticmethod
+    def _common_prefix_length(first, second):
+        """
+        Returns the length of the longest common prefix of two strings.
+        """
+        length = min(len(first), len(second))
+        for position in range(length):
+            if first[position] != second[position]:
+                return position
+        return length
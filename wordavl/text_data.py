@@ -1,19 +1,189 @@
+import os
+import pickle
 import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
 
-import requests
+# Pattern used to split a text into words
+WORD_PATTERN = re.compile(r"\b\w+\b")
+
+# Pattern matching a single character that can be part of a word
+WORD_CHARACTER = re.compile(r"\w")
+
+# Number of characters read at once when streaming a source
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Pattern matching a byte that can't be part of a word, used to split files into shards. UTF-8
+# encodes every non-ASCII character with bytes outside of the ASCII range, so it never splits one.
+SEPARATOR_BYTE = re.compile(rb"\s")
+
+# Number of evenly spaced blocks of a file, and their size in bytes, read to choose the words
+# splitting its vocabulary between the workers
+SAMPLE_BLOCKS = 64
+SAMPLE_BLOCK_SIZE = 1 << 14
+
+
+def normalize_key(word: str) -> str:
+    """
+    Compute the key used to match a word regardless of its case and accents.
+
+    The word is case folded and decomposed (NFD), and the combining marks are removed, so
+    "Ação" and "acao" have the same key.
+
+    Args:
+        word (str): The word to be normalized.
+
+    Returns:
+        str: The normalized key of the word.
+    """
+    # ASCII words have no accents, only the case needs to be folded
+    if word.isascii():
+        return word.lower()
+    decomposed = unicodedata.normalize("NFD", word.casefold())
+    return "".join(character for character in decomposed if not unicodedata.combining(character))
+
+
+def _split_byte_ranges(path: str, parts: int) -> list:
+    """
+    Split a file into byte ranges of similar sizes that never cut a word.
+
+    Each boundary is moved forward to just after the next whitespace byte.
+
+    Args:
+        path (str): The path of the file.
+        parts (int): The number of ranges to split the file into.
+
+    Returns:
+        list: The (start, end) byte positions of the non-empty ranges, covering the whole file.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for part in range(1, parts):
+            position = max(size * part // parts, boundaries[-1])
+            f.seek(position)
+            while block := f.read(1 << 16):
+                match = SEPARATOR_BYTE.search(block)
+                if match is not None:
+                    position += match.end()
+                    break
+                position += len(block)
+            boundaries.append(min(position, size))
+    boundaries.append(size)
+
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _sample_split_words(path: str, parts: int) -> list:
+    """
+    Choose the words splitting the vocabulary of a file into ranges of similar sizes.
+
+    The words of a few evenly spaced blocks of the file are sorted, and the ones at regular
+    intervals are taken, so it costs the same whatever the size of the file.
+
+    Args:
+        path (str): The path of the UTF-8 file.
+        parts (int): The number of vocabulary ranges.
+
+    Returns:
+        list: At most `parts - 1` increasing words. The range of a word is the number of
+            split words smaller than or equal to it.
+    """
+    size = os.path.getsize(path)
+    words = set()
+    with open(path, "rb") as f:
+        for block in range(SAMPLE_BLOCKS):
+            f.seek(size * block // SAMPLE_BLOCKS)
+            text = f.read(SAMPLE_BLOCK_SIZE).decode("utf-8", errors="ignore")
+            # The first and the last words may be cut by the block
+            words.update(WORD_PATTERN.findall(text)[1:-1])
+
+    words = sorted(words)
+    splits = {words[len(words) * part // parts] for part in range(1, parts) if words}
+    return sorted(splits)
+
+
+def _count_words_in_range(path: str, start: int, end: int, split_words: list) -> list:
+    """
+    Count the words of a byte range of a UTF-8 file, in a worker process.
+
+    Args:
+        path (str): The path of the file.
+        start (int): The position of the first byte of the range (inclusive).
+        end (int): The position of the last byte of the range (exclusive).
+        split_words (list): The words splitting the vocabulary, see `_sample_split_words`.
+
+    Returns:
+        list: The pickled (word, count) pairs of each vocabulary range, sorted by word. They are
+            pickled here so the main process passes them on to `_merge_counts` without loading them.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    counts = sorted(Counter(WORD_PATTERN.findall(text)).items())
+
+    shards = list()
+    position = 0
+    for split_word in split_words + [None]:
+        end = len(counts) if split_word is None else bisect_left(counts, (split_word,), position)
+        shards.append(pickle.dumps(counts[position:end], protocol=pickle.HIGHEST_PROTOCOL))
+        position = end
+    return shards
+
+
+def _merge_counts(shards: list) -> list:
+    """
+    Add up the counts of the same vocabulary range found in every byte range, in a worker process.
+
+    Args:
+        shards (list): The pickled (word, count) pairs of the range counted in each byte range.
+
+    Returns:
+        list: The (word, count) pairs of the range, sorted by word.
+    """
+    counts = Counter()
+    for shard in shards:
+        counts.update(dict(pickle.loads(shard)))
+    return sorted(counts.items())
 
 
 class TextData:
     """A class to handle text data from either a local file or a web link."""
 
-    def __init__(self, source: str) -> None:
+    def __init__(
+        self,
+        source: str,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+    ) -> None:
         """
         Initialize the TextData object.
 
         Args:
             source (str): The source of the text data. It can be a local file path or a web link.
+            stream (bool, optional): Whether to read the source in chunks while the words are
+                consumed instead of loading it all at once. Defaults to False.
+            chunk_size (int, optional): The number of characters read at once when streaming.
+                Defaults to DEFAULT_CHUNK_SIZE.
+            workers (int, optional): The number of processes used to count the words of a local
+                file, see `get_word_counts`. The file is not loaded at once when it is greater
+                than 1. Defaults to 1.
         """
-        self.raw_data = self._read_source(source=source)
+        self.source = source
+        self.chunk_size = chunk_size
+        self.workers = workers if self._is_local_file(source) else 1
+        self.raw_data = None if stream or self.workers > 1 else self._read_source(source=source)
+
+    @staticmethod
+    def _is_local_file(source: str) -> bool:
+        """
+        Check whether the source is read from a local file.
+        """
+        if not source or source.startswith(("http://", "https://")):
+            return False
+        return source.split(".")[-1] in ["txt"]
 
     def _read_source(self, source: str):
         """
@@ -47,6 +217,9 @@ class TextData:
         Returns:
             str: The content of the text data from the web link.
         """
+        # Imported here since only the web links need it, and it is slow to import
+        import requests
+
         response = requests.get(source)
         response.raise_for_status()
         content = response.text
@@ -66,6 +239,96 @@ class TextData:
             content = f.read()
         return content
 
+    def _iter_chunks(self):
+        """
+        Iterate over the text data in chunks.
+
+        When the data was already read, it is produced as a single chunk. Otherwise the source is
+        read progressively, so only one chunk is held in memory at a time.
+
+        Yields:
+            str: The consecutive chunks of the text data.
+        """
+        if self.raw_data is not None:
+            yield self.raw_data
+            return
+
+        source = self.source
+        if not source:
+            return
+
+        if source.startswith("http://") or source.startswith("https://"):
+            import requests
+
+            with requests.get(source, stream=True) as response:
+                response.raise_for_status()
+                # Without a declared encoding the chunks would be produced as bytes
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                yield from response.iter_content(self.chunk_size, decode_unicode=True)
+        elif source.split(".")[-1] in ["txt"]:
+            with open(source) as f:
+                while chunk := f.read(self.chunk_size):
+                    yield chunk
+        else:
+            yield source
+
+    def iter_words(self):
+        """
+        Iterate over the individual words of the text data.
+
+        Words that straddle the boundary between two chunks are held back until the next chunk
+        is read, so they are never split.
+
+        Yields:
+            str: The words in the order they appear in the text.
+        """
+        pending = ""
+        for chunk in self._iter_chunks():
+            text = pending + chunk if pending else chunk
+
+            # Hold back the word at the end of the chunk, it may continue in the next one
+            end = len(text)
+            while end > 0 and WORD_CHARACTER.match(text, end - 1):
+                end -= 1
+            pending = text[end:]
+
+            yield from WORD_PATTERN.findall(text, 0, end)
+
+        if pending:
+            yield pending
+
+    def iter_unique_words(self, dedup: str = "exact"):
+        """
+        Iterate over the words of the text data, skipping repeated words.
+
+        Args:
+            dedup (str, optional): How repeated words are detected. Defaults to "exact".
+                - "exact": every word is produced once, at the cost of remembering each distinct word.
+                - "adjacent": only consecutive repetitions are skipped, which uses constant memory
+                  and is exact for sorted sources such as dictionaries.
+                - "none": all the words are produced.
+
+        Yields:
+            str: The words in the order of their first appearance.
+        """
+        if dedup == "exact":
+            seen = set()
+            for word in self.iter_words():
+                if word not in seen:
+                    seen.add(word)
+                    yield word
+        elif dedup == "adjacent":
+            previous = None
+            for word in self.iter_words():
+                if word != previous:
+                    previous = word
+                    yield word
+        elif dedup == "none":
+            yield from self.iter_words()
+        else:
+            raise ValueError("Invalid dedup. Choose 'exact', 'adjacent' or 'none'.")
+
     def get_word_list(self):
         """
         Separate a text into individual words.
@@ -73,17 +336,66 @@ class TextData:
         Returns:
             list: A list containing individual words extracted from the raw data.
         """
-        # Use regular expression to find all words in the text
-        words = re.findall(r"\b\w+\b", self.raw_data)
-        return words
+        return list(self.iter_words())
 
-    def get_unique_words(self):
+    def get_unique_words(self, dedup: str = "exact"):
         """
         Get unique words from the raw data.
 
+        Args:
+            dedup (str, optional): How repeated words are detected, as in `iter_unique_words`.
+                Defaults to "exact".
+
         Returns:
             list: A list containing unique words extracted from the raw data.
         """
+        if self.workers > 1 and dedup == "exact":
+            return list(self.get_word_counts())
+
+        # Streamed sources are deduplicated while they are read, so the whole word list is never built
+        if self.raw_data is None or dedup != "exact":
+            return list(self.iter_unique_words(dedup=dedup))
+
         word_list = self.get_word_list()
         unique_words = list(set(word_list))
         return unique_words
+
+    def get_word_counts(self):
+        """
+        Count how many times each word appears in the raw data.
+
+        With more than one worker, the file is split into byte ranges that are tokenized and
+        counted in parallel processes. Each worker splits its counts between vocabulary ranges
+        (see `_sample_split_words`), and the counts of each vocabulary range are added up by
+        another worker, so the main process only joins the sorted ranges.
+
+        Returns:
+            Counter: The number of occurrences of each word, in the order of their first appearance,
+                or in lexicographic order when counted by several workers.
+        """
+        if self.workers <= 1:
+            return Counter(self.iter_words())
+
+        # Imported here since it loads multiprocessing, which a single worker doesn't need
+        from concurrent.futures import ProcessPoolExecutor
+
+        ranges = _split_byte_ranges(self.source, self.workers)
+        split_words = _sample_split_words(self.source, self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            shards = list(
+                executor.map(
+                    _count_words_in_range,
+                    [self.source] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
+                    [split_words] * len(ranges),
+                )
+            )
+            # The shards of each vocabulary range, one per byte range
+            merged = executor.map(_merge_counts, zip(*shards))
+
+            # The vocabulary ranges don't overlap and are in order, so the counts come out sorted
+            counts = Counter()
+            for items in merged:
+                dict.update(counts, items)
+        return counts
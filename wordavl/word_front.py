@@ -0,0 +1,251 @@
+from array import array
+from bisect import bisect_left
+from itertools import pairwise
+from time import time
+
+from loguru import logger
+
+from wordavl.metrics import Metrics
+from wordavl.word_index import SEPARATOR
+from wordavl.word_index import WordIndex
+
+# Number of words per block. Larger blocks share more prefixes but decode more words per search.
+BLOCK_SIZE = 16
+
+# Shared prefix lengths are stored in a single byte
+MAX_SHARED = 255
+
+
+class WordFront(WordIndex):
+    """
+    A read-only sorted index of words compressed with front coding.
+
+    The sorted words are split in blocks. The first word of each block, its anchor, is stored
+    in full, and every other word as the number of leading bytes it shares with the previous
+    word followed by the rest of it. A prefix is found by binary searching the anchors, then
+    decoding only the blocks where its words start and end. The searches, the ranking and the
+    snapshots are the same as `WordIndex`, on top of this layout.
+
+    Attributes:
+        buffer (bytes): The blocks, one after the other. Each word is followed by a new line, and
+            every word but the anchors is preceded by one byte holding its shared prefix length.
+        offsets (array): The position where each block starts in the buffer, followed by the
+            position one past the end of the buffer.
+        count (int): The number of words.
+        block_size (int): The number of words per block, the last block may hold fewer.
+        max_weights (array or None): The maximum tree over the weights of the words, see
+            `WordIndex`, or None if the words have no weights.
+    """
+
+    def __init__(
+        self, corpus="", verbose=False, metrics: Metrics = None, block_size: int = BLOCK_SIZE
+    ) -> None:
+        """
+        Initialize a WordFront object.
+
+        Args:
+            corpus (str, optional): A string representing the corpus of words. Defaults to "".
+            verbose (bool, optional): Whether to print verbose logging information. Defaults to False.
+            metrics (Metrics, optional): Where the builds and the searches are recorded.
+                Defaults to None (not recorded).
+            block_size (int, optional): The number of words per block. Defaults to `BLOCK_SIZE`.
+        """
+        if block_size < 1:
+            raise ValueError("The block size must be at least 1")
+        super().__init__(corpus=corpus, verbose=verbose, metrics=metrics)
+        self.block_size = block_size
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        for block in range(len(self.offsets) - 1):
+            yield from (word.decode() for word in self._decode_block(block))
+
+    def train(self) -> None:
+        """
+        Build the blocks from the corpus.
+
+        When the corpus maps each word to its number of occurrences, the counts are kept as the
+        weights of the words, unless they are all equal to 1. The corpus is released once the
+        blocks are built.
+        """
+        logger.debug(f"Initializing block population for corpus with length: {len(self.corpus)}")
+        start_time = time()
+
+        words = self.corpus
+        if not all(previous < current for previous, current in pairwise(words)):
+            words = sorted(set(words))
+
+        chunks = list()
+        offsets = array("Q", [0])
+        size = 0
+        previous = b""
+        for position, word in enumerate(words):
+            encoded = word.encode()
+            if position % self.block_size == 0:
+                if position:
+                    offsets.append(size)
+                chunk = encoded + SEPARATOR
+            else:
+                shared = self._shared_length(previous, encoded)
+                chunk = bytes([shared]) + encoded[shared:] + SEPARATOR
+            chunks.append(chunk)
+            size += len(chunk)
+            previous = encoded
+        if size:
+            offsets.append(size)
+
+        self.buffer = b"".join(chunks)
+        self.offsets = offsets
+        self.count = len(words)
+
+        self.max_weights = None
+        if isinstance(self.corpus, dict) and any(count != 1 for count in self.corpus.values()):
+            self.max_weights = self._build_max_weights([self.corpus[word] for word in words])
+        self.corpus = ""
+
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("build", elapsed)
+        logger.debug(
+            f"Block population completed with {len(self)} words in {len(self.offsets) - 1} "
+            f"blocks of {len(self.buffer)} bytes and took: {round(elapsed, 5)}s"
+        )
+
+    def save(self, path: str, corpus_checksum: int = 0) -> None:
+        """
+        Save the words to a snapshot file, in the uncompressed layout of `WordIndex`.
+
+        Args:
+            path (str): The path of the snapshot file.
+            corpus_checksum (int, optional): The checksum of the corpus the words were read
+                from, recorded in the snapshot (see `file_checksum`). Defaults to 0 (unknown).
+        """
+        weights = self.weights()
+        words = self.words()
+        word_index = WordIndex(corpus=dict(zip(words, weights)) if weights else words)
+        word_index.train()
+        word_index.save(path, corpus_checksum)
+
+    def load(self, path: str, verify: bool = True) -> None:
+        """
+        Replace the words with the ones of a snapshot file, compressed again into blocks.
+
+        Args:
+            path (str): The path of the snapshot file.
+            verify (bool, optional): Whether to check the checksum of the snapshot. Defaults to True.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid, outdated or corrupt.
+        """
+        word_index = WordIndex()
+        word_index.load(path, verify=verify)
+        words = word_index.words()
+        weights = word_index.weights()
+        self.corpus = dict(zip(words, weights)) if weights else words
+        self.train()
+
+    @staticmethod
+    def _build_max_weights(weights: list) -> array:
+        """
+        Build the maximum tree over the weights of the words, see `WordIndex`, in an array of
+        unsigned ints instead of 64-bit integers when the weights fit, which halves its size.
+        """
+        max_weights = WordIndex._build_max_weights(weights)
+        if max(weights, default=0) < 2 ** (8 * array("I").itemsize):
+            max_weights = array("I", max_weights)
+        return max_weights
+
+    @staticmethod
+    def _shared_length(previous: bytes, word: bytes) -> int:
+        """Return the number of leading bytes shared by two words, up to `MAX_SHARED`."""
+        length = min(len(previous), len(word), MAX_SHARED)
+        shared = 0
+        while shared < length and previous[shared] == word[shared]:
+            shared += 1
+        return shared
+
+    def _anchor(self, block: int) -> bytes:
+        """Return the UTF-8 encoded first word of a block."""
+        start = self.offsets[block]
+        return self.buffer[start : self.buffer.index(SEPARATOR, start)]
+
+    def _decode_block(self, block: int) -> list:
+        """
+        Decode the words of a block.
+
+        Args:
+            block (int): The position of the block.
+
+        Returns:
+            list: The UTF-8 encoded words of the block.
+        """
+        buffer = self.buffer
+        position, block_end = self.offsets[block], self.offsets[block + 1]
+        end = buffer.index(SEPARATOR, position)
+        word = buffer[position:end]
+        words = [word]
+        position = end + 1
+        while position < block_end:
+            # The shared length may be the byte of the separator, so the search starts after it
+            end = buffer.index(SEPARATOR, position + 1)
+            word = word[: buffer[position]] + buffer[position + 1 : end]
+            words.append(word)
+            position = end + 1
+        return words
+
+    def _lower_bound(self, key: bytes, low: int = 0) -> int:
+        """
+        Find the position of the first word that is not smaller than the key.
+
+        The anchors are binary searched for the last block starting before the key, and only
+        that block is decoded.
+
+        Args:
+            key (bytes): The UTF-8 encoded key to search for.
+            low (int, optional): A position known not to be after the result. Defaults to 0.
+
+        Returns:
+            int: The position of the first word greater than or equal to the key.
+        """
+        low_block, high_block = low // self.block_size, len(self.offsets) - 1
+        while low_block < high_block:
+            middle = (low_block + high_block) // 2
+            if self._anchor(middle) < key:
+                low_block = middle + 1
+            else:
+                high_block = middle
+
+        # Every anchor from low_block on is at least the key, so the result is in the block before
+        if low_block == 0:
+            return 0
+        block = low_block - 1
+        return block * self.block_size + bisect_left(self._decode_block(block), key)
+
+    def _word(self, position: int) -> bytes:
+        """Return the UTF-8 encoded word stored at the given position."""
+        block, index = divmod(position, self.block_size)
+        return self._decode_block(block)[index]
+
+    def _decode_range(self, start: int, end: int) -> list:
+        """
+        Decode the words between two positions, decoding only the blocks holding them.
+
+        Args:
+            start (int): The position of the first word (inclusive).
+            end (int): The position of the last word (exclusive).
+
+        Returns:
+            list: The decoded words.
+        """
+        if start >= end:
+            return []
+        first_block, last_block = start // self.block_size, (end - 1) // self.block_size
+        words = list()
+        for block in range(first_block, last_block + 1):
+            words.extend(self._decode_block(block))
+        offset = first_block * self.block_size
+        chunk = SEPARATOR.join(words[start - offset : end - offset])
+        return chunk.decode().split(SEPARATOR.decode())
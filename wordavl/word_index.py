@@ -0,0 +1,350 @@
+import heapq
+from array import array
+from itertools import accumulate
+from itertools import pairwise
+from time import perf_counter
+from time import time
+
+from loguru import logger
+
+from wordavl.metrics import Metrics
+from wordavl.snapshot import load_snapshot
+from wordavl.snapshot import save_snapshot
+from wordavl.text_data import TextData
+
+# Separator between the words in the buffer. Words never contain it, so a range of words can be
+# decoded with a single slice and split.
+SEPARATOR = b"\n"
+
+# Byte that never appears in UTF-8 encoded text, so every word starting with a prefix is smaller
+# than the prefix followed by it.
+MAX_BYTE = b"\xff"
+
+
+class WordIndex:
+    """
+    A read-only sorted index of words, stored as one UTF-8 buffer plus an array of offsets.
+
+    Since UTF-8 preserves the code point order, the words can be compared directly as bytes,
+    and all the words starting with a prefix are found with two binary searches.
+
+    Attributes:
+        buffer (bytes or mmap): The sorted unique words, encoded as UTF-8 and separated by new
+            lines. It is the mapped snapshot file when the index was loaded from a snapshot.
+        offsets (array or memoryview): The position where each word starts in the buffer,
+            followed by the position one past the end of the buffer.
+        max_weights (array, memoryview or None): A maximum tree over the weights of the words,
+            or None if the words have no weights. Position n + i holds the weight of word i and
+            every position i < n holds the largest weight of positions 2i and 2i + 1.
+    """
+
+    def __init__(self, corpus="", verbose=False, metrics: Metrics = None) -> None:
+        """
+        Initialize a WordIndex object.
+
+        Args:
+            corpus (str, optional): A string representing the corpus of words. Defaults to "".
+            verbose (bool, optional): Whether to print verbose logging information. Defaults to False.
+            metrics (Metrics, optional): Where the builds, the loads and the searches are
+                recorded. Defaults to None (not recorded).
+        """
+        self.corpus = corpus
+        self.verbose = verbose
+        self.metrics = metrics
+        self.buffer = b""
+        self.offsets = array("Q", [0])
+        self.max_weights = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._word(position).decode()
+
+    def read_corpus(
+        self, text_source: str, stream: bool = False, dedup: str = "exact", workers: int = 1
+    ) -> None:
+        """
+        Read the corpus from a text source. With exact deduplication, the number of occurrences
+        of each word is kept to rank the suggestions.
+
+        Args:
+            text_source (str): The source of the text data (file path or URL).
+            stream (bool, optional): Whether to read the source in chunks instead of loading it
+                all at once, which keeps the memory usage close to the size of the vocabulary.
+                Defaults to False.
+            dedup (str, optional): How repeated words are skipped, see
+                `TextData.iter_unique_words`. Defaults to "exact".
+            workers (int, optional): The number of processes used to tokenize and count the words
+                of a local file in parallel. Defaults to 1.
+        """
+        text_data = TextData(source=text_source, stream=stream, workers=workers)
+        if dedup == "exact":
+            self.corpus = text_data.get_word_counts()
+        else:
+            self.corpus = text_data.get_unique_words(dedup=dedup)
+
+    def train(self) -> None:
+        """
+        Build the index from the corpus.
+
+        When the corpus maps each word to its number of occurrences, the counts are kept as the
+        weights of the words, unless they are all equal to 1. The corpus is released once the
+        index is built, since the words are kept in the buffer.
+        """
+        logger.debug(f"Initializing index population for corpus with length: {len(self.corpus)}")
+        start_time = time()
+
+        words = self.corpus
+        if not all(previous < current for previous, current in pairwise(words)):
+            words = sorted(set(words))
+
+        encoded = [word.encode() for word in words]
+        self.buffer = SEPARATOR.join(encoded)
+        # Each word is followed by one separator, including a virtual one after the last word
+        self.offsets = array("Q", accumulate((len(word) + 1 for word in encoded), initial=0))
+
+        self.max_weights = None
+        if isinstance(self.corpus, dict) and any(count != 1 for count in self.corpus.values()):
+            self.max_weights = self._build_max_weights([self.corpus[word] for word in words])
+        self.corpus = ""
+
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("build", elapsed)
+        logger.debug(
+            f"Index population completed with {len(self)} words in {len(self.buffer)} bytes "
+            f"and took: {round(elapsed, 5)}s"
+        )
+
+    def save(self, path: str, corpus_checksum: int = 0) -> None:
+        """
+        Save the index to a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            corpus_checksum (int, optional): The checksum of the corpus the words were read
+                from, recorded in the snapshot (see `file_checksum`). Defaults to 0 (unknown).
+        """
+        save_snapshot(path, self.buffer, self.offsets, self.max_weights, corpus_checksum)
+
+    def load(self, path: str, verify: bool = True) -> None:
+        """
+        Load the index from a snapshot file, which is memory-mapped instead of read.
+
+        Args:
+            path (str): The path of the snapshot file.
+            verify (bool, optional): Whether to check the checksum of the snapshot. Defaults to True.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid, outdated or corrupt.
+        """
+        start_time = time()
+        self.buffer, self.offsets, self.max_weights = load_snapshot(path, verify=verify)
+        self.corpus = ""
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("load", elapsed)
+        logger.debug(
+            f"Index loaded from '{path}' with {len(self)} words and took: {round(elapsed, 5)}s"
+        )
+
+    def words(self) -> list:
+        """
+        Return all the words of the index in lexicographic order.
+
+        Returns:
+            list: The sorted words.
+        """
+        return self._decode_range(0, len(self))
+
+    def weights(self):
+        """
+        Return the weight of every word of the index, in lexicographic order of the words.
+
+        Returns:
+            list or None: The weights, or None if the words have no weights.
+        """
+        if self.max_weights is None:
+            return None
+        return list(self.max_weights[len(self) :])
+
+    def contains(self, word: str) -> bool:
+        """
+        Check if the index contains the given word.
+
+        Args:
+            word (str): The word to search for.
+
+        Returns:
+            bool: True if the word is in the index, otherwise False.
+        """
+        key = word.encode()
+        position = self._lower_bound(key)
+        return position < len(self) and self._word(position) == key
+
+    def autocomplete(self, prefix: str, limit: int = None, ranked: bool = False):
+        """
+        Provide autocomplete suggestions based on the given prefix.
+
+        Args:
+            prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions to return. Defaults to None.
+            ranked (bool, optional): Whether to return the suggestions with the highest weights
+                first instead of in lexicographic order. Defaults to False.
+
+        Returns:
+            list: The autocomplete suggestions in lexicographic order, or from the highest to the
+                lowest weight when ranked. Returns an empty string if no prefix is provided.
+        """
+        if not prefix:
+            return ""
+
+        if self.metrics is None:
+            return self._autocomplete(prefix, limit, ranked)
+
+        start_time = perf_counter()
+        results = self._autocomplete(prefix, limit, ranked)
+        self.metrics.record("query", perf_counter() - start_time, results=len(results))
+        return results
+
+    def _autocomplete(self, prefix: str, limit: int = None, ranked: bool = False):
+        """
+        Search the index for the suggestions of a non empty prefix.
+        """
+        start, end = self._prefix_range(prefix)
+        if ranked and self.max_weights is not None:
+            positions = self._find_ranked(start, end, limit)
+            return [self._word(position).decode() for position in positions]
+
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._decode_range(start, end)
+
+    def _prefix_range(self, prefix: str):
+        """
+        Find the positions of the words starting with the given prefix.
+
+        Args:
+            prefix (str): The prefix to search for.
+
+        Returns:
+            tuple: The position of the first matching word and the position after the last one.
+        """
+        key = prefix.encode()
+        start = self._lower_bound(key)
+        end = self._lower_bound(key + MAX_BYTE, start)
+        return start, end
+
+    def _find_ranked(self, start: int, end: int, limit: int = None) -> list:
+        """
+        Find the positions of the words with the highest weights between two positions.
+
+        The range is split into the subtrees of the maximum weight tree that cover it, and the
+        subtrees are expanded from the highest maximum weight, so only the paths leading to the
+        returned words are visited.
+
+        Args:
+            start (int): The position of the first word of the range (inclusive).
+            end (int): The position of the last word of the range (exclusive).
+            limit (int, optional): The maximum number of positions to return. Defaults to None.
+
+        Returns:
+            list: The positions of the words, from the highest to the lowest weight.
+        """
+        max_weights = self.max_weights
+        count = len(self)
+        if limit is None:
+            limit = end - start
+
+        def first_leaf(node):
+            # The leftmost leaf of a subtree holds the first word it covers
+            while node < count:
+                node <<= 1
+            return node
+
+        # Entries are (negated weight, first leaf, node), so ties of weight come out in the order
+        # of the words, which is lexicographic
+        heap = list()
+        low, high = start + count, end + count
+        while low < high:
+            if low & 1:
+                heap.append((-max_weights[low], first_leaf(low), low))
+                low += 1
+            if high & 1:
+                high -= 1
+                heap.append((-max_weights[high], first_leaf(high), high))
+            low >>= 1
+            high >>= 1
+        heapq.heapify(heap)
+
+        positions = list()
+        while heap and len(positions) < limit:
+            _, first, node = heapq.heappop(heap)
+            if node < count:
+                heapq.heappush(heap, (-max_weights[2 * node], first, 2 * node))
+                child = 2 * node + 1
+                heapq.heappush(heap, (-max_weights[child], first_leaf(child), child))
+            else:
+                positions.append(node - count)
+        return positions
+
+    @staticmethod
+    def _build_max_weights(weights: list) -> array:
+        """
+        Build the maximum tree over the weights of the words.
+
+        Args:
+            weights (list): The weight of each word, in the order of the words.
+
+        Returns:
+            array: The tree, where position n + i holds the weight of word i and every
+                position i < n holds the largest weight of positions 2i and 2i + 1.
+        """
+        count = len(weights)
+        max_weights = array("Q", bytes(8 * count)) + array("Q", weights)
+        for node in range(count - 1, 0, -1):
+            max_weights[node] = max(max_weights[2 * node], max_weights[2 * node + 1])
+        return max_weights
+
+    def _lower_bound(self, key: bytes, low: int = 0) -> int:
+        """
+        Binary search the position of the first word that is not smaller than the key.
+
+        Args:
+            key (bytes): The UTF-8 encoded key to search for.
+            low (int, optional): The position where the search starts. Defaults to 0.
+
+        Returns:
+            int: The position of the first word greater than or equal to the key.
+        """
+        buffer, offsets = self.buffer, self.offsets
+        high = len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if buffer[offsets[middle] : offsets[middle + 1] - 1] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _word(self, position: int) -> bytes:
+        """Return the UTF-8 encoded word stored at the given position."""
+        return self.buffer[self.offsets[position] : self.offsets[position + 1] - 1]
+
+    def _decode_range(self, start: int, end: int) -> list:
+        """
+        Decode the words between two positions with a single slice of the buffer.
+
+        Args:
+            start (int): The position of the first word (inclusive).
+            end (int): The position of the last word (exclusive).
+
+        Returns:
+            list: The decoded words.
+        """
+        if start >= end:
+            return []
+        chunk = self.buffer[self.offsets[start] : self.offsets[end] - 1]
+        return chunk.decode().split(SEPARATOR.decode())
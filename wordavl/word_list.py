@@ -1,50 +1,213 @@
+from collections import Counter
+from importlib.util import find_spec
+from itertools import islice
+from time import perf_counter
 from time import time
 
 from loguru import logger
 
+from wordavl.batch import sweep_prefixes
+from wordavl.metrics import Metrics
 from wordavl.text_data import TextData
+from wordavl.word_index import WordIndex
+
+
+# Byte that never appears in UTF-8, so a prefix followed by it sorts after all its extensions
+UTF8_MAX_BYTE = b"\xff"
 
 
 class WordList:
-    def __init__(self, corpus="", verbose=False) -> None:
+    def __init__(
+        self, corpus="", verbose=False, metrics: Metrics = None, vectorized: bool = False
+    ) -> None:
         """
         Initialize a WordAVL object.
 
         Args:
             corpus (str, optional): A string representing the corpus of words. Defaults to "".
             verbose (bool, optional): Whether to print verbose logging information. Defaults to False.
+            metrics (Metrics, optional): Where the corpus readings and the searches are recorded.
+                Defaults to None (not recorded).
+            vectorized (bool, optional): Whether `train` stores the sorted unique words in a NumPy
+                array, searched with `numpy.searchsorted` instead of scanned. NumPy is optional:
+                without it, a warning is logged and the words are scanned. Defaults to False.
         """
         super().__init__()
         self.corpus = corpus
         self.verbose = verbose
+        self.metrics = metrics
+        # Number of occurrences of each word, used to rank the suggestions
+        self.weights = corpus if isinstance(corpus, dict) else None
+        if vectorized and find_spec("numpy") is None:
+            logger.warning("NumPy is not installed, the words of the list will be scanned")
+            vectorized = False
+        self.vectorized = vectorized
+        # UTF-8 encoded sorted words and their weights, built by train in vectorized mode
+        self.array = None
+        self.weight_array = None
 
-    def read_corpus(self, text_source: str) -> None:
+    def read_corpus(
+        self, text_source: str, stream: bool = False, dedup: str = "exact", workers: int = 1
+    ) -> None:
         """
-        Read the corpus from a text source and populate the AVL tree.
+        Read the corpus from a text source and populate the list. With exact deduplication,
+        the number of occurrences of each word is kept to rank the suggestions.
 
         Args:
             text_source (str): The source of the text data (file path or URL).
+            stream (bool, optional): Whether to read the source in chunks instead of loading it
+                all at once, which keeps the memory usage close to the size of the vocabulary.
+                Defaults to False.
+            dedup (str, optional): How repeated words are skipped, see
+                `TextData.iter_unique_words`. Defaults to "exact".
+            workers (int, optional): The number of processes used to tokenize and count the words
+                of a local file in parallel. Defaults to 1.
         """
         logger.debug("Initializing list population for corpus")
         start_time = time()
 
-        text_data = TextData(source=text_source)
-        self.corpus = text_data.get_unique_words()
+        text_data = TextData(source=text_source, stream=stream, workers=workers)
+        self.weights = None
+        if dedup == "exact":
+            self.weights = text_data.get_word_counts()
+            words = self.weights
+        else:
+            words = text_data.get_unique_words(dedup=dedup)
+        # Keep the words sorted so the search results come out in lexicographic order
+        self.corpus = sorted(words)
 
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("build", elapsed)
         logger.debug(
-            f"List population completed with {len(self.corpus)} elements and took: {round(time()-start_time, 5)}s"
+            f"List population completed with {len(self.corpus)} elements and took: {round(elapsed, 5)}s"
         )
 
-    def autocomplete(self, prefix: str):
+    def train(self) -> None:
+        """
+        The list is ready as soon as the corpus is read, so there is nothing to train, unless it
+        is vectorized. It is kept so every structure can be used the same way.
+
+        In vectorized mode, the corpus is sorted and deduplicated, and its words are encoded in
+        UTF-8 in a NumPy array of fixed width bytes. UTF-8 keeps the order of the code points,
+        so the array is sorted like the words.
+        """
+        if not self.vectorized:
+            return
+
+        import numpy as np
 
         start_time = time()
-        results = list()
+        words = sorted(set(self.corpus))
+        self.corpus = words
+        self.array = np.array([word.encode() for word in words], dtype=bytes)
+        self.weight_array = None
+        if self.weights:
+            self.weight_array = np.array([self.weights.get(word, 1) for word in words])
+
+        logger.debug(
+            f"List vectorized with {len(self.array)} words of up to {self.array.itemsize} bytes "
+            f"and took: {round(time()-start_time, 5)}s"
+        )
+
+    def save(self, path: str, corpus_checksum: int = 0) -> None:
+        """
+        Save the words of the list to a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            corpus_checksum (int, optional): The checksum of the corpus the words were read
+                from, recorded in the snapshot (see `file_checksum`). Defaults to 0 (unknown).
+        """
+        word_index = WordIndex(corpus=self.weights if self.weights else self.corpus)
+        word_index.train()
+        word_index.save(path, corpus_checksum)
+
+    def load(self, path: str, verify: bool = True) -> None:
+        """
+        Replace the content of the list with the words of a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            verify (bool, optional): Whether to check the checksum of the snapshot. Defaults to True.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid, outdated or corrupt.
+        """
+        word_index = WordIndex()
+        word_index.load(path, verify=verify)
+        self.corpus = word_index.words()
+        weights = word_index.weights()
+        self.weights = None if weights is None else dict(zip(self.corpus, weights))
+        self.train()
+
+    def autocomplete(self, prefix: str, limit: int = None, ranked: bool = False):
+        """
+        Provide autocomplete suggestions based on the given prefix.
 
-        for word in self._find_recursive(prefix=prefix):
-            results.append(word)
+        Args:
+            prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions to return. The scan stops
+                as soon as this many suggestions are found. Defaults to None (no limit).
+            ranked (bool, optional): Whether to return the suggestions with the highest weights
+                first. Every match is collected and sorted by weight. Defaults to False.
+
+        Returns:
+            list: The autocomplete suggestions, in the order of the corpus or from the highest to
+                the lowest weight when ranked.
+        """
+        if self.metrics is None:
+            return self._autocomplete(prefix, limit, ranked)
+
+        start_time = perf_counter()
+        results = self._autocomplete(prefix, limit, ranked)
+        self.metrics.record("query", perf_counter() - start_time, results=len(results))
+        return results
+
+    def _autocomplete(self, prefix: str, limit: int = None, ranked: bool = False):
+        """
+        Scan the corpus for the suggestions of a prefix, or search them in the vectorized words.
+        """
+        if self.array is not None:
+            start, end = self._prefix_ranges([prefix])
+            return self._vectorized_matches(int(start[0]), int(end[0]), limit, ranked)
+
+        if ranked and self.weights:
+            matches = self._find_recursive(prefix=prefix)
+            # Ties of weight are in lexicographic order, whatever the order of the corpus
+            weights = self.weights
+            return sorted(matches, key=lambda word: (-weights[word], word))[:limit]
+        return list(islice(self._find_recursive(prefix=prefix), limit))
+
+    def autocomplete_many(self, prefixes, limit: int = None) -> dict:
+        """
+        Provide autocomplete suggestions for many prefixes at once, in a single sweep of the
+        sorted corpus instead of one scan per prefix.
+
+        Args:
+            prefixes (Iterable): The prefixes for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions per prefix. Defaults to None
+                (no limit).
+
+        Returns:
+            dict: The suggestions of each prefix in lexicographic order. The keys are in
+                lexicographic order.
+        """
+        start_time = time()
+        if self.array is not None:
+            # Both ends of every prefix are searched at once
+            prefixes = sorted(set(prefixes))
+            starts, ends = self._prefix_ranges(prefixes)
+            results = {
+                prefix: self._vectorized_matches(int(start), int(end), limit)
+                for prefix, start, end in zip(prefixes, starts, ends)
+            }
+        else:
+            # The corpus is already sorted when read from a text source, so this is a linear pass
+            results = dict(sweep_prefixes(sorted(set(self.corpus)), prefixes, limit))
 
         logger.debug(
-            f"List search took {round(time()-start_time, 5)}s and found {len(results)} results"
+            f"List batch search for {len(results)} prefixes took {round(time()-start_time, 5)}s"
         )
         return results
 
@@ -52,3 +215,68 @@ class WordList:
         for word in self.corpus:
             if word.startswith(prefix):
                 yield word
+
+    def prefix_counts(self, length: int) -> dict:
+        """
+        Count the distinct words starting with each prefix of a given length.
+
+        In vectorized mode, the words are truncated to the length in a single NumPy operation,
+        and the counts come from the boundaries between the runs of equal prefixes, since the
+        truncated words stay sorted.
+
+        Args:
+            length (int): The number of characters of the prefixes. Words shorter than it have
+                no prefix of this length and are not counted.
+
+        Returns:
+            dict: The number of words starting with each prefix, in lexicographic order.
+        """
+        if self.array is None:
+            words = sorted(set(self.corpus))
+            return dict(Counter(word[:length] for word in words if len(word) >= length))
+
+        # "U0" isn't an empty string type, NumPy reads it as the length of the longest word
+        if length == 0:
+            return {"": len(self.corpus)} if self.corpus else dict()
+
+        import numpy as np
+
+        prefixes = np.array(self.corpus, dtype=f"U{length}")
+        prefixes = prefixes[np.char.str_len(prefixes) == length]
+        if not len(prefixes):
+            return dict()
+        starts = np.flatnonzero(prefixes[1:] != prefixes[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        counts = np.diff(np.append(starts, len(prefixes)))
+        return dict(zip(prefixes[starts].tolist(), counts.tolist()))
+
+    def _prefix_ranges(self, prefixes):
+        """
+        Find the range of positions of the vectorized words starting with each prefix.
+
+        Returns:
+            tuple: The arrays of the start (inclusive) and the end (exclusive) of each range.
+        """
+        import numpy as np
+
+        encoded = [prefix.encode() for prefix in prefixes]
+        starts = np.searchsorted(self.array, encoded, side="left")
+        ends = np.searchsorted(self.array, [prefix + UTF8_MAX_BYTE for prefix in encoded])
+        return starts, ends
+
+    def _vectorized_matches(self, start: int, end: int, limit: int = None, ranked: bool = False):
+        """
+        Return the words at a range of positions of the vectorized words, in lexicographic order,
+        or from the highest to the lowest weight when ranked.
+        """
+        if not ranked or self.weight_array is None:
+            if limit is not None:
+                end = min(end, start + limit)
+            return self.corpus[start:end]
+
+        import numpy as np
+
+        # The stable sort keeps the words of equal weight in lexicographic order
+        order = np.argsort(-self.weight_array[start:end], kind="stable")[:limit]
+        return [self.corpus[start + position] for position in order.tolist()]
+
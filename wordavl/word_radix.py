@@ -0,0 +1,151 @@
+from itertools import islice
+from itertools import repeat
+from time import perf_counter
+from time import time
+
+from loguru import logger
+
+from wordavl.metrics import Metrics
+from wordavl.structures.radix import RadixTree
+from wordavl.text_data import TextData
+from wordavl.word_index import WordIndex
+
+
+class WordRadix(RadixTree):
+    def __init__(self, corpus="", verbose=False, metrics: Metrics = None) -> None:
+        """
+        Initialize a WordRadix object.
+
+        Args:
+            corpus (str, optional): A string representing the corpus of words. Defaults to "".
+            verbose (bool, optional): Whether to print verbose logging information. Defaults to False.
+            metrics (Metrics, optional): Where the builds and the searches are recorded.
+                Defaults to None (not recorded).
+        """
+        super().__init__()
+        self.corpus = corpus
+        self.verbose = verbose
+        self.metrics = metrics
+
+    def read_corpus(
+        self, text_source: str, stream: bool = False, dedup: str = "exact", workers: int = 1
+    ) -> None:
+        """
+        Read the corpus from a text source. With exact deduplication, the number of occurrences
+        of each word is kept to rank the suggestions.
+
+        Args:
+            text_source (str): The source of the text data (file path or URL).
+            stream (bool, optional): Whether to read the source in chunks instead of loading it
+                all at once, which keeps the memory usage close to the size of the vocabulary.
+                Defaults to False.
+            dedup (str, optional): How repeated words are skipped, see
+                `TextData.iter_unique_words`. Defaults to "exact".
+            workers (int, optional): The number of processes used to tokenize and count the words
+                of a local file in parallel. Defaults to 1.
+        """
+        text_data = TextData(source=text_source, stream=stream, workers=workers)
+        if dedup == "exact":
+            self.corpus = text_data.get_word_counts()
+        else:
+            self.corpus = text_data.get_unique_words(dedup=dedup)
+
+    def train(self) -> None:
+        """
+        Train the radix tree with the corpus. When the corpus maps each word to its number of
+        occurrences, the counts are stored as the weights of the words.
+        """
+        logger.debug(
+            f"Initializing radix tree population for corpus with length: {len(self.corpus)}"
+        )
+        start_time = time()
+
+        weights = self.corpus if isinstance(self.corpus, dict) else dict()
+        # Sorted insertions keep walking the same recent path, which is noticeably faster
+        for word in sorted(self.corpus):
+            self.add(word, weights.get(word, 1))
+
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("build", elapsed)
+        logger.debug(
+            f"Radix tree population completed with {len(self)} words and took: {round(elapsed, 5)}s"
+        )
+
+    def save(self, path: str, corpus_checksum: int = 0) -> None:
+        """
+        Save the words of the radix tree to a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            corpus_checksum (int, optional): The checksum of the corpus the words were read
+                from, recorded in the snapshot (see `file_checksum`). Defaults to 0 (unknown).
+        """
+        word_index = WordIndex(
+            corpus={path: node.weight for node, path in self._iter_value_nodes(self.root, "")}
+        )
+        word_index.train()
+        word_index.save(path, corpus_checksum)
+
+    def load(self, path: str, verify: bool = True) -> None:
+        """
+        Replace the content of the radix tree with the words of a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            verify (bool, optional): Whether to check the checksum of the snapshot. Defaults to True.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid, outdated or corrupt.
+        """
+        word_index = WordIndex()
+        word_index.load(path, verify=verify)
+        self.clear()
+        weights = word_index.weights() or repeat(1)
+        for word, weight in zip(word_index.words(), weights):
+            self.add(word, weight)
+
+    def autocomplete(
+        self, prefix: str, limit: int = None, ranked: bool = False, max_edits: int = 0
+    ):
+        """
+        Provide autocomplete suggestions based on the given prefix.
+
+        Args:
+            prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions to return. Defaults to None.
+            ranked (bool, optional): Whether to return the suggestions with the highest weights
+                first instead of in lexicographic order. Defaults to False.
+            max_edits (int, optional): The number of characters that may be inserted, deleted or
+                replaced in the prefix (Levenshtein distance), to tolerate typos. Defaults to 0.
+
+        Returns:
+            list: The autocomplete suggestions in lexicographic order, or from the highest to the
+                lowest weight when ranked. With typos, the suggestions needing fewer edits come
+                first. Returns an empty string if no prefix is provided.
+        """
+        if not prefix:
+            return ""
+
+        if self.metrics is None:
+            return self._autocomplete(prefix, limit, ranked, max_edits)
+
+        start_time = perf_counter()
+        results = self._autocomplete(prefix, limit, ranked, max_edits)
+        self.metrics.record("query", perf_counter() - start_time, results=len(results))
+        return results
+
+    def _autocomplete(
+        self, prefix: str, limit: int = None, ranked: bool = False, max_edits: int = 0
+    ):
+        """
+        Search the radix tree for the suggestions of a non empty prefix.
+        """
+        if max_edits:
+            return list(islice(self._iter_fuzzy(prefix, max_edits, ranked=ranked), limit))
+
+        node, path = self._find_prefix(prefix)
+        if node is None:
+            return []
+        walk = self._iter_ranked if ranked else self._iter_subtree
+        return list(islice(walk(node, path), limit))
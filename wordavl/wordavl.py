@@ -1,106 +1,767 @@
+import heapq
+import threading
+from bisect import bisect_left
+from contextlib import nullcontext
+from itertools import islice
+from itertools import repeat
+from itertools import takewhile
+from time import perf_counter
 from time import time
 
 from loguru import logger
 
+from wordavl.batch import sweep_prefixes
+from wordavl.cache import LRUCache
+from wordavl.metrics import Metrics
 from wordavl.structures.avl import AVLNode
 from wordavl.structures.avl import AVLTree
 from wordavl.text_data import TextData
+from wordavl.text_data import normalize_key
+from wordavl.word_index import WordIndex
 
 
 class WordAVL(AVLTree):
-    def __init__(self, corpus="", verbose=False) -> None:
+    def __init__(
+        self,
+        corpus="",
+        verbose=False,
+        cache_size: int = 0,
+        normalize: bool = False,
+        metrics: Metrics = None,
+        concurrent: bool = False,
+    ) -> None:
         """
         Initialize a WordAVL object.
 
         Args:
             corpus (str, optional): A string representing the corpus of words. Defaults to "".
             verbose (bool, optional): Whether to print verbose logging information. Defaults to False.
+            cache_size (int, optional): The number of autocomplete results kept in a LRU cache.
+                Defaults to 0 (no cache).
+            normalize (bool, optional): Whether the words are matched regardless of their case
+                and accents. The tree then stores the normalized key of the words (see
+                `normalize_key`) and returns their original spellings. Defaults to False.
+            metrics (Metrics, optional): Where the builds and the searches are recorded, with
+                the number of results and of visited nodes. Defaults to None (not recorded).
+            concurrent (bool, optional): Whether the tree is searched by other threads while it
+                is updated. The updates then copy the nodes they change and publish the new
+                root at once (see `AVLTree.persistent`), and they are serialized by a lock that
+                the searches don't take. The spellings of normalized words are stored on the
+                nodes, so they are published with the root. Defaults to False.
         """
-        super().__init__()
+        super().__init__(persistent=concurrent)
         self.corpus = corpus
         self.verbose = verbose
+        self.cache = LRUCache(cache_size) if cache_size > 0 else None
+        # Number of cache misses answered from the cached results of a shorter prefix
+        self.cache_derived = 0
+        self.normalize = normalize
+        self.metrics = metrics
+        self.concurrent = concurrent
+        self._write_lock = threading.RLock() if concurrent else nullcontext()
 
-    def read_corpus(self, text_source: str) -> None:
+    def __iter__(self):
         """
-        Read the corpus from a text source and populate the AVL tree.
+        Iterates over the words of the tree, in the order of their normalized keys when the
+        words are normalized.
+        """
+        for word, _ in self._iter_words():
+            yield word
+
+    def read_corpus(
+        self, text_source: str, stream: bool = False, dedup: str = "exact", workers: int = 1
+    ) -> None:
+        """
+        Read the corpus from a text source and populate the AVL tree. With exact deduplication,
+        the number of occurrences of each word is kept to rank the suggestions.
 
         Args:
             text_source (str): The source of the text data (file path or URL).
+            stream (bool, optional): Whether to read the source in chunks instead of loading it
+                all at once, which keeps the memory usage close to the size of the vocabulary.
+                Defaults to False.
+            dedup (str, optional): How repeated words are skipped, see
+                `TextData.iter_unique_words`. Defaults to "exact".
+            workers (int, optional): The number of processes used to tokenize and count the words
+                of a local file in parallel. Defaults to 1.
         """
-        text_data = TextData(source=text_source)
-        self.corpus = text_data.get_unique_words()
+        text_data = TextData(source=text_source, stream=stream, workers=workers)
+        if dedup == "exact":
+            self.corpus = text_data.get_word_counts()
+        else:
+            self.corpus = text_data.get_unique_words(dedup=dedup)
 
-    def train(self) -> None:
+    def train(self, bulk: bool = True) -> None:
         """
-        Train the AVL tree with the corpus.
+        Train the AVL tree with the corpus. When the corpus maps each word to its number of
+        occurrences, the counts are stored as the weights of the words.
+
+        Args:
+            bulk (bool, optional): Whether to build the tree in a single bottom-up pass from the
+                sorted corpus instead of inserting the words one by one. Defaults to True.
         """
         logger.debug(
             f"Initializing AVL population for corpus with length: {len(self.corpus)}"
         )
         start_time = time()
 
-        for word in self.corpus:
-            self.add(word)
+        weights = self.corpus if isinstance(self.corpus, dict) else dict()
+        with self._write_lock:
+            if bulk:
+                words = list(self.corpus)
+                weights = [weights.get(word, 1) for word in words]
+                # Keep the words that were already added to the tree
+                if self.root is not None:
+                    existing = list(self._iter_words())
+                    words = [word for word, _ in existing] + words
+                    weights = [weight for _, weight in existing] + weights
+                self._load_words(words, weights)
+            else:
+                for word in self.corpus:
+                    self.add(word, weights.get(word, 1))
+
+        elapsed = time() - start_time
+        if self.metrics is not None:
+            self.metrics.record("build", elapsed)
+        logger.debug(
+            f"AVL population completed with height: {self.get_height()} and took: {round(elapsed, 5)}s"
+        )
+
+    def add(self, value, weight=1):
+        """
+        Overrides the add method in the AVLTree class to store the spelling of normalized words
+        and invalidate the cached results.
+        """
+        with self._write_lock:
+            self._add_word(value, weight)
+            self._invalidate_cache()
+
+    def remove(self, value):
+        """
+        Overrides the remove method in the AVLTree class to remove the spelling of normalized
+        words and invalidate the cached results.
+        """
+        with self._write_lock:
+            removed = self._remove_word(value)
+            if removed:
+                self._invalidate_cache()
+        return removed
+
+    def contains(self, value):
+        """
+        Overrides the contains method in the BST class to look for the original spelling of
+        normalized words.
+        """
+        if not self.normalize:
+            return super().contains(value)
+
+        node = self._find_node(self.root, normalize_key(value))
+        return node is not None and value in self._spellings_of(node)
+
+    def _add_word(self, word, weight=1) -> None:
+        """
+        Add a word to the tree. A normalized word is added as a spelling of its key, and the key
+        takes the largest weight of its spellings.
+        """
+        if not self.normalize:
+            AVLTree.add(self, word, weight)
+            return
+
+        key = normalize_key(word)
+        node = self._find_node(self.root, key)
+        spellings = dict() if node is None else self._spellings_of(node)
+        spellings[word] = weight
+        AVLTree.add(self, key, max(spellings.values()), self._stored_spellings(key, spellings))
+
+    def _remove_word(self, word) -> bool:
+        """
+        Remove a word from the tree. The key of a normalized word is only removed with its last
+        spelling.
+        """
+        if not self.normalize:
+            return AVLTree.remove(self, word)
+
+        key = normalize_key(word)
+        node = self._find_node(self.root, key)
+        spellings = dict() if node is None else self._spellings_of(node)
+        if word not in spellings:
+            return False
+
+        del spellings[word]
+        if spellings:
+            AVLTree.add(self, key, max(spellings.values()), self._stored_spellings(key, spellings))
+        else:
+            AVLTree.remove(self, key)
+        return True
+
+    @staticmethod
+    def _spellings_of(node) -> dict:
+        """
+        Return a copy of the original spellings of a node and their weights.
+        """
+        spellings = node.value if node.data is None else node.data
+        if isinstance(spellings, str):
+            return {spellings: node.weight}
+        return dict(spellings)
+
+    @staticmethod
+    def _stored_spellings(key, spellings: dict):
+        """
+        Return how the spellings of a key are stored on its node: None if the key is its only
+        spelling, the spelling itself if there is a single one, since it has the weight of the
+        key, or else the dictionary of their weights.
+        """
+        if not spellings or spellings.keys() == {key}:
+            return None
+        if len(spellings) == 1:
+            return next(iter(spellings))
+        return spellings
+
+    def _iter_words(self):
+        """
+        Iterate over the original words of the tree and their weights. The spellings of a
+        normalized key are produced from the highest to the lowest weight.
+
+        Yields:
+            tuple: The words and their weights.
+        """
+        for node in self._iter_nodes():
+            if node.data is None:
+                yield node.value, node.weight
+            elif isinstance(node.data, str):
+                yield node.data, node.weight
+            else:
+                yield from sorted(node.data.items(), key=lambda item: (-item[1], item[0]))
+
+    def _load_words(self, words, weights=None) -> None:
+        """
+        Replace the content of the tree with the given words, grouping normalized words by key.
+
+        Args:
+            words (Sequence): The words to be stored in the tree.
+            weights (Sequence, optional): The weight of each word. The weights of repeated words
+                are added together. Defaults to None (every weight is 1).
+        """
+        if not self.normalize:
+            self.bulk_load(words, weights)
+            return
+
+        groups = dict()
+        for word, weight in zip(words, weights if weights is not None else repeat(1)):
+            spellings = groups.setdefault(normalize_key(word), dict())
+            spellings[word] = spellings.get(word, 0) + weight
+
+        keys = sorted(groups)
+        weights = [max(groups[key].values()) for key in keys]
+        spellings = [self._stored_spellings(key, groups[key]) for key in keys]
+        self.bulk_load(keys, weights, spellings)
+
+    def _expand(self, nodes, limit: int = None) -> list:
+        """
+        Replace the nodes of normalized keys found by a search with the original spellings of
+        the words.
+        """
+        results = list()
+        for node in nodes:
+            spellings = node.value if node.data is None else node.data
+            if isinstance(spellings, str):
+                results.append(spellings)
+            else:
+                results.extend(sorted(spellings, key=lambda word: (-spellings[word], word)))
+            if limit is not None and len(results) >= limit:
+                break
+        return results[:limit]
+
+    def apply_delta(self, adds=(), removes=()) -> None:
+        """
+        Update the vocabulary in place, without rebuilding the tree.
+
+        The words are removed first, so a word that is both removed and added stays in the tree.
+
+        Args:
+            adds (Iterable or dict, optional): The words to be added. When it maps each word to
+                its weight, the weights of the words already in the tree are replaced. Otherwise
+                the words already in the tree keep their weight. Defaults to ().
+            removes (Iterable, optional): The words to be removed. Words that are not in the tree
+                are ignored. Defaults to ().
+        """
+        start_time = time()
+        with self._write_lock:
+            removed = sum(self._remove_word(word) for word in removes)
+
+            added = 0
+            if isinstance(adds, dict):
+                for word, weight in adds.items():
+                    self._add_word(word, weight)
+                    added += 1
+            else:
+                for word in adds:
+                    if not self.contains(word):
+                        self._add_word(word)
+                        added += 1
 
+            # The cache is dropped once for the whole delta
+            self._invalidate_cache()
         logger.debug(
-            f"AVL population completed with height: {self.get_height()} and took: {round(time()-start_time, 5)}s"
+            f"Delta with {added} additions and {removed} removals took {round(time()-start_time, 5)}s"
         )
 
-    def autocomplete(self, prefix: str):
+    def bulk_load(self, values, weights=None, data=None):
+        """
+        Overrides the bulk_load method in the AVLTree class to invalidate the cached results.
+        """
+        with self._write_lock:
+            super().bulk_load(values, weights, data)
+            self._invalidate_cache()
+
+    def cache_info(self) -> dict:
+        """
+        Return the statistics of the autocomplete cache.
+
+        Returns:
+            dict: The number of hits, misses, misses answered from a shorter prefix, stored
+                entries and the maximum number of entries. Empty if there is no cache.
+        """
+        if self.cache is None:
+            return dict()
+        return {**self.cache.info(), "derived": self.cache_derived}
+
+    def _invalidate_cache(self) -> None:
+        """
+        Drop the cached results, which may be outdated once the tree changes.
+
+        The cache is replaced by an empty one instead of being cleared, so a search that
+        started on the previous tree stores its results in the dropped cache.
+        """
+        if self.cache is not None:
+            cache = LRUCache(self.cache.maxsize)
+            cache.hits, cache.misses = self.cache.hits, self.cache.misses
+            self.cache = cache
+
+    def save(self, path: str, corpus_checksum: int = 0) -> None:
+        """
+        Save the words of the AVL tree to a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+            corpus_checksum (int, optional): The checksum of the corpus the words were read
+                from, recorded in the snapshot (see `file_checksum`). Defaults to 0 (unknown).
+        """
+        word_index = WordIndex(corpus=dict(self._iter_words()))
+        word_index.train()
+        word_index.save(path, corpus_checksum)
+
+    def load(self, path: str, verify: bool = True) -> None:
+        """
+        Replace the content of the AVL tree with the words of a snapshot file.
+
+        The tree isn't backed by the mapped file: every word of the snapshot is decoded and a
+        node is created for it, an O(n) rebuild that only skips reading and tokenizing the
+        corpus. A `WordIndex` loads the same snapshot in place, in milliseconds.
+
+        Args:
+            path (str): The path of the snapshot file.
+            verify (bool, optional): Whether to check the checksum of the snapshot. Defaults to True.
+
+        Raises:
+            SnapshotError: If the snapshot is invalid, outdated or corrupt.
+        """
+        word_index = WordIndex()
+        word_index.load(path, verify=verify)
+        with self._write_lock:
+            self._load_words(word_index.words(), word_index.weights())
+
+    def autocomplete(
+        self, prefix: str, limit: int = None, ranked: bool = False, offset: int = 0
+    ):
         """
         Provide autocomplete suggestions based on the given prefix.
 
         Args:
             prefix (str): The prefix for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions to return. The tree walk
+                stops as soon as this many suggestions are found. Defaults to None (no limit).
+            ranked (bool, optional): Whether to return the suggestions with the highest weights
+                first instead of in lexicographic order. Defaults to False.
+            offset (int, optional): The number of suggestions to skip, to return the following
+                pages of suggestions. In lexicographic order, the first suggestion of the page
+                is found from the subtree sizes in O(log n) instead of walking the skipped ones.
+                Defaults to 0.
 
         Returns:
-            str: A string containing autocomplete suggestions based on the provided prefix.
-                Returns an empty string if no prefix is provided.
+            list: The autocomplete suggestions in lexicographic order, or from the highest to the
+                lowest weight when ranked. Returns an empty string if no prefix is provided.
+                Unranked normalized words are in the order of their keys, and the spellings of
+                a key from the highest to the lowest weight.
         """
         if not prefix or prefix == "":
             return ""
 
-        return self._find_all_elements_with_prefix(prefix=prefix)
+        if self.metrics is None:
+            return self._autocomplete(prefix, limit, ranked, offset)
+
+        visits = list()
+        start_time = perf_counter()
+        results = self._autocomplete(prefix, limit, ranked, offset, visits)
+        # Cached results and pages found from the subtree sizes don't count their visited nodes
+        self.metrics.record(
+            "query",
+            perf_counter() - start_time,
+            results=len(results),
+            visited=sum(visits) if visits else None,
+        )
+        return results
 
-    def _find_all_elements_with_prefix(self, prefix: str):
+    def _autocomplete(
+        self, prefix: str, limit: int = None, ranked: bool = False, offset: int = 0, visits=None
+    ):
         """
-        Find all elements in the AVL tree with the given prefix.
+        Search the suggestions of a non empty prefix, in the cache first if there is one.
 
         Args:
-            prefix (str): The prefix to search for.
+            visits (list, optional): Where the number of nodes visited by the tree walk is
+                appended, which is only counted when given. Defaults to None.
+        """
+        if self.normalize:
+            prefix = normalize_key(prefix)
+
+        # The cache is taken before the tree, since it is replaced after the tree changes
+        cache = self.cache
+        if cache is None:
+            return self._find_elements_with_prefix(prefix, limit, ranked, offset, visits)
+
+        key = (prefix, limit, ranked, offset)
+        results = cache.get(key)
+        if results is None:
+            results = self._derive_from_cache(prefix, limit, ranked, offset, cache)
+            if results is None:
+                results = self._find_elements_with_prefix(prefix, limit, ranked, offset, visits)
+            cache.put(key, results)
+
+        # The cached list is copied so callers can't change it
+        return list(results)
+
+    def autocomplete_many(self, prefixes, limit: int = None) -> dict:
+        """
+        Provide autocomplete suggestions for many prefixes at once.
+
+        Instead of descending from the root for each prefix, the tree is walked once in order
+        and the sorted prefixes are answered while sweeping its words.
+
+        Args:
+            prefixes (Iterable): The prefixes for which autocomplete suggestions are requested.
+            limit (int, optional): The maximum number of suggestions per prefix. Defaults to None
+                (no limit).
 
         Returns:
-            list: A list containing all elements in the AVL tree with the given prefix.
+            dict: The suggestions of each prefix in lexicographic order, as returned by
+                `autocomplete`. The keys are in lexicographic order.
         """
-        logger.debug(
-            f"Start search for words with the given prefix '{prefix}' in pre-loaded corpus"
-        )
+        logger.debug("Start batch search for words with the given prefixes in pre-loaded corpus")
         start_time = time()
-        results = list()
 
-        for word in self._find_recursive(self.root, prefix):
-            results.append(word)
+        prefixes = list(prefixes)
+        results = self._sweep_many(prefixes, limit)
 
         logger.debug(
-            f"Search for prefix '{prefix}' took {round(time()-start_time, 5)}s and found {len(results)} results"
+            f"Batch search for {len(results)} prefixes took {round(time()-start_time, 5)}s"
         )
+        return results
+
+    def _sweep_many(self, prefixes: list, limit: int = None) -> dict:
+        """
+        Answer the prefixes of `autocomplete_many` while sweeping the words of the tree.
+        """
+        # Keep the answer of autocomplete for empty prefixes
+        results = {prefix: "" for prefix in prefixes if not prefix}
+        keys = {prefix: self._key(prefix) for prefix in prefixes if prefix}
+        if not self.normalize:
+            values = [node.value for node in self._iter_nodes()]
+            found = dict(sweep_prefixes(values, keys.values(), limit))
+            results.update((prefix, found[keys[prefix]]) for prefix in sorted(keys))
+            return results
+
+        # The nodes are taken from a single walk, so their spellings match the swept keys
+        nodes = {node.value: node for node in self._iter_nodes()}
+        found = dict(sweep_prefixes(list(nodes), keys.values(), limit))
+        for prefix in sorted(keys):
+            matches = found[keys[prefix]]
+            results[prefix] = self._expand([nodes[key] for key in matches], limit)
+        return results
+
+    def _find_elements_with_prefix(
+        self, prefix: str, limit: int = None, ranked: bool = False, offset: int = 0, visits=None
+    ):
+        """
+        Search the AVL tree for the elements with the given prefix, in lexicographic or ranked order.
+        """
+        if offset and not ranked and not self.normalize:
+            return self._find_page_with_prefix(prefix, offset, limit)
+
+        # The weights and the spellings don't follow the positions of the keys, so the skipped
+        # elements are searched as well
+        if offset and limit is not None:
+            limit += offset
+
+        if self.normalize:
+            results = self._find_spellings_with_prefix(prefix, limit, ranked, visits)
+        elif ranked:
+            results = self._find_ranked_elements_with_prefix(prefix, limit, visits)
+        else:
+            results = self._find_all_elements_with_prefix(prefix, limit, visits)
+        return results[offset:] if offset else results
+
+    def _find_spellings_with_prefix(
+        self, prefix: str, limit: int = None, ranked: bool = False, visits=None
+    ):
+        """
+        Find the original spellings of the normalized keys with the given prefix, in
+        lexicographic order of the keys, or from the highest to the lowest weight of the
+        spellings when ranked.
+        """
+        if not ranked:
+            nodes = self._find_all_nodes_with_prefix(prefix, limit, visits)
+            # Every key has at least one spelling, so the limit of keys is enough
+            return self._expand(nodes, limit)
+
+        # The weight of a key is the largest of its spellings, so the spellings of a key are
+        # merged with the ones already found once no following key can have a heavier spelling
+        walk = self._iter_ranked_nodes(prefix, visits)
+        node = next(walk, None)
+        results, heap = list(), list()
+        while (heap or node is not None) and (limit is None or len(results) < limit):
+            if node is not None and (not heap or -heap[0][0] <= node.weight):
+                for word, weight in self._spellings_of(node).items():
+                    heapq.heappush(heap, (-weight, word))
+                node = next(walk, None)
+            else:
+                results.append(heapq.heappop(heap)[1])
+        walk.close()
+        return results
+
+    def _find_page_with_prefix(self, prefix: str, offset: int, limit: int = None):
+        """
+        Find the elements with the given prefix in lexicographic order, skipping the first ones.
+
+        The values starting with the prefix are contiguous, so the first element of the page is
+        the value at position `rank(prefix) + offset`, found in O(log n).
+
+        Args:
+            prefix (str): The prefix to search for.
+            offset (int): The number of elements to skip.
+            limit (int, optional): The maximum number of elements to return. Defaults to None.
+
+        Returns:
+            list: The elements of the page, in lexicographic order.
+        """
+        page = takewhile(lambda value: value.startswith(prefix), self.range(prefix, start=offset))
+        return list(islice(page, limit))
+
+    def _key(self, word: str) -> str:
+        """
+        Return the value stored in the tree for a word.
+        """
+        return normalize_key(word) if self.normalize else word
+
+    def _derive_from_cache(
+        self, prefix: str, limit: int = None, ranked: bool = False, offset: int = 0, cache=None
+    ):
+        """
+        Answer a search from the cached complete results of a shorter prefix, if there is one.
+
+        The words starting with the prefix are a subset of the words starting with any shorter
+        prefix, in the same order, so they can be filtered instead of walking the tree again.
+
+        Args:
+            prefix (str): The prefix to search for.
+            limit (int, optional): The maximum number of elements to return. Defaults to None.
+            ranked (bool, optional): Whether the elements are in ranked order. Defaults to False.
+            offset (int, optional): The number of elements to skip. Defaults to 0.
+            cache (LRUCache, optional): The cache holding the results. Defaults to None (the
+                cache of the tree).
+
+        Returns:
+            list or None: The elements with the given prefix, or None if no shorter prefix is cached.
+        """
+        # Normalized results hold the original spellings, which don't start with the prefix
+        if self.normalize:
+            return None
+
+        if cache is None:
+            cache = self.cache
+        for length in range(len(prefix) - 1, 0, -1):
+            cached = cache.peek((prefix[:length], None, ranked, 0))
+            if cached is None:
+                continue
+
+            self.cache_derived += 1
+            if ranked:
+                matches = (word for word in cached if word.startswith(prefix))
+                return list(islice(matches, offset, None if limit is None else offset + limit))
+
+            # Lexicographic results are sorted, so the matches are a contiguous slice
+            start = end = bisect_left(cached, prefix) + offset
+            stop = len(cached) if limit is None else min(len(cached), start + limit)
+            while end < stop and cached[end].startswith(prefix):
+                end += 1
+            return cached[start:end]
+
+        return None
+
+    def _find_all_elements_with_prefix(self, prefix: str, limit: int = None, visits=None):
+        """
+        Find all elements in the AVL tree with the given prefix.
+
+        Args:
+            prefix (str): The prefix to search for.
+            limit (int, optional): The maximum number of elements to return. Defaults to None.
+            visits (list, optional): Where the number of visited nodes is appended. Defaults to
+                None (not counted).
+
+        Returns:
+            list: A list containing the elements in the AVL tree with the given prefix,
+                in lexicographic order.
+        """
+        return [node.value for node in self._find_all_nodes_with_prefix(prefix, limit, visits)]
+
+    def _find_all_nodes_with_prefix(self, prefix: str, limit: int = None, visits=None):
+        """
+        Find the nodes whose value starts with the given prefix, in lexicographic order, as
+        `_find_all_elements_with_prefix`.
+        """
+        if visits is None:
+            return list(islice(self._find_iterative(self.root, prefix), limit))
+
+        walk = self._count_iterative(self.root, prefix, visits)
+        results = list(islice(walk, limit))
+        # Closing the walk stopped by the limit appends its count
+        walk.close()
+        return results
+
+    def _find_ranked_elements_with_prefix(self, prefix: str, limit: int = None, visits=None):
+        """
+        Find the elements in the AVL tree with the given prefix and the highest weights.
 
+        The subtrees are expanded from the one with the highest maximum weight, so the search
+        stops after visiting the paths leading to the returned elements instead of every match.
+
+        Args:
+            prefix (str): The prefix to search for.
+            limit (int, optional): The maximum number of elements to return. Defaults to None.
+            visits (list, optional): Where the number of visited nodes is appended. Defaults to
+                None (not counted).
+
+        Returns:
+            list: The elements with the given prefix, from the highest to the lowest weight.
+        """
+        walk = self._iter_ranked_nodes(prefix, visits)
+        results = [node.value for node in islice(walk, limit)]
+        # Closing the walk stopped by the limit appends its count
+        walk.close()
         return results
 
-    def _find_recursive(self, current_node: AVLNode, prefix: str):
+    def _iter_ranked_nodes(self, prefix: str, visits=None):
+        """
+        Iterate over the nodes whose value starts with the prefix, from the highest to the lowest
+        weight, and in lexicographic order for equal weights.
+
+        Args:
+            prefix (str): The prefix to search for.
+            visits (list, optional): Where the number of visited nodes is appended once the walk
+                ends or is closed. Defaults to None (not counted).
+
+        Yields:
+            AVLNode: The nodes with the given prefix.
         """
-        Recursively find all node values with the given prefix starting from the current node.
+        # The root is read once, since a concurrent update may replace it
+        root = self.root
+
+        # Entries are (negated weight, lower bound, is subtree, node), where the lower bound of a
+        # subtree is a value that sorts before all of its values. Ties of weight come out in
+        # lexicographic order, and single values are ordered before subtrees bounded by them.
+        heap = list()
+        if root is not None:
+            heap.append((-root.max_weight, "", True, root))
+
+        visited = 0
+        try:
+            while heap:
+                _, bound, is_subtree, node = heapq.heappop(heap)
+                if not is_subtree:
+                    yield node
+                    continue
+
+                visited += 1
+                if node.value.startswith(prefix):
+                    heapq.heappush(heap, (-node.weight, node.value, False, node))
+                # Matches can only be on the left if the prefix sorts before the node value
+                left, right = node.left_child, node.right_child
+                if left is not None and prefix < node.value:
+                    heapq.heappush(heap, (-left.max_weight, bound, True, left))
+                # And on the right if the node value doesn't sort after all the matches
+                if right is not None and (node.value < prefix or node.value.startswith(prefix)):
+                    heapq.heappush(heap, (-right.max_weight, node.value, True, right))
+        finally:
+            if visits is not None:
+                visits.append(visited)
+
+    def _find_iterative(self, current_node: AVLNode, prefix: str):
+        """
+        Iteratively find all nodes whose value starts with the given prefix, starting from the
+        current node.
+
+        The nodes are produced in order (left subtree, node, right subtree), so they come out
+        sorted and the walk can be stopped as soon as enough nodes were consumed. Only the
+        matching nodes are kept in the explicit stack, since they are the only ones whose right
+        subtree may still hold matches.
         """
+        stack = []
+        while stack or current_node is not None:
+            while current_node is not None:
+                # Matches can be found on both sides of a node that starts with the prefix
+                if current_node.value.startswith(prefix):
+                    stack.append(current_node)
+                    current_node = current_node.left_child
+                # Search in the left subtree
+                elif prefix < current_node.value:
+                    current_node = current_node.left_child
+                # Search in the right subtree
+                else:
+                    current_node = current_node.right_child
 
-        # Check if the current node value starts with the prefix
-        if current_node is not None and current_node.value.startswith(prefix):
-            yield current_node.value
-            yield from self._find_recursive(current_node.right_child, prefix)
-            yield from self._find_recursive(current_node.left_child, prefix)
-        # Recursively search in the left subtree
-        elif current_node is not None and prefix < current_node.value:
-            yield from self._find_recursive(current_node.left_child, prefix)
+            if not stack:
+                return
+            current_node = stack.pop()
+            yield current_node
+            current_node = current_node.right_child
+
+    def _count_iterative(self, current_node: AVLNode, prefix: str, visits: list):
+        """
+        The walk of `_find_iterative`, counting the visited nodes. It is kept apart so the
+        searches that aren't recorded don't pay for the counter.
+
+        Args:
+            visits (list): Where the number of visited nodes is appended once the walk ends or
+                is closed.
+        """
+        stack = []
+        visited = 0
+        try:
+            while stack or current_node is not None:
+                while current_node is not None:
+                    visited += 1
+                    if current_node.value.startswith(prefix):
+                        stack.append(current_node)
+                        current_node = current_node.left_child
+                    elif prefix < current_node.value:
+                        current_node = current_node.left_child
+                    else:
+                        current_node = current_node.right_child
 
-        # Recursively search in the right subtree
-        elif current_node is not None and prefix > current_node.value:
-            yield from self._find_recursive(current_node.right_child, prefix)
+                if not stack:
+                    return
+                current_node = stack.pop()
+                yield current_node
+                current_node = current_node.right_child
+        finally:
+            visits.append(visited)